@@ -0,0 +1,205 @@
+"""Нагрузка на чат: N WebSocket-клиентов в комнатах и по одному
+отправителю на комнату; задержка доставки — от отправки сообщения
+клиентом до получения его копии каждым подписчиком.
+
+Сервер запускается отдельным процессом uvicorn (один воркер). Без
+--redis-fanout раздача идёт только через ChatHub процесса, с ним —
+через Redis pub/sub (нужны переменные REDIS_*), и только тогда чат
+сверяет токены со списком отзыва. Токены подписываются ключом,
+созданным на время прогона. Клиенты живут в одном процессе, поэтому
+на одном ядре в задержку входит и их собственная очередь. Запуск из каталога chat:
+    python benchmarks/load_ws.py --connections 10000 --messages 20 --rate 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import jwt
+import websockets
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_token(private_key, user_id: int) -> str:
+    payload = {
+        "sub": user_id,
+        "email": f"user{user_id}@example.com",
+        "role": "user",
+        "typ": "access",
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256")
+
+
+def start_server(args, public_key_path: Path) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.setdefault("REDIS_HOST", "localhost")
+    env.setdefault("REDIS_PORT", "6379")
+    env.setdefault("REDIS_PASSWORD", "")
+    env["CHAT_REDIS_FANOUT"] = str(args.redis_fanout).lower()
+    env["CHAT_QUEUE_SIZE"] = str(args.queue_size)
+    env["CHAT_OVERFLOW_POLICY"] = args.policy
+    env["TOKEN_PUBLIC_KEY_PATH"] = str(public_key_path)
+    env["TOKEN_CHECK_REVOCATION"] = str(args.redis_fanout).lower()
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "chat.main:app",
+            "--port",
+            str(args.port),
+            "--log-level",
+            "warning",
+            "--backlog",
+            str(args.connections),
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+async def wait_server(base: str) -> None:
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(f"{base}/chat/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise RuntimeError("сервер не запустился")
+
+
+async def receiver(
+    url: str,
+    connecting: asyncio.Semaphore,
+    connected: list[int],
+    latencies: list[float],
+    stop: asyncio.Event,
+) -> None:
+    async with connecting:
+        websocket = await websockets.connect(url, ping_interval=None, max_queue=None)
+    connected.append(1)
+    try:
+        while not stop.is_set():
+            message = json.loads(await websocket.recv())
+            latencies.append(time.time() - float(message["text"]))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        await websocket.close()
+
+
+async def sender(url: str, messages: int, rate: float) -> None:
+    async with websockets.connect(url, ping_interval=None) as websocket:
+        for _ in range(messages):
+            await websocket.send(repr(time.time()))
+            await asyncio.sleep(1 / rate)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--rooms", type=int, default=1)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument(
+        "--policy", choices=("drop_oldest", "disconnect"), default="drop_oldest"
+    )
+    parser.add_argument("--redis-fanout", action="store_true")
+    parser.add_argument("--drain", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key_path = Path(tempfile.mkdtemp()) / "jwt-public.pem"
+    public_key_path.write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    server = start_server(args, public_key_path)
+    base = f"http://127.0.0.1:{args.port}"
+    ws_base = f"ws://127.0.0.1:{args.port}/ws/video"
+    try:
+        await wait_server(base)
+        connecting = asyncio.Semaphore(200)
+        connected: list[int] = []
+        latencies: list[float] = []
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        receivers = [
+            asyncio.create_task(
+                receiver(
+                    f"{ws_base}/{number % args.rooms}"
+                    f"?token={make_token(private_key, number)}",
+                    connecting,
+                    connected,
+                    latencies,
+                    stop,
+                )
+            )
+            for number in range(args.connections)
+        ]
+        while len(connected) < args.connections:
+            failed = [task for task in receivers if task.done()]
+            if failed:
+                await failed[0]
+            await asyncio.sleep(0.1)
+        print(f"connected {len(connected)} in {time.perf_counter() - started:.1f} s")
+
+        await asyncio.gather(
+            *(
+                sender(
+                    f"{ws_base}/{room}?token={make_token(private_key, -room - 1)}",
+                    args.messages,
+                    args.rate,
+                )
+                for room in range(args.rooms)
+            )
+        )
+        expected = args.connections * args.messages
+        deadline = time.perf_counter() + args.drain
+        while len(latencies) < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+        stop.set()
+        for task in receivers:
+            task.cancel()
+        await asyncio.gather(*receivers, return_exceptions=True)
+
+        async with httpx.AsyncClient() as client:
+            metrics = (await client.get(f"{base}/chat/metrics")).json()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+    print(f"delivered {len(latencies)}/{expected}, server {metrics}")
+    if quantiles:
+        print(
+            f"latency p50 {quantiles[49] * 1000:.1f} ms, "
+            f"p99 {quantiles[98] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
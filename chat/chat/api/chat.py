@@ -0,0 +1,60 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, WebSocket, status
+from redis.exceptions import RedisError
+
+from chat.core.config import settings
+from chat.schemas.user import PrincipalSchema
+from chat.services.auth import get_current_principal
+from chat.services.broker import ChatBroker, get_chat_broker
+from chat.services.hub import ChatHub, get_chat_hub
+
+chat_router = APIRouter(tags=["Chat"])
+
+
+async def receive_messages(
+    websocket: WebSocket, broker: ChatBroker, video_id: int, user_id: int
+) -> None:
+    async for text in websocket.iter_text():
+        text = text.strip()
+        if not text or len(text) > settings.chat.max_message_length:
+            continue
+        try:
+            await broker.publish(video_id, user_id, text)
+        except RedisError:
+            await websocket.send_json({"error": "чат временно недоступен"})
+
+
+@chat_router.websocket("/ws/video/{video_id}")
+async def video_chat(
+    websocket: WebSocket,
+    video_id: int,
+    principal: Annotated[PrincipalSchema, Depends(get_current_principal)],
+    hub: ChatHub = Depends(get_chat_hub),
+    broker: ChatBroker = Depends(get_chat_broker),
+):
+    await websocket.accept()
+    subscriber = hub.subscribe(video_id)
+    tasks = {
+        asyncio.create_task(subscriber.pump(websocket)),
+        asyncio.create_task(
+            receive_messages(websocket, broker, video_id, principal.id)
+        ),
+        asyncio.create_task(subscriber.overflowed.wait()),
+    }
+    try:
+        # клиент ушёл, отправка упала или очередь переполнилась
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        hub.unsubscribe(video_id, subscriber)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if subscriber.overflowed.is_set():
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+@chat_router.get("/chat/metrics")
+async def chat_metrics(hub: ChatHub = Depends(get_chat_hub)):
+    return hub.metrics()
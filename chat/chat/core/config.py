@@ -0,0 +1,59 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BASE_DIR = Path(__name__).parent.parent.parent
+
+
+class AppSettings(BaseSettings):
+    app_name: str = "Проект Youtube: чат"
+    API_V1_STR: str = "/api/v1/"
+
+
+class RedisDBSettings(BaseSettings):
+    host: str
+    port: int
+    password: SecretStr
+    retry: int = 3
+    max_connections: int = 100
+    pool_timeout: float = 5.0
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="redis_")
+
+
+class ChatSettings(BaseSettings):
+    queue_size: int = 100
+    overflow_policy: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    max_message_length: int = 500
+    redis_fanout: bool = True
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="chat_")
+
+
+class TokenAuthSettings(BaseSettings):
+    """Проверка access токенов, выданных сервисом users"""
+
+    algorithm: str = "RS256"
+    public_key_path: Path = BASE_DIR / "chat" / "certs" / "jwt-public.pem"
+    key_check_interval: float = 1.0
+    check_revocation: bool = True
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="token_")
+
+
+class Settings:
+    app: AppSettings = AppSettings()
+    redis: RedisDBSettings = RedisDBSettings()
+    chat: ChatSettings = ChatSettings()
+    token: TokenAuthSettings = TokenAuthSettings()
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
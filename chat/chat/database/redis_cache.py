@@ -0,0 +1,40 @@
+from redis import asyncio as aioredis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import (
+    BusyLoadingError,
+    ConnectionError,
+    TimeoutError,
+)
+from redis.retry import Retry
+
+from chat.core.config import settings
+
+
+class RedisDB:
+    def __init__(self, client: aioredis.Redis) -> None:
+        self.redis = client
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_redis() -> RedisDB:
+    """Клиент с блокирующим пулом: при всплеске сообщений публикация ждёт
+    свободное соединение до pool_timeout, а не падает с MaxConnectionsError
+    """
+    return RedisDB(
+        aioredis.Redis(
+            connection_pool=aioredis.BlockingConnectionPool(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                password=settings.redis.password.get_secret_value(),
+                max_connections=settings.redis.max_connections,
+                timeout=settings.redis.pool_timeout,
+                retry=Retry(ExponentialBackoff(), settings.redis.retry),
+                retry_on_error=[TimeoutError, ConnectionError, BusyLoadingError],
+            )
+        )
+    )
+
+
+redis_db = create_redis()
@@ -0,0 +1,28 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+import uvicorn
+from fastapi import FastAPI
+
+from chat.api.chat import chat_router
+from chat.database.redis_cache import redis_db
+from chat.services.broker import chat_broker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = asyncio.create_task(chat_broker.listen())
+    yield
+    listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await listener
+    await redis_db.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(chat_router)
+
+
+if __name__ == "__main__":
+    uvicorn.run("chat.main:app", reload=True)
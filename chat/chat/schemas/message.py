@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class ChatMessageSchema(BaseModel):
+    video_id: int
+    user_id: int
+    text: str
+    sent_at: float
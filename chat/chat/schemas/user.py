@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic import BaseModel, EmailStr
+
+
+class AccessTokenPayload(BaseModel):
+    """Claims access токена сервиса users, нужные чату"""
+
+    sub: int
+    email: EmailStr
+    role: str
+    typ: Literal["access"]
+
+
+class PrincipalSchema(BaseModel):
+    """Автор сообщений, восстановленный из claims access токена"""
+
+    id: int
+    email: EmailStr
+    role: str
@@ -0,0 +1,123 @@
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated, Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from fastapi import Depends, Query, WebSocketException, status
+from jwt.exceptions import PyJWTError
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from chat.core.config import settings
+from chat.database.redis_cache import RedisDB, redis_db
+from chat.schemas.user import AccessTokenPayload, PrincipalSchema
+
+# ключ отзыва из сервиса users: деактивированный пользователь не пишет в чат
+REVOKED_USER_KEY = "auth:revoked:user:{user_id}"
+
+
+class KeyStore:
+    """Публичный ключ users, прочитанный один раз.
+
+    Не чаще раза в check_interval секунд сверяет stat файла
+    и перечитывает ключ после ротации.
+    """
+
+    def __init__(
+        self, path: Path, loader: Callable[[bytes], Any], check_interval: float
+    ) -> None:
+        self.path = path
+        self.loader = loader
+        self.check_interval = check_interval
+        self._key: Any = None
+        self._signature: tuple[int, int, int] | None = None
+        self._checked_at = float("-inf")
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            stat = self.path.stat()
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature != self._signature:
+                self._key = self.loader(self.path.read_bytes())
+                self._signature = signature
+        return self._key
+
+
+class TokenVerifier:
+    """Проверка access токенов users без обращения к сервису.
+
+    Подпись и срок проверяются публичным ключом, отзыв — по тому же
+    ключу Redis, который пишет users при деактивации. Без Redis
+    (redis=None) отзыв не проверяется и токен действует до exp.
+    """
+
+    def __init__(self, keys: KeyStore, algorithm: str, redis: RedisDB | None) -> None:
+        self.keys = keys
+        self.algorithm = algorithm
+        self.redis = redis
+
+    async def principal(self, token: str) -> PrincipalSchema:
+        try:
+            payload = jwt.decode(
+                jwt=token, key=self.keys.get(), algorithms=[self.algorithm]
+            )
+            token_data = AccessTokenPayload(**payload)
+        except (PyJWTError, ValidationError):
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="could not validate credentials",
+            )
+        if self.redis is None:
+            return self._principal(token_data)
+        try:
+            revoked = await self.redis.redis.exists(
+                REVOKED_USER_KEY.format(user_id=token_data.sub)
+            )
+        except RedisError:
+            # без списка отзыва нельзя доверять claims токена
+            raise WebSocketException(
+                code=status.WS_1013_TRY_AGAIN_LATER, reason="список отзыва недоступен"
+            )
+        if revoked:
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION, reason="token revoked"
+            )
+        return self._principal(token_data)
+
+    @staticmethod
+    def _principal(token_data: AccessTokenPayload) -> PrincipalSchema:
+        return PrincipalSchema(
+            id=token_data.sub, email=token_data.email, role=token_data.role
+        )
+
+
+token_verifier = TokenVerifier(
+    KeyStore(
+        settings.token.public_key_path,
+        serialization.load_pem_public_key,
+        settings.token.key_check_interval,
+    ),
+    settings.token.algorithm,
+    redis_db if settings.token.check_revocation else None,
+)
+
+
+async def get_token_verifier() -> TokenVerifier:
+    return token_verifier
+
+
+async def get_current_principal(
+    verifier: Annotated[TokenVerifier, Depends(get_token_verifier)],
+    token: Annotated[str | None, Query()] = None,
+) -> PrincipalSchema:
+    """Access токен из ?token=: браузер не передаёт заголовки в WebSocket"""
+    if token is None:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="could not validate credentials",
+        )
+    return await verifier.principal(token)
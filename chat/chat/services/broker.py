@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from chat.core.config import settings
+from chat.database.redis_cache import RedisDB, redis_db
+from chat.schemas.message import ChatMessageSchema
+from chat.services.hub import ChatHub, chat_hub
+
+CHAT_CHANNEL = "chat:video:{video_id}"
+
+logger = logging.getLogger(__name__)
+
+
+class ChatBroker:
+    """Доставка сообщений чата во все процессы.
+
+    Сообщение сериализуется один раз и публикуется в канал комнаты
+    Redis; каждый процесс, подписанный по шаблону на все комнаты,
+    раздаёт его своим локальным подписчикам через ChatHub, в том числе
+    процесс-отправитель. Без Redis (redis=None) чат работает в пределах
+    одного процесса.
+    """
+
+    def __init__(self, redis: RedisDB | None, hub: ChatHub) -> None:
+        self.redis = redis
+        self.hub = hub
+
+    async def publish(self, video_id: int, user_id: int, text: str) -> None:
+        message = ChatMessageSchema(
+            video_id=video_id, user_id=user_id, text=text, sent_at=time.time()
+        )
+        payload = message.model_dump_json()
+        if self.redis is None:
+            self.hub.broadcast(video_id, payload)
+            return
+        await self.redis.redis.publish(CHAT_CHANNEL.format(video_id=video_id), payload)
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        video_id = int(message["channel"].rsplit(b":", 1)[1])
+        self.hub.broadcast(video_id, message["data"].decode())
+
+    async def listen(self, reconnect_delay: float = 1.0) -> None:
+        """Фоновая задача воркера: сообщения из Redis в локальные комнаты"""
+        if self.redis is None:
+            return
+        while True:
+            pubsub = self.redis.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(CHAT_CHANNEL.format(video_id="*"))
+                async for message in pubsub.listen():
+                    try:
+                        self.dispatch(message)
+                    except Exception:
+                        # битое сообщение не должно останавливать раздачу
+                        logger.exception(
+                            "Сообщение чата из %s не разослано", message["channel"]
+                        )
+            except RedisError:
+                logger.warning("Подписка на чат потеряна, переподключение")
+                await asyncio.sleep(reconnect_delay)
+            finally:
+                await pubsub.aclose()
+
+
+chat_broker = ChatBroker(redis_db if settings.chat.redis_fanout else None, chat_hub)
+
+
+async def get_chat_broker() -> ChatBroker:
+    return chat_broker
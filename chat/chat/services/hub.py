@@ -0,0 +1,101 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Literal
+
+from fastapi import WebSocket
+
+from chat.core.config import settings
+
+
+@dataclass
+class HubStats:
+    messages: int = 0
+    deliveries: int = 0
+    dropped: int = 0
+    disconnected: int = 0
+
+
+class Subscriber:
+    """Очередь исходящих сообщений одного соединения"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.overflowed = asyncio.Event()
+
+    async def pump(self, websocket: WebSocket) -> None:
+        while True:
+            await websocket.send_text(await self.queue.get())
+
+
+class ChatHub:
+    """Комнаты чата в пределах процесса.
+
+    Сообщение приходит уже сериализованным, и одна и та же строка
+    кладётся в очередь каждого подписчика без ожидания. Медленный
+    клиент не тормозит остальных: когда его очередь полна, политика
+    drop_oldest выбрасывает самое старое сообщение, а disconnect
+    отписывает клиента и просит закрыть соединение.
+    """
+
+    def __init__(
+        self, queue_size: int, policy: Literal["drop_oldest", "disconnect"]
+    ) -> None:
+        self.queue_size = queue_size
+        self.policy = policy
+        self.rooms: defaultdict[int, set[Subscriber]] = defaultdict(set)
+        self.stats = HubStats()
+
+    def subscribe(self, video_id: int) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        self.rooms[video_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, video_id: int, subscriber: Subscriber) -> None:
+        room = self.rooms.get(video_id)
+        if room is None:
+            return
+        room.discard(subscriber)
+        if not room:
+            del self.rooms[video_id]
+
+    def broadcast(self, video_id: int, payload: str) -> None:
+        room = self.rooms.get(video_id)
+        if not room:
+            return
+        overflowed = []
+        for subscriber in room:
+            try:
+                subscriber.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                if self.policy == "disconnect":
+                    overflowed.append(subscriber)
+                    continue
+                subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(payload)
+                subscriber.dropped += 1
+                self.stats.dropped += 1
+        for subscriber in overflowed:
+            subscriber.overflowed.set()
+            self.unsubscribe(video_id, subscriber)
+        self.stats.messages += 1
+        self.stats.deliveries += len(room)
+        self.stats.disconnected += len(overflowed)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "rooms": len(self.rooms),
+            "connections": sum(len(room) for room in self.rooms.values()),
+            "messages": self.stats.messages,
+            "deliveries": self.stats.deliveries,
+            "dropped": self.stats.dropped,
+            "disconnected": self.stats.disconnected,
+        }
+
+
+chat_hub = ChatHub(settings.chat.queue_size, settings.chat.overflow_policy)
+
+
+async def get_chat_hub() -> ChatHub:
+    return chat_hub
@@ -0,0 +1,51 @@
+import os
+
+import fakeredis
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# настройки без значений по умолчанию; сами сервисы в тестах подменяются
+for name, value in {
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "redis",
+}.items():
+    os.environ.setdefault(name, value)
+
+from chat.database.redis_cache import RedisDB  # noqa: E402
+from chat.services.auth import KeyStore, TokenVerifier  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis(redis_server):
+    """fakeredis: соединения создаются лениво в цикле, где их используют"""
+    return RedisDB(fakeredis.aioredis.FakeRedis(server=redis_server))
+
+
+@pytest.fixture
+def verifier(tmp_path, private_key, redis):
+    public_path = tmp_path / "jwt-public.pem"
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    keys = KeyStore(public_path, serialization.load_pem_public_key, check_interval=60)
+    return TokenVerifier(keys, "RS256", redis)
@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+import pytest
+
+from chat.services.broker import CHAT_CHANNEL, ChatBroker
+from chat.services.hub import ChatHub
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_subscribed(redis) -> None:
+    for _ in range(100):
+        if (await redis.redis.pubsub_numpat()) > 0:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("listen не подписался")
+
+
+async def test_listen_survives_broken_message(redis):
+    hub = ChatHub(queue_size=10, policy="drop_oldest")
+    subscriber = hub.subscribe(1)
+    broker = ChatBroker(redis, hub)
+    listener = asyncio.create_task(broker.listen())
+    try:
+        await wait_subscribed(redis)
+        # канал без номера комнаты: разбор падает на этом сообщении
+        await redis.redis.publish(CHAT_CHANNEL.format(video_id="broken"), "{}")
+        await broker.publish(1, 7, "hello")
+
+        message = json.loads(await asyncio.wait_for(subscriber.queue.get(), timeout=1))
+        assert (message["user_id"], message["text"]) == (7, "hello")
+        assert not listener.done()
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
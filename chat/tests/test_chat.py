@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import jwt
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from chat.main import app
+from chat.services.auth import REVOKED_USER_KEY, get_token_verifier
+from chat.services.broker import ChatBroker, get_chat_broker
+from chat.services.hub import ChatHub, get_chat_hub
+
+USER_ID = 7
+
+
+@pytest.fixture
+def client(verifier):
+    """Чат в одном процессе, без Redis pub/sub и без lifespan"""
+    broker = ChatBroker(None, ChatHub(queue_size=10, policy="drop_oldest"))
+    app.dependency_overrides = {
+        get_token_verifier: lambda: verifier,
+        get_chat_broker: lambda: broker,
+        get_chat_hub: lambda: broker.hub,
+    }
+    yield TestClient(app)
+    app.dependency_overrides = {}
+
+
+def make_token(private_key, **claims) -> str:
+    payload = {
+        "sub": USER_ID,
+        "email": "user@example.com",
+        "role": "user",
+        "typ": "access",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256")
+
+
+def test_sender_comes_from_token(client, private_key):
+    token = make_token(private_key)
+    with client.websocket_connect(f"/ws/video/1?token={token}") as websocket:
+        websocket.send_text("hello")
+        message = websocket.receive_json()
+
+    assert (message["video_id"], message["user_id"]) == (1, USER_ID)
+    assert message["text"] == "hello"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "?token=garbage",
+        "?user=someone",
+    ],
+)
+def test_connection_without_valid_token_is_rejected(client, query):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/ws/video/1{query}"):
+            pass
+    assert exc.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"typ": "refresh"},
+        {"exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+    ],
+)
+def test_refresh_and_expired_tokens_are_rejected(client, private_key, claims):
+    token = make_token(private_key, **claims)
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/ws/video/1?token={token}"):
+            pass
+    assert exc.value.code == status.WS_1008_POLICY_VIOLATION
+
+
+def test_revoked_user_is_rejected(client, private_key, redis_server):
+    fakeredis.FakeRedis(server=redis_server).set(
+        REVOKED_USER_KEY.format(user_id=USER_ID), 1
+    )
+    token = make_token(private_key)
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/ws/video/1?token={token}"):
+            pass
+    assert exc.value.reason == "token revoked"
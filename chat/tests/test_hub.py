@@ -0,0 +1,77 @@
+import pytest
+
+from chat.services.hub import ChatHub
+
+
+def drain(subscriber) -> list[str]:
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(subscriber.queue.get_nowait())
+    return messages
+
+
+@pytest.fixture
+def drop_oldest():
+    return ChatHub(queue_size=2, policy="drop_oldest")
+
+
+@pytest.fixture
+def disconnect():
+    return ChatHub(queue_size=2, policy="disconnect")
+
+
+def test_broadcast_reaches_only_own_room(drop_oldest):
+    first = drop_oldest.subscribe(1)
+    second = drop_oldest.subscribe(1)
+    other = drop_oldest.subscribe(2)
+
+    drop_oldest.broadcast(1, "hello")
+
+    assert drain(first) == drain(second) == ["hello"]
+    assert drain(other) == []
+    assert drop_oldest.metrics()["deliveries"] == 2
+
+
+def test_drop_oldest_keeps_newest_messages(drop_oldest):
+    slow = drop_oldest.subscribe(1)
+    fast = drop_oldest.subscribe(1)
+
+    for number in range(3):
+        drop_oldest.broadcast(1, f"m{number}")
+        drain(fast)
+
+    assert drain(slow) == ["m1", "m2"]
+    assert slow.dropped == 1
+    assert not slow.overflowed.is_set()
+    metrics = drop_oldest.metrics()
+    assert (metrics["connections"], metrics["dropped"]) == (2, 1)
+    assert metrics["disconnected"] == 0
+
+
+def test_disconnect_unsubscribes_overflowed_client(disconnect):
+    slow = disconnect.subscribe(1)
+    fast = disconnect.subscribe(1)
+
+    for number in range(3):
+        disconnect.broadcast(1, f"m{number}")
+        assert drain(fast) == [f"m{number}"]
+
+    # очередь медленного клиента не трогается, соединение просят закрыть
+    assert slow.overflowed.is_set()
+    assert drain(slow) == ["m0", "m1"]
+    assert disconnect.rooms[1] == {fast}
+
+    disconnect.broadcast(1, "m3")
+    assert drain(fast) == ["m3"]
+    assert drain(slow) == []
+    metrics = disconnect.metrics()
+    assert (metrics["connections"], metrics["dropped"]) == (1, 0)
+    assert metrics["disconnected"] == 1
+
+
+def test_last_unsubscribe_removes_room(disconnect):
+    subscriber = disconnect.subscribe(1)
+    disconnect.unsubscribe(1, subscriber)
+    disconnect.unsubscribe(1, subscriber)
+
+    assert disconnect.metrics()["rooms"] == 0
@@ -0,0 +1,120 @@
+"""Запись комментариев: CommentDAL.create на каждый запрос против
+CommentBatcher, пишущего пачку за постоянное число запросов.
+
+Часть записей — ответы на заранее созданные ветки (--reply-ratio).
+По умолчанию БД — SQLite-файл; для Postgres передайте --url
+(postgresql+asyncpg://...), таблицы должны быть созданы миграциями.
+Запуск из каталога comment:
+    python benchmarks/bench_comment_batch.py --comments 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_bodies(args, roots: list[int]) -> list:
+    from comment.schemas.comment import CreateCommentSchema
+
+    rng = random.Random(42)
+    return [
+        CreateCommentSchema(
+            user_id=1,
+            text=f"comment {number}",
+            parent_id=rng.choice(roots) if rng.random() < args.reply_ratio else None,
+        )
+        for number in range(args.comments)
+    ]
+
+
+async def single(helper, video_id: int, bodies: list, concurrency: int) -> float:
+    from comment.crud.comment import CommentDAL
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(body) -> None:
+        async with semaphore, helper.factory_session() as session:
+            await CommentDAL(session).create(video_id, body, max_depth=16)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(body) for body in bodies))
+    return len(bodies) / (time.perf_counter() - started)
+
+
+async def batched(batcher, video_id: int, bodies: list, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(body) -> None:
+        async with semaphore:
+            await batcher.add(video_id, body)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(body) for body in bodies))
+    await batcher.close()
+    return len(bodies) / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--roots", type=int, default=50)
+    parser.add_argument("--reply-ratio", type=float, default=0.3)
+    parser.add_argument("--max-rows", type=int, default=500)
+    parser.add_argument("--max-delay-ms", type=int, default=20)
+    parser.add_argument("--url")
+    args = parser.parse_args()
+
+    from sqlalchemy import select
+
+    from comment.crud.comment import CommentDAL
+    from comment.database.models.base import Base
+    from comment.database.models.counter import VideoCommentsCount
+    from comment.database.session import DDHelper
+    from comment.schemas.comment import CreateCommentSchema
+    from comment.services.comment_batch import CommentBatcher
+
+    url = args.url or f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    helper = DDHelper(url=url, pool_size=20, max_overflow=0)
+    if args.url is None:
+        async with helper.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    for name, video_id in (("single", 1), ("batched", 2)):
+        async with helper.factory_session() as session:
+            roots = [
+                (
+                    await CommentDAL(session).create(
+                        video_id, CreateCommentSchema(user_id=1, text="root"), 16
+                    )
+                ).id
+                for _ in range(args.roots)
+            ]
+        bodies = make_bodies(args, roots)
+        if name == "single":
+            rate = await single(helper, video_id, bodies, args.concurrency)
+            print(f"{name:>8}: {rate:9.1f} comments/s")
+        else:
+            batcher = CommentBatcher(
+                helper.factory_session, args.max_rows, args.max_delay_ms / 1000, 16
+            )
+            rate = await batched(batcher, video_id, bodies, args.concurrency)
+            print(f"{name:>8}: {rate:9.1f} comments/s, {batcher.stats}")
+        async with helper.factory_session() as session:
+            count = await session.scalar(
+                select(VideoCommentsCount.count).where(
+                    VideoCommentsCount.video_id == video_id
+                )
+            )
+        assert count == args.roots + args.comments, count
+    await helper.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
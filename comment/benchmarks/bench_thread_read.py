@@ -0,0 +1,153 @@
+"""Чтение треда целиком: рекурсивный CTE по parent_id (только список
+смежности) против диапазона индекса (video_id, path); лучшие ветки
+видео: запрос к БД против заранее посчитанного списка в Redis.
+
+По умолчанию БД — SQLite-файл, Redis — fakeredis; для Postgres
+передайте --url (postgresql+asyncpg://..., таблицы из миграций).
+Запуск из каталога comment:
+    python benchmarks/bench_thread_read.py --threads 200 --replies 200
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def fill(helper, args) -> list[int]:
+    """Ветки со случайным деревом ответов; path считается как в CommentDAL"""
+    from sqlalchemy import insert
+
+    from comment.database.models.comment import PATH_SEPARATOR, Comment, path_segment
+
+    rng = random.Random(42)
+    rows, roots, next_id = [], [], 1
+    for thread in range(args.threads):
+        video_id = thread % args.videos + 1
+        nodes = [(next_id, path_segment(next_id), 0)]
+        rows.append(
+            {
+                "id": next_id,
+                "video_id": video_id,
+                "user_id": 1,
+                "parent_id": None,
+                "path": nodes[0][1],
+                "depth": 0,
+                "replies_count": args.replies,
+                "text": "root",
+            }
+        )
+        roots.append(next_id)
+        next_id += 1
+        for _ in range(args.replies):
+            parent_id, parent_path, depth = rng.choice(nodes)
+            path = parent_path + PATH_SEPARATOR + path_segment(next_id)
+            nodes.append((next_id, path, depth + 1))
+            rows.append(
+                {
+                    "id": next_id,
+                    "video_id": video_id,
+                    "user_id": 1,
+                    "parent_id": parent_id,
+                    "path": path,
+                    "depth": depth + 1,
+                    "replies_count": 0,
+                    "text": "reply",
+                }
+            )
+            next_id += 1
+    async with helper.engine.begin() as connection:
+        for start in range(0, len(rows), 5000):
+            await connection.execute(insert(Comment), rows[start : start + 5000])
+    return roots
+
+
+async def recursive(session, video_id: int, root_id: int) -> int:
+    from sqlalchemy import select
+
+    from comment.database.models.comment import Comment
+
+    tree = select(Comment.id).where(Comment.id == root_id).cte("tree", recursive=True)
+    tree = tree.union_all(select(Comment.id).where(Comment.parent_id == tree.c.id))
+    query = select(Comment).where(Comment.id.in_(select(tree.c.id)))
+    return len((await session.execute(query)).scalars().all())
+
+
+async def by_path(session, video_id: int, root_id: int) -> int:
+    from comment.crud.comment import CommentDAL
+
+    return len(await CommentDAL(session).get_thread(video_id, root_id, 100_000))
+
+
+async def measure(helper, loader, threads, args) -> float:
+    started = time.perf_counter()
+    for root_id, video_id in threads:
+        async with helper.factory_session() as session:
+            loaded = await loader(session, video_id, root_id)
+            assert loaded == args.replies + 1, loaded
+    return len(threads) / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--replies", type=int, default=200)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--url")
+    args = parser.parse_args()
+
+    import fakeredis
+
+    from comment.database.models.base import Base
+    from comment.database.redis_cache import RedisDB
+    from comment.database.session import DDHelper
+    from comment.services.top import TopComments
+
+    url = args.url or f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    helper = DDHelper(url=url, pool_size=5, max_overflow=0)
+    async with helper.engine.begin() as connection:
+        if args.url is None:
+            await connection.run_sync(Base.metadata.create_all)
+    roots = await fill(helper, args)
+    async with helper.engine.begin() as connection:
+        # честное сравнение: CTE спускается по индексу parent_id
+        await connection.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS bench_comment_parent_id ON comment (parent_id)"
+        )
+    rng = random.Random(7)
+    threads = [
+        (root_id, number % args.videos + 1) for number, root_id in enumerate(roots)
+    ]
+    sample = [rng.choice(threads) for _ in range(args.reads)]
+
+    for name, loader in (("recursive", recursive), ("path", by_path)):
+        rate = await measure(helper, loader, sample, args)
+        print(f"{name:>10}: {rate:9.1f} threads/s ({args.replies + 1} rows each)")
+
+    top = TopComments(
+        RedisDB(fakeredis.FakeAsyncRedis()), helper.factory_session, k=10, ttl=600
+    )
+    videos = [rng.randrange(args.videos) + 1 for _ in range(args.reads)]
+    started = time.perf_counter()
+    for video_id in videos:
+        await top.refresh(video_id)
+    print(
+        f"{'top db':>10}: {len(videos) / (time.perf_counter() - started):9.1f} reads/s"
+    )
+    started = time.perf_counter()
+    for video_id in videos:
+        await top.get(video_id)
+    print(
+        f"{'top cache':>10}: {len(videos) / (time.perf_counter() - started):9.1f} reads/s"
+    )
+    await helper.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from comment.database.session import dh_helper
+from comment.schemas.comment import (
+    CommentPageSchema,
+    CreateCommentSchema,
+    ResponseCommentSchema,
+    ThreadPageSchema,
+    UpdateCommentSchema,
+)
+from comment.services.comment import CommentService, get_service_comment
+
+comment_router = APIRouter(tags=["Comment"])
+MAX_PAGE_SIZE = 100
+MAX_THREAD_SIZE = 1000
+MAX_FEED_VIDEOS = 100
+
+
+@comment_router.post(
+    "/video/{video_id}/comments",
+    response_model=ResponseCommentSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_comment(
+    video_id: int,
+    body_comment: CreateCommentSchema,
+    request: Request,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    comment = await comment_service.create(video_id, body_comment)
+    # запись идёт через CommentBatcher, мимо сессии запроса
+    dh_helper.mark_write(request)
+    return comment
+
+
+@comment_router.patch(
+    "/video/{video_id}/comments/{comment_id}", response_model=ResponseCommentSchema
+)
+async def update_comment(
+    video_id: int,
+    comment_id: int,
+    body_comment: UpdateCommentSchema,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    return await comment_service.update(video_id, comment_id, body_comment)
+
+
+@comment_router.delete("/video/{video_id}/comments/{comment_id}", response_model=int)
+async def delete_comment(
+    video_id: int,
+    comment_id: int,
+    user_id: int,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    """Удаляет комментарий вместе со всеми ответами на него"""
+    return await comment_service.delete(video_id, comment_id, user_id)
+
+
+@comment_router.get("/video/{video_id}/comments", response_model=CommentPageSchema)
+async def list_comments(
+    video_id: int,
+    cursor: int | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    return await comment_service.get_comments(video_id, cursor, limit)
+
+
+@comment_router.get(
+    "/video/{video_id}/comments/top", response_model=list[ResponseCommentSchema]
+)
+async def top_comments(
+    video_id: int,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    return await comment_service.get_top(video_id)
+
+
+@comment_router.get(
+    "/video/{video_id}/comments/{comment_id}/thread", response_model=ThreadPageSchema
+)
+async def comment_thread(
+    video_id: int,
+    comment_id: int,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_THREAD_SIZE)] = 200,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    """Комментарий со всеми ответами в порядке обхода в глубину"""
+    return await comment_service.get_thread(video_id, comment_id, cursor, limit)
+
+
+@comment_router.get(
+    "/comments/first-pages", response_model=dict[int, CommentPageSchema]
+)
+async def first_comment_pages(
+    video_id: Annotated[list[int], Query(min_length=1, max_length=MAX_FEED_VIDEOS)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 3,
+    comment_service: CommentService = Depends(get_service_comment),
+):
+    """Первые страницы комментариев для нескольких видео ленты одним запросом"""
+    return await comment_service.get_first_pages(list(dict.fromkeys(video_id)), limit)
@@ -0,0 +1,523 @@
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Integer,
+    Result,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    true,
+    tuple_,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+from comment.database.models.comment import (
+    PATH_SEPARATOR,
+    PATH_SUBTREE_END,
+    Comment,
+    path_segment,
+)
+from comment.database.models.counter import VideoCommentsCount
+from comment.schemas.comment import CreateCommentSchema, UpdateCommentSchema
+
+
+class CommentDAL:
+    def __init__(self, session: AsyncSession) -> None:
+        self.db_session = session
+
+    async def create(
+        self, video_id: int, body_comment: CreateCommentSchema, max_depth: int
+    ) -> Comment:
+        """Комментарий или ответ в одной транзакции с пересчётом предков.
+
+        path известен только после получения id, поэтому строка
+        вставляется, а затем дописывается в том же flush/commit.
+        """
+        parent = None
+        if body_comment.parent_id is not None:
+            parent = await self.db_session.get(Comment, body_comment.parent_id)
+            error = self._check_parent(parent, video_id, max_depth)
+            if error is not None:
+                raise error
+        try:
+            new_comment = Comment(
+                video_id=video_id,
+                user_id=body_comment.user_id,
+                parent_id=body_comment.parent_id,
+                depth=0 if parent is None else parent.depth + 1,
+                text=body_comment.text,
+            )
+            self.db_session.add(new_comment)
+            await self.db_session.flush()
+            new_comment.path = path_segment(new_comment.id)
+            if parent is not None:
+                new_comment.path = parent.path + PATH_SEPARATOR + new_comment.path
+                ancestors = [
+                    int(segment) for segment in parent.path.split(PATH_SEPARATOR)
+                ]
+                await self.db_session.execute(
+                    update(Comment)
+                    .where(Comment.id.in_(ancestors))
+                    .values(replies_count=Comment.replies_count + 1)
+                    .execution_options(synchronize_session=False)
+                )
+            await self._add_counts({video_id: 1})
+            await self.db_session.commit()
+            return new_comment
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при создании comment",
+            )
+
+    async def create_many(
+        self, rows: Sequence[tuple[int, CreateCommentSchema]], max_depth: int
+    ) -> list[Comment | HTTPException]:
+        """Пачка комментариев и ответов за постоянное число запросов.
+
+        Родители читаются одним SELECT, строки вставляются одним
+        INSERT ... RETURNING, path дописывается одним UPDATE по первичному
+        ключу, а счётчики предков и видео — ещё по одному UPDATE. Ответ
+        с неверным родителем не пишется, на его месте в результате
+        HTTPException. IntegrityError (родитель удалён между SELECT и
+        INSERT) пробрасывается как есть, чтобы вызывающий повторил
+        строки по одной.
+        """
+        results: list[Comment | HTTPException | None] = [None] * len(rows)
+        try:
+            parents = await self._get_parents(
+                {body.parent_id for _, body in rows if body.parent_id is not None}
+            )
+            accepted = []
+            for position, (video_id, body) in enumerate(rows):
+                parent = None
+                if body.parent_id is not None:
+                    parent = parents.get(body.parent_id)
+                    results[position] = self._check_parent(parent, video_id, max_depth)
+                if results[position] is None:
+                    accepted.append((position, video_id, body, parent))
+            if not accepted:
+                return results
+            # render_nulls: корни и ответы в одном наборе параметров,
+            # иначе строки с parent_id=None уходят отдельным INSERT
+            stmt = (
+                insert(Comment)
+                .returning(Comment, sort_by_parameter_order=True)
+                .execution_options(render_nulls=True)
+            )
+            res: Result = await self.db_session.execute(
+                stmt,
+                [
+                    {
+                        "video_id": video_id,
+                        "user_id": body.user_id,
+                        "parent_id": body.parent_id,
+                        "depth": 0 if parent is None else parent.depth + 1,
+                        "text": body.text,
+                    }
+                    for _, video_id, body, parent in accepted
+                ],
+            )
+            paths, ancestors = [], Counter()
+            for (position, _, _, parent), comment in zip(accepted, res.scalars()):
+                path = path_segment(comment.id)
+                if parent is not None:
+                    path = parent.path + PATH_SEPARATOR + path
+                    ancestors.update(
+                        int(segment) for segment in parent.path.split(PATH_SEPARATOR)
+                    )
+                # без пометки об изменении, иначе commit обновит каждую строку отдельно
+                set_committed_value(comment, "path", path)
+                paths.append({"id": comment.id, "path": path})
+                results[position] = comment
+            await self.db_session.execute(update(Comment), paths)
+            if ancestors:
+                await self.db_session.execute(
+                    update(Comment)
+                    .where(Comment.id.in_(ancestors))
+                    .values(
+                        replies_count=Comment.replies_count
+                        + case(dict(ancestors), value=Comment.id, else_=0)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await self._add_counts(Counter(video_id for _, video_id, _, _ in accepted))
+            await self.db_session.commit()
+            return results
+        except IntegrityError:
+            raise
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при создании comments",
+            )
+
+    async def import_roots(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Переносит комментарии верхнего уровня из старой таблицы сервиса video.
+
+        rows — video_id, user_id, text и created_at. Строки, перенесённые
+        прошлым запуском (те же четыре поля у корня), пропускаются, так что
+        прерванный перенос можно запустить снова. Возвращает число
+        добавленных строк; id им выдаёт эта БД.
+        """
+        keys = [
+            (row["video_id"], row["user_id"], row["created_at"], row["text"])
+            for row in rows
+        ]
+        try:
+            res: Result = await self.db_session.execute(
+                select(
+                    Comment.video_id, Comment.user_id, Comment.created_at, Comment.text
+                ).where(
+                    Comment.parent_id.is_(None),
+                    tuple_(
+                        Comment.video_id,
+                        Comment.user_id,
+                        Comment.created_at,
+                        Comment.text,
+                    ).in_(keys),
+                )
+            )
+            imported = {tuple(row) for row in res.all()}
+            new_rows = [
+                {**row, "parent_id": None, "depth": 0}
+                for row, key in zip(rows, keys)
+                if key not in imported
+            ]
+            if not new_rows:
+                return 0
+            res = await self.db_session.execute(
+                insert(Comment)
+                .returning(Comment.id, sort_by_parameter_order=True)
+                .execution_options(render_nulls=True),
+                new_rows,
+            )
+            await self.db_session.execute(
+                update(Comment),
+                [
+                    {"id": comment_id, "path": path_segment(comment_id)}
+                    for comment_id in res.scalars()
+                ],
+            )
+            await self._add_counts(Counter(row["video_id"] for row in new_rows))
+            await self.db_session.commit()
+            return len(new_rows)
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при переносе comments",
+            )
+
+    async def update(
+        self, comment_id: int, video_id: int, body_comment: UpdateCommentSchema
+    ) -> Comment | None:
+        """Новый текст комментария автора; None, если такого нет"""
+        try:
+            stmt = (
+                update(Comment)
+                .where(
+                    Comment.id == comment_id,
+                    Comment.user_id == body_comment.user_id,
+                    Comment.video_id == video_id,
+                )
+                .values(text=body_comment.text)
+                .returning(Comment)
+                .execution_options(populate_existing=True)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            updated_comment = res.scalar_one_or_none()
+            await self.db_session.commit()
+            return updated_comment
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при обновлении comment",
+            )
+
+    async def delete(self, comment_id: int, user_id: int, video_id: int) -> int | None:
+        """Удаляет комментарий автора со всеми ответами и возвращает его id.
+
+        Поддерево удаляется явно одним диапазоном (video_id, path), так что
+        число удалённых строк точно известно: на него уменьшаются
+        replies_count предков и число комментариев видео в той же транзакции.
+        """
+        try:
+            root_path = (
+                select(Comment.path)
+                .where(
+                    Comment.id == comment_id,
+                    Comment.user_id == user_id,
+                    Comment.video_id == video_id,
+                )
+                .scalar_subquery()
+            )
+            stmt = (
+                delete(Comment)
+                .where(
+                    Comment.video_id == video_id,
+                    Comment.path >= root_path,
+                    Comment.path < root_path.concat(PATH_SUBTREE_END),
+                )
+                .returning(Comment.id, Comment.path)
+                .execution_options(synchronize_session=False)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            paths = dict(res.all())
+            if comment_id not in paths:
+                return None
+            *ancestors, _ = paths[comment_id].split(PATH_SEPARATOR)
+            if ancestors:
+                await self.db_session.execute(
+                    update(Comment)
+                    .where(Comment.id.in_([int(segment) for segment in ancestors]))
+                    .values(replies_count=Comment.replies_count - len(paths))
+                    .execution_options(synchronize_session=False)
+                )
+            await self._add_counts({video_id: -len(paths)})
+            await self.db_session.commit()
+            return comment_id
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при удалении comment",
+            )
+
+    async def _get_parents(self, parent_ids: set[int]) -> dict[int, Comment]:
+        if not parent_ids:
+            return {}
+        res: Result = await self.db_session.execute(
+            select(Comment).where(Comment.id.in_(parent_ids))
+        )
+        return {parent.id: parent for parent in res.scalars()}
+
+    @staticmethod
+    def _check_parent(
+        parent: Comment | None, video_id: int, max_depth: int
+    ) -> HTTPException | None:
+        if parent is None or parent.video_id != video_id:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Комментарий не найден",
+            )
+        if parent.depth >= max_depth:
+            return HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Слишком глубокая ветка ответов",
+            )
+        return None
+
+    def _insert_count(self):
+        # SQLite нужен только бенчмаркам и тестам, ON CONFLICT у обоих диалектов общий
+        if self.db_session.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(VideoCommentsCount)
+        return postgresql.insert(VideoCommentsCount)
+
+    async def _add_counts(self, deltas: Mapping[int, int]) -> None:
+        """Сдвигает число комментариев видео в той же транзакции.
+
+        Строки идут по возрастанию video_id, чтобы параллельные пачки
+        блокировали их в одном порядке.
+        """
+        stmt = self._insert_count().values(
+            [
+                {"video_id": video_id, "count": deltas[video_id]}
+                for video_id in sorted(deltas)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["video_id"],
+            set_={"count": VideoCommentsCount.count + stmt.excluded.count},
+        )
+        await self.db_session.execute(stmt)
+
+    async def get_counts(self, video_ids: Sequence[int]) -> dict[int, int]:
+        """Число комментариев видео; видео без комментариев — 0"""
+        try:
+            query = select(VideoCommentsCount.video_id, VideoCommentsCount.count).where(
+                VideoCommentsCount.video_id.in_(video_ids)
+            )
+            res: Result = await self.db_session.execute(query)
+            counts = dict.fromkeys(video_ids, 0)
+            counts.update(res.all())
+            return counts
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении counts",
+            )
+
+    async def recount(self, after: int, limit: int) -> dict[int, int]:
+        """Пересчитывает число комментариев пачки видео с video_id > after.
+
+        В пачку попадают видео и из comment, и из video_comments_count:
+        так исправляются и расхождения, и строки без комментариев. Строки
+        счётчиков блокируются до COUNT(*), поэтому параллельная запись
+        либо уже видна подсчёту, либо сдвинет исправленное значение
+        после коммита. Возвращает {video_id: число}; пустой словарь —
+        видео больше нет.
+        """
+        try:
+            ids = (
+                union(
+                    select(Comment.video_id).where(Comment.video_id > after),
+                    select(VideoCommentsCount.video_id).where(
+                        VideoCommentsCount.video_id > after
+                    ),
+                )
+                .order_by("video_id")
+                .limit(limit)
+            )
+            video_ids = list((await self.db_session.execute(ids)).scalars())
+            if not video_ids:
+                return {}
+            await self.db_session.execute(
+                select(VideoCommentsCount.id)
+                .where(VideoCommentsCount.video_id.in_(video_ids))
+                .order_by(VideoCommentsCount.video_id)
+                .with_for_update()
+            )
+            res: Result = await self.db_session.execute(
+                select(Comment.video_id, func.count())
+                .where(Comment.video_id.in_(video_ids))
+                .group_by(Comment.video_id)
+            )
+            counts = dict.fromkeys(video_ids, 0)
+            counts.update(res.all())
+            stmt = self._insert_count().values(
+                [
+                    {"video_id": video_id, "count": count}
+                    for video_id, count in counts.items()
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["video_id"],
+                set_={"count": stmt.excluded.count},
+                where=VideoCommentsCount.count != stmt.excluded.count,
+            )
+            await self.db_session.execute(stmt)
+            await self.db_session.commit()
+            return counts
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при пересчёте counts",
+            )
+
+    async def get_roots(
+        self, video_id: int, limit: int, after: int | None = None
+    ) -> Sequence[Comment]:
+        """Комментарии верхнего уровня, новые первыми; after — id последнего"""
+        try:
+            query = (
+                select(Comment)
+                .where(Comment.video_id == video_id, Comment.parent_id.is_(None))
+                .order_by(Comment.id.desc())
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(Comment.id < after)
+            res: Result = await self.db_session.execute(query)
+            return res.scalars().all()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении comments",
+            )
+
+    async def get_thread(
+        self, video_id: int, comment_id: int, limit: int, after: str | None = None
+    ) -> Sequence[Comment]:
+        """Комментарий со всеми ответами одним диапазоном индекса (video_id, path).
+
+        Строки идут в порядке обхода в глубину; after — path последней
+        полученной строки.
+        """
+        try:
+            root_path = (
+                select(Comment.path)
+                .where(Comment.id == comment_id, Comment.video_id == video_id)
+                .scalar_subquery()
+            )
+            query = (
+                select(Comment)
+                .where(
+                    Comment.video_id == video_id,
+                    Comment.path >= root_path,
+                    Comment.path < root_path.concat(PATH_SUBTREE_END),
+                )
+                .order_by(Comment.path)
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(Comment.path > after)
+            res: Result = await self.db_session.execute(query)
+            return res.scalars().all()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении comments",
+            )
+
+    async def get_top(self, video_id: int, limit: int) -> Sequence[Comment]:
+        """Ветки с наибольшим числом ответов"""
+        try:
+            query = (
+                select(Comment)
+                .where(Comment.video_id == video_id, Comment.parent_id.is_(None))
+                .order_by(Comment.replies_count.desc(), Comment.id.desc())
+                .limit(limit)
+            )
+            res: Result = await self.db_session.execute(query)
+            return res.scalars().all()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении comments",
+            )
+
+    async def get_first_pages(
+        self, video_ids: list[int], limit: int
+    ) -> Sequence[Comment]:
+        """Первые limit комментариев верхнего уровня каждого видео одним запросом.
+
+        VALUES со списком id соединяется с LATERAL-подзапросом, так что
+        для каждого видео читается только голова индекса
+        ix_comment_video_id_roots.
+        """
+        if not video_ids:
+            return []
+        try:
+            videos = values(column("video_id", Integer), name="videos").data(
+                [(video_id,) for video_id in video_ids]
+            )
+            first_page = (
+                select(Comment)
+                .where(
+                    Comment.video_id == videos.c.video_id, Comment.parent_id.is_(None)
+                )
+                .order_by(Comment.id.desc())
+                .limit(limit)
+                .lateral("first_page")
+            )
+            comment = aliased(Comment, first_page)
+            query = select(comment).select_from(videos).join(first_page, true())
+            res: Result = await self.db_session.execute(query)
+            return res.scalars().all()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении comments",
+            )
@@ -0,0 +1,5 @@
+__all__ = ["Base", "Comment", "VideoCommentsCount"]
+
+from .base import Base
+from .comment import Comment
+from .counter import VideoCommentsCount
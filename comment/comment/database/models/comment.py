@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+PATH_SEGMENT_WIDTH = 10
+PATH_SEPARATOR = "."
+# следующий за PATH_SEPARATOR символ: верхняя граница диапазона поддерева
+PATH_SUBTREE_END = "/"
+
+
+def path_segment(comment_id: int) -> str:
+    return str(comment_id).zfill(PATH_SEGMENT_WIDTH)
+
+
+class Comment(Base):
+    """Комментарий или ответ.
+
+    path — id всех предков и самого комментария через точку, дополненные
+    нулями до одной ширины. Поддерево занимает непрерывный диапазон
+    [path, path + "/") индекса (video_id, path), и сортировка по path
+    даёт обход треда в глубину с ответами в порядке появления.
+    """
+
+    __tablename__ = "comment"
+    __table_args__ = (
+        Index("ix_comment_video_id_path", "video_id", "path"),
+        Index(
+            "ix_comment_video_id_roots",
+            "video_id",
+            "id",
+            postgresql_where="parent_id IS NULL",
+        ),
+        Index(
+            "ix_comment_video_id_top",
+            "video_id",
+            "replies_count",
+            "id",
+            postgresql_where="parent_id IS NULL",
+        ),
+    )
+
+    video_id: Mapped[int]
+    user_id: Mapped[int]
+    parent_id: Mapped[int | None] = mapped_column(
+        ForeignKey("comment.id", ondelete="CASCADE")
+    )
+    # побайтное сравнение, иначе порядок и диапазоны зависят от локали БД;
+    # в SQLite (бенчмарки) оно и так по умолчанию
+    path: Mapped[str] = mapped_column(
+        String(length=200, collation="C").with_variant(String(length=200), "sqlite"),
+        default="",
+    )
+    depth: Mapped[int] = mapped_column(default=0)
+    # размер всего поддерева, а не только прямых ответов
+    replies_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    text: Mapped[str] = mapped_column(String(length=1000))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"Comment - ({self.id}, {self.path})"
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class VideoCommentsCount(Base):
+    """Число комментариев видео вместе с ответами.
+
+    Ведётся CommentDAL в транзакции записи комментариев и
+    публикуется сервису video через CommentCounts.
+    """
+
+    __tablename__ = "video_comments_count"
+
+    video_id: Mapped[int] = mapped_column(unique=True)
+    count: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"VideoCommentsCount - ({self.video_id}, {self.count})"
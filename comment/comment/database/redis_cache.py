@@ -0,0 +1,79 @@
+from redis import asyncio as aioredis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import (
+    BusyLoadingError,
+    ConnectionError,
+    TimeoutError,
+    WatchError,
+)
+from redis.retry import Retry
+
+from comment.core.config import settings
+
+
+class RedisDB:
+    def __init__(self, client: aioredis.Redis) -> None:
+        self.redis = client
+
+    async def set_key(self, key: str, value: str | int, expire_in_sec: int) -> None:
+        await self.redis.set(key, value, ex=expire_in_sec)
+
+    async def get_value(self, key: str) -> bytes | None:
+        return await self.redis.get(key)
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        """Берёт блокировку key или продлевает её, если она уже у token"""
+        ttl_ms = int(ttl * 1000)
+        if await self.redis.set(key, token, nx=True, px=ttl_ms):
+            return True
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != token.encode():
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.pexpire(key, ttl_ms)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def release_lock(self, key: str, token: str) -> None:
+        """Снимает блокировку, только если она всё ещё у token"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != token.encode():
+                    await pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+            except WatchError:
+                pass
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_redis() -> RedisDB:
+    """Клиент с блокирующим пулом: при всплеске записи запрос ждёт
+    свободное соединение до pool_timeout, а не падает с MaxConnectionsError
+    """
+    return RedisDB(
+        aioredis.Redis(
+            connection_pool=aioredis.BlockingConnectionPool(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                password=settings.redis.password.get_secret_value(),
+                max_connections=settings.redis.max_connections,
+                timeout=settings.redis.pool_timeout,
+                retry=Retry(ExponentialBackoff(), settings.redis.retry),
+                retry_on_error=[TimeoutError, ConnectionError, BusyLoadingError],
+            )
+        )
+    )
+
+
+redis_db = create_redis()
@@ -0,0 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+import uvicorn
+from fastapi import FastAPI
+
+from comment.api.comment import comment_router
+from comment.core.config import settings
+from comment.database.redis_cache import redis_db
+from comment.database.session import ReadYourWritesMiddleware, dh_helper
+from comment.services.comment_batch import comment_batcher
+from comment.services.counts import comment_counts
+from comment.services.top import top_comments
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background = [
+        asyncio.create_task(top_comments.run(settings.comment.top_refresh_interval)),
+        asyncio.create_task(
+            comment_counts.run(settings.comment.counts_publish_interval)
+        ),
+    ]
+    yield
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await comment_batcher.close()
+    await comment_counts.release()
+    await redis_db.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware, helper=dh_helper)
+
+app.include_router(comment_router)
+
+
+if __name__ == "__main__":
+    uvicorn.run("comment.main:app", reload=True)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CreateCommentSchema(BaseModel):
+    user_id: int
+    text: str = Field(min_length=1, max_length=1000)
+    parent_id: int | None = None
+
+
+class UpdateCommentSchema(BaseModel):
+    user_id: int
+    text: str = Field(min_length=1, max_length=1000)
+
+
+class ResponseCommentSchema(BaseModel):
+    id: int
+    video_id: int
+    user_id: int
+    parent_id: int | None
+    depth: int
+    replies_count: int
+    text: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CommentPageSchema(BaseModel):
+    items: list[ResponseCommentSchema]
+    next_cursor: int | None
+
+
+class ThreadPageSchema(BaseModel):
+    items: list[ResponseCommentSchema]
+    next_cursor: str | None
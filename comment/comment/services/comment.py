@@ -0,0 +1,163 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from comment.crud.comment import CommentDAL
+from comment.database.session import dh_helper, releases_connection
+from comment.schemas.comment import (
+    CommentPageSchema,
+    CreateCommentSchema,
+    ResponseCommentSchema,
+    ThreadPageSchema,
+    UpdateCommentSchema,
+)
+from comment.services.comment_batch import CommentBatcher, get_comment_batcher
+from comment.services.counts import CommentCounts, get_comment_counts
+from comment.services.top import TopComments, get_top_comments
+
+
+class CommentServiceBase(metaclass=ABCMeta):
+    @abstractmethod
+    async def create(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def update(self, *args: Any, **kwargs: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def get_comments(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def get_thread(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def get_top(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def get_first_pages(self, *args: Any) -> Any:
+        pass
+
+
+class CommentService(CommentServiceBase):
+    def __init__(
+        self,
+        session: AsyncSession,
+        top: TopComments,
+        batcher: CommentBatcher,
+        counts: CommentCounts,
+        read_session: AsyncSession | None = None,
+    ) -> None:
+        self.db_session = session
+        self.read_session = read_session or session
+        self.sessions = (self.db_session, self.read_session)
+        self.top = top
+        self.batcher = batcher
+        self.counts = counts
+
+    async def create(
+        self, video_id: int, body_comment: CreateCommentSchema
+    ) -> ResponseCommentSchema:
+        """Запись через общий буфер: соединение берёт только CommentBatcher"""
+        comment = await self.batcher.add(video_id, body_comment)
+        await self.top.mark_dirty(video_id)
+        await self.counts.mark_dirty(video_id)
+        return ResponseCommentSchema.model_validate(comment)
+
+    @releases_connection
+    async def update(
+        self, video_id: int, comment_id: int, body_comment: UpdateCommentSchema
+    ) -> ResponseCommentSchema:
+        comment = await CommentDAL(self.db_session).update(
+            comment_id, video_id, body_comment
+        )
+        if comment is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Комментарий не найден",
+            )
+        await self.top.mark_dirty(video_id)
+        return ResponseCommentSchema.model_validate(comment)
+
+    @releases_connection
+    async def delete(self, video_id: int, comment_id: int, user_id: int) -> int:
+        deleted_comment_id = await CommentDAL(self.db_session).delete(
+            comment_id, user_id, video_id
+        )
+        if deleted_comment_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Комментарий не найден",
+            )
+        await self.top.mark_dirty(video_id)
+        await self.counts.mark_dirty(video_id)
+        return deleted_comment_id
+
+    @releases_connection
+    async def get_comments(
+        self, video_id: int, after: int | None, limit: int
+    ) -> CommentPageSchema:
+        comments = await CommentDAL(self.read_session).get_roots(video_id, limit, after)
+        next_cursor = comments[-1].id if len(comments) == limit else None
+        return CommentPageSchema(
+            items=[ResponseCommentSchema.model_validate(c) for c in comments],
+            next_cursor=next_cursor,
+        )
+
+    @releases_connection
+    async def get_thread(
+        self, video_id: int, comment_id: int, after: str | None, limit: int
+    ) -> ThreadPageSchema:
+        comments = await CommentDAL(self.read_session).get_thread(
+            video_id, comment_id, limit, after
+        )
+        if not comments and after is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Комментарий не найден",
+            )
+        next_cursor = comments[-1].path if len(comments) == limit else None
+        return ThreadPageSchema(
+            items=[ResponseCommentSchema.model_validate(c) for c in comments],
+            next_cursor=next_cursor,
+        )
+
+    async def get_top(self, video_id: int) -> list[ResponseCommentSchema]:
+        return await self.top.get(video_id)
+
+    @releases_connection
+    async def get_first_pages(
+        self, video_ids: list[int], limit: int
+    ) -> dict[int, CommentPageSchema]:
+        comments = await CommentDAL(self.read_session).get_first_pages(video_ids, limit)
+        pages = {
+            video_id: CommentPageSchema(items=[], next_cursor=None)
+            for video_id in video_ids
+        }
+        for comment in comments:
+            pages[comment.video_id].items.append(
+                ResponseCommentSchema.model_validate(comment)
+            )
+        for page in pages.values():
+            if len(page.items) == limit:
+                page.next_cursor = page.items[-1].id
+        return pages
+
+
+async def get_service_comment(
+    session: AsyncSession = Depends(dh_helper.scoped_session_dependency),
+    read_session: AsyncSession = Depends(dh_helper.read_session_dependency),
+    top: TopComments = Depends(get_top_comments),
+    batcher: CommentBatcher = Depends(get_comment_batcher),
+    counts: CommentCounts = Depends(get_comment_counts),
+) -> CommentService:
+    return CommentService(session, top, batcher, counts, read_session)
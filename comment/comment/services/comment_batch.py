@@ -0,0 +1,133 @@
+import asyncio
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from comment.core.config import settings
+from comment.crud.comment import CommentDAL
+from comment.database.models.comment import Comment
+from comment.database.session import dh_helper
+from comment.schemas.comment import CreateCommentSchema
+
+# (video_id, тело запроса) и future вызова add
+Pending = tuple[tuple[int, CreateCommentSchema], asyncio.Future]
+
+
+@dataclass
+class BatchStats:
+    flushes: int = 0
+    rows: int = 0
+    failed_flushes: int = 0
+    split_flushes: int = 0
+    max_batch: int = 0
+
+
+class CommentBatcher:
+    """Копит новые комментарии и ответы и пишет их пачкой.
+
+    Пачка уходит в БД, как только набралось max_rows строк или прошло
+    max_delay секунд с первой строки в буфере, и пишется
+    CommentDAL.create_many за постоянное число запросов. Каждый вызов
+    add ждёт свою строку или свою ошибку (неверный родитель). Если пачку
+    откатила одна строка (IntegrityError, например родитель удалён),
+    строки повторяются по одной, и ошибку получает только виновный вызов.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_rows: int,
+        max_delay: float,
+        max_depth: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.max_depth = max_depth
+        self.stats = BatchStats()
+        self._pending: list[Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def add(self, video_id: int, body_comment: CreateCommentSchema) -> Comment:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((video_id, body_comment), future))
+        if len(self._pending) >= self.max_rows:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_pending
+            )
+        return await future
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[Pending]) -> None:
+        try:
+            async with self.session_factory() as session:
+                results = await CommentDAL(session).create_many(
+                    [row for row, _ in batch], self.max_depth
+                )
+        except IntegrityError:
+            if len(batch) > 1:
+                self.stats.split_flushes += 1
+                for item in batch:
+                    await self._flush([item])
+                return
+            self._fail(
+                batch,
+                HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Комментарий не найден",
+                ),
+            )
+            return
+        except Exception as error:
+            self._fail(batch, error)
+            return
+        self.stats.flushes += 1
+        self.stats.rows += len(batch)
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        for (_, future), result in zip(batch, results):
+            # вызывающий мог уйти по таймауту, строка всё равно записана
+            if future.done():
+                continue
+            if isinstance(result, HTTPException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _fail(self, batch: list[Pending], error: Exception) -> None:
+        self.stats.failed_flushes += 1
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Дописывает буфер и ждёт незавершённые вставки"""
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+comment_batcher = CommentBatcher(
+    dh_helper.factory_session,
+    max_rows=settings.comment.batch_max_rows,
+    max_delay=settings.comment.batch_max_delay_ms / 1000,
+    max_depth=settings.comment.max_depth,
+)
+
+
+async def get_comment_batcher() -> CommentBatcher:
+    return comment_batcher
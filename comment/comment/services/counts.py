@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import uuid
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from comment.core.config import settings
+from comment.crud.comment import CommentDAL
+from comment.database.redis_cache import RedisDB, redis_db
+from comment.database.session import dh_helper
+
+# хеш video_id -> число комментариев, его читает задача sync_comment_counts
+# сервиса video
+COUNTS_KEY = "video:comments_count"
+COUNTS_DIRTY_KEY = "comment:count:dirty"
+COUNTS_LOCK_KEY = "comment:count:lock"
+# живёт reconcile_interval секунд: пока ключ есть, полный пересчёт не нужен
+COUNTS_RECONCILED_KEY = "comment:count:reconciled"
+
+logger = logging.getLogger(__name__)
+
+
+class CommentCounts:
+    """Публикует число комментариев видео для сервиса video.
+
+    Комментарии хранит только этот сервис, а точное число по видео
+    ведёт CommentDAL в той же транзакции, что и запись комментария.
+    Запись помечает видео в COUNTS_DIRTY_KEY, фоновая задача переносит
+    текущие числа помеченных видео в хеш COUNTS_KEY, а сервис video
+    забирает их оттуда в Video.comments_count. Публикуются абсолютные
+    значения, поэтому повтор безвреден. Пометка может потеряться
+    (Redis недоступен после коммита), поэтому раз в reconcile_interval
+    числа всех видео пересчитываются COUNT(*) по comment, исправляются
+    в video_comments_count и публикуются целиком. Публикует один воркер
+    — тот, у кого блокировка COUNTS_LOCK_KEY, иначе старое число могло
+    бы лечь поверх нового.
+    """
+
+    def __init__(
+        self,
+        redis: RedisDB,
+        session_factory: async_sessionmaker[AsyncSession],
+        lock_ttl: float,
+        reconcile_interval: float,
+    ) -> None:
+        self.redis = redis
+        self.session_factory = session_factory
+        self.lock_ttl = lock_ttl
+        self.reconcile_interval = reconcile_interval
+        self.token = uuid.uuid4().hex
+
+    async def mark_dirty(self, video_id: int) -> None:
+        try:
+            await self.redis.redis.sadd(COUNTS_DIRTY_KEY, video_id)
+        except RedisError:
+            logger.warning("Не удалось пометить число комментариев %s", video_id)
+
+    async def acquire(self) -> bool:
+        """Берёт или продлевает блокировку публикации"""
+        return await self.redis.acquire_lock(COUNTS_LOCK_KEY, self.token, self.lock_ttl)
+
+    async def publish_dirty(self, batch_size: int = 100) -> int:
+        """Публикует числа пачки помеченных видео; вызывается под блокировкой"""
+        video_ids = await self.redis.redis.spop(COUNTS_DIRTY_KEY, batch_size)
+        if not video_ids:
+            return 0
+        try:
+            async with self.session_factory() as session:
+                counts = await CommentDAL(session).get_counts(
+                    [int(video_id) for video_id in video_ids]
+                )
+            await self.redis.redis.hset(COUNTS_KEY, mapping=counts)
+        except (Exception, asyncio.CancelledError):
+            # снятые с пометки, но не опубликованные видео помечаются снова
+            await self.redis.redis.sadd(COUNTS_DIRTY_KEY, *video_ids)
+            raise
+        return len(video_ids)
+
+    async def reconcile_due(self) -> bool:
+        """Не больше одного полного пересчёта за reconcile_interval на все воркеры"""
+        return bool(
+            await self.redis.redis.set(
+                COUNTS_RECONCILED_KEY,
+                1,
+                nx=True,
+                px=int(self.reconcile_interval * 1000),
+            )
+        )
+
+    async def reconcile(self, batch_size: int = 1000) -> int:
+        """Пересчитывает и публикует числа всех видео; вызывается под блокировкой.
+
+        Блокировка продлевается на каждой пачке: если её перехватили,
+        пересчёт прерывается, его доведёт следующий запуск.
+        """
+        after, total = 0, 0
+        while await self.acquire():
+            async with self.session_factory() as session:
+                counts = await CommentDAL(session).recount(after, batch_size)
+            if not counts:
+                break
+            await self.redis.redis.hset(COUNTS_KEY, mapping=counts)
+            after = max(counts)
+            total += len(counts)
+        return total
+
+    async def run(self, interval: float) -> None:
+        """Фоновый цикл воркера: публикация помеченных видео и пересчёт"""
+        while True:
+            try:
+                while await self.acquire() and await self.publish_dirty():
+                    pass
+                if await self.acquire() and await self.reconcile_due():
+                    logger.info(
+                        "Пересчитано чисел комментариев: %s", await self.reconcile()
+                    )
+            except (HTTPException, RedisError, OSError):
+                logger.exception("Публикация числа комментариев отложена")
+            await asyncio.sleep(interval)
+
+    async def release(self) -> None:
+        try:
+            await self.redis.release_lock(COUNTS_LOCK_KEY, self.token)
+        except RedisError:
+            # блокировка истечёт сама через lock_ttl
+            pass
+
+
+comment_counts = CommentCounts(
+    redis_db,
+    dh_helper.factory_session,
+    lock_ttl=settings.comment.counts_lock_ttl,
+    reconcile_interval=settings.comment.counts_reconcile_interval,
+)
+
+
+async def get_comment_counts() -> CommentCounts:
+    return comment_counts
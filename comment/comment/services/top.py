@@ -0,0 +1,106 @@
+import asyncio
+import logging
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from comment.core.config import settings
+from comment.crud.comment import CommentDAL
+from comment.database.redis_cache import RedisDB, redis_db
+from comment.database.session import dh_helper
+from comment.schemas.comment import ResponseCommentSchema
+
+TOP_COMMENTS_KEY = "comment:top:{video_id}"
+TOP_DIRTY_KEY = "comment:top:dirty"
+
+logger = logging.getLogger(__name__)
+top_adapter = TypeAdapter(list[ResponseCommentSchema])
+
+
+class TopComments:
+    """Заранее посчитанные лучшие ветки видео в Redis.
+
+    Запись комментария только помечает видео в множестве TOP_DIRTY_KEY,
+    а фоновая задача раз в refresh_interval пересчитывает помеченные
+    видео, так что чтение — один GET уже сериализованного списка.
+    Промах и недоступный Redis обслуживаются запросом к БД.
+    """
+
+    def __init__(
+        self,
+        redis: RedisDB,
+        session_factory: async_sessionmaker[AsyncSession],
+        k: int,
+        ttl: int,
+    ) -> None:
+        self.redis = redis
+        self.session_factory = session_factory
+        self.k = k
+        self.ttl = ttl
+
+    async def get(self, video_id: int) -> list[ResponseCommentSchema]:
+        try:
+            cached = await self.redis.get_value(
+                TOP_COMMENTS_KEY.format(video_id=video_id)
+            )
+        except RedisError:
+            cached = None
+        if cached is not None:
+            return top_adapter.validate_json(cached)
+        return await self.refresh(video_id)
+
+    async def refresh(self, video_id: int) -> list[ResponseCommentSchema]:
+        async with self.session_factory() as session:
+            comments = await CommentDAL(session).get_top(video_id, self.k)
+        top = [ResponseCommentSchema.model_validate(c) for c in comments]
+        try:
+            await self.redis.set_key(
+                TOP_COMMENTS_KEY.format(video_id=video_id),
+                top_adapter.dump_json(top),
+                self.ttl,
+            )
+        except RedisError:
+            logger.warning("Не удалось сохранить лучшие комментарии %s", video_id)
+        return top
+
+    async def mark_dirty(self, video_id: int) -> None:
+        try:
+            await self.redis.redis.sadd(TOP_DIRTY_KEY, video_id)
+        except RedisError:
+            # пересчёт дождётся истечения TTL
+            logger.warning("Не удалось пометить лучшие комментарии %s", video_id)
+
+    async def refresh_dirty(self, batch_size: int = 100) -> int:
+        video_ids = await self.redis.redis.spop(TOP_DIRTY_KEY, batch_size)
+        for done, video_id in enumerate(video_ids):
+            try:
+                await self.refresh(int(video_id))
+            except (Exception, asyncio.CancelledError):
+                # снятые с пометки, но не пересчитанные видео помечаются снова
+                await self.redis.redis.sadd(TOP_DIRTY_KEY, *video_ids[done:])
+                raise
+        return len(video_ids)
+
+    async def run(self, interval: float) -> None:
+        """Фоновый цикл воркера: пересчёт помеченных видео"""
+        while True:
+            try:
+                while await self.refresh_dirty():
+                    pass
+            except (HTTPException, RedisError, OSError):
+                logger.exception("Пересчёт лучших комментариев отложен")
+            await asyncio.sleep(interval)
+
+
+top_comments = TopComments(
+    redis_db,
+    dh_helper.factory_session,
+    k=settings.comment.top_k,
+    ttl=settings.comment.top_ttl,
+)
+
+
+async def get_top_comments() -> TopComments:
+    return top_comments
@@ -0,0 +1 @@
+uvicorn comment.main:app --host 0.0.0.0 --port 8000 --reload
@@ -0,0 +1,64 @@
+"""initial
+
+Revision ID: d2c7a9e4f105
+Revises:
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2c7a9e4f105"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "comment",
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("path", sa.String(length=200, collation="C"), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.Column("replies_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("text", sa.String(length=1000), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["parent_id"], ["comment.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_comment_video_id_path", "comment", ["video_id", "path"], unique=False
+    )
+    op.create_index(
+        "ix_comment_video_id_roots",
+        "comment",
+        ["video_id", "id"],
+        unique=False,
+        postgresql_where="parent_id IS NULL",
+    )
+    op.create_index(
+        "ix_comment_video_id_top",
+        "comment",
+        ["video_id", "replies_count", "id"],
+        unique=False,
+        postgresql_where="parent_id IS NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comment_video_id_top", table_name="comment")
+    op.drop_index("ix_comment_video_id_roots", table_name="comment")
+    op.drop_index("ix_comment_video_id_path", table_name="comment")
+    op.drop_table("comment")
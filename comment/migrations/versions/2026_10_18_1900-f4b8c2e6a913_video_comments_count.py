@@ -0,0 +1,39 @@
+"""video comments count
+
+Revision ID: f4b8c2e6a913
+Revises: d2c7a9e4f105
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4b8c2e6a913"
+down_revision: str | None = "d2c7a9e4f105"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_comments_count",
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("video_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO video_comments_count (video_id, count)
+        SELECT video_id, count(*) FROM comment GROUP BY video_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("video_comments_count")
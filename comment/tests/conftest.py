@@ -0,0 +1,86 @@
+import os
+
+import httpx
+import pytest
+from fakeredis import aioredis as fakeredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# настройки без значений по умолчанию; сами сервисы в тестах подменяются
+for name, value in {
+    "COMMENT_DB_HOST": "localhost",
+    "COMMENT_DB_NAME": "comment",
+    "COMMENT_DB_PORT": "5432",
+    "COMMENT_DB_USER": "comment",
+    "COMMENT_DB_PASSWORD": "comment",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "redis",
+}.items():
+    os.environ.setdefault(name, value)
+
+from comment.core.config import settings  # noqa: E402
+from comment.database.models.base import Base  # noqa: E402
+from comment.database.redis_cache import RedisDB  # noqa: E402
+from comment.database.session import dh_helper  # noqa: E402
+from comment.main import app  # noqa: E402
+from comment.services.comment_batch import (  # noqa: E402
+    CommentBatcher,
+    get_comment_batcher,
+)
+from comment.services.counts import CommentCounts, get_comment_counts  # noqa: E402
+from comment.services.top import TopComments, get_top_comments  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'comment.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeRedis()
+    yield RedisDB(client)
+    await client.aclose()
+
+
+@pytest.fixture
+async def client(engine, redis):
+    """Приложение на SQLite и fakeredis; пачка уходит через 1 мс"""
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def session_dependency():
+        async with factory() as session:
+            yield session
+
+    top = TopComments(redis, factory, k=settings.comment.top_k, ttl=60)
+    batcher = CommentBatcher(
+        factory, max_rows=100, max_delay=0.001, max_depth=settings.comment.max_depth
+    )
+    counts = CommentCounts(redis, factory, lock_ttl=30, reconcile_interval=3600)
+    app.dependency_overrides = {
+        dh_helper.scoped_session_dependency: session_dependency,
+        dh_helper.read_session_dependency: session_dependency,
+        get_top_comments: lambda: top,
+        get_comment_batcher: lambda: batcher,
+        get_comment_counts: lambda: counts,
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    await batcher.close()
+    app.dependency_overrides = {}
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select
+
+from comment.crud.comment import CommentDAL
+from comment.database.models.comment import Comment
+from comment.schemas.comment import CreateCommentSchema
+from comment.services.counts import COUNTS_DIRTY_KEY
+from tests.query_counter import QueryCounter
+
+pytestmark = pytest.mark.anyio
+
+MAX_DEPTH = 16
+
+
+def body(text: str, parent_id: int | None = None) -> CreateCommentSchema:
+    return CreateCommentSchema(user_id=1, text=text, parent_id=parent_id)
+
+
+async def test_delete_removes_subtree_and_adjusts_counts(engine, session):
+    dal = CommentDAL(session)
+    root = await dal.create(1, body("root"), MAX_DEPTH)
+    reply = await dal.create(1, body("reply", root.id), MAX_DEPTH)
+    nested = await dal.create(1, body("nested", reply.id), MAX_DEPTH)
+    await dal.create(1, body("nested 2", nested.id), MAX_DEPTH)
+    sibling = await dal.create(1, body("sibling", root.id), MAX_DEPTH)
+    other = await dal.create(1, body("other"), MAX_DEPTH)
+
+    with QueryCounter(engine) as counter:
+        deleted = await dal.delete(reply.id, user_id=1, video_id=1)
+    # DELETE поддерева, UPDATE предков, число комментариев видео
+    counter.assert_count(3)
+    assert deleted == reply.id
+    res = await session.execute(select(Comment.id, Comment.replies_count))
+    assert dict(res.all()) == {root.id: 1, sibling.id: 0, other.id: 0}
+    assert await dal.get_counts([1]) == {1: 3}
+
+    assert await dal.delete(root.id, user_id=2, video_id=1) is None
+    assert await dal.delete(root.id, user_id=1, video_id=2) is None
+    assert await dal.delete(root.id, user_id=1, video_id=1) == root.id
+    assert await dal.get_counts([1]) == {1: 1}
+
+
+async def test_update_and_delete_endpoints(client, redis):
+    root = (
+        await client.post("/video/1/comments", json={"user_id": 1, "text": "root"})
+    ).json()
+    await client.post(
+        "/video/1/comments",
+        json={"user_id": 2, "text": "reply", "parent_id": root["id"]},
+    )
+    await redis.redis.delete(COUNTS_DIRTY_KEY)
+
+    url = f"/video/1/comments/{root['id']}"
+    forbidden = await client.patch(url, json={"user_id": 2, "text": "чужой"})
+    assert forbidden.status_code == 404
+    updated = await client.patch(url, json={"user_id": 1, "text": "edited"})
+    assert updated.status_code == 200
+    assert updated.json()["text"] == "edited"
+    assert updated.json()["replies_count"] == 1
+
+    assert (await client.delete(url, params={"user_id": 2})).status_code == 404
+    response = await client.delete(url, params={"user_id": 1})
+    assert response.json() == root["id"]
+    # удаление помечает число комментариев видео для публикации
+    assert await redis.redis.smembers(COUNTS_DIRTY_KEY) == {b"1"}
+    page = await client.get("/video/1/comments")
+    assert page.json()["items"] == []
+    assert (await client.delete(url, params={"user_id": 1})).status_code == 404
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from comment.crud.comment import CommentDAL
+from comment.database.models.counter import VideoCommentsCount
+from comment.schemas.comment import CreateCommentSchema
+from comment.services.counts import COUNTS_DIRTY_KEY, COUNTS_KEY, CommentCounts
+
+pytestmark = pytest.mark.anyio
+
+MAX_DEPTH = 16
+
+
+def body(text: str, parent_id: int | None = None) -> CreateCommentSchema:
+    return CreateCommentSchema(user_id=1, text=text, parent_id=parent_id)
+
+
+@pytest.fixture
+def counts(engine, redis):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    return CommentCounts(redis, factory, lock_ttl=30, reconcile_interval=3600)
+
+
+async def test_publish_dirty(session, redis, counts):
+    dal = CommentDAL(session)
+    root = await dal.create(1, body("root"), MAX_DEPTH)
+    await dal.create(1, body("reply", root.id), MAX_DEPTH)
+    await counts.mark_dirty(1)
+    await counts.mark_dirty(2)
+
+    assert await counts.acquire()
+    assert await counts.publish_dirty() == 2
+    assert await redis.redis.hgetall(COUNTS_KEY) == {b"1": b"2", b"2": b"0"}
+    assert not await redis.redis.exists(COUNTS_DIRTY_KEY)
+
+
+async def test_reconcile_fixes_lost_marks_and_drift(session, redis, counts):
+    dal = CommentDAL(session)
+    for video_id in (1, 2, 3):
+        root = await dal.create(video_id, body("root"), MAX_DEPTH)
+        await dal.create(video_id, body("reply", root.id), MAX_DEPTH)
+    await dal.delete(root.id, user_id=1, video_id=3)
+    # пометки потеряны, а одно число разошлось с таблицей comment
+    await session.execute(
+        update(VideoCommentsCount)
+        .where(VideoCommentsCount.video_id == 2)
+        .values(count=7)
+    )
+    await session.commit()
+
+    assert await counts.acquire()
+    assert await counts.reconcile_due()
+    assert await counts.reconcile(batch_size=2) == 3
+    assert await redis.redis.hgetall(COUNTS_KEY) == {
+        b"1": b"2",
+        b"2": b"2",
+        b"3": b"0",
+    }
+    assert await dal.get_counts([1, 2, 3]) == {1: 2, 2: 2, 3: 0}
+    # следующий полный пересчёт — не раньше reconcile_interval
+    assert not await counts.reconcile_due()
+
+
+async def test_reconcile_stops_without_lock(redis, counts, session):
+    await CommentDAL(session).create(1, body("root"), MAX_DEPTH)
+    other = CommentCounts(
+        redis, counts.session_factory, lock_ttl=30, reconcile_interval=3600
+    )
+    assert await other.acquire()
+
+    assert await counts.reconcile() == 0
+    assert not await redis.redis.exists(COUNTS_KEY)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+from scripts.import_video_comments import import_comments, video_comment
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from comment.crud.comment import CommentDAL
+from comment.database.models.comment import Comment, path_segment
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def source(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'video.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def test_import_copies_roots_once(source, engine, session):
+    async with source.begin() as connection:
+        await connection.execute(
+            text(
+                "CREATE TABLE comment (id INTEGER PRIMARY KEY, video_id INTEGER, "
+                "user_id INTEGER, text VARCHAR, created_at DATETIME)"
+            )
+        )
+        await connection.execute(
+            insert(video_comment),
+            [
+                {
+                    "id": number,
+                    "video_id": 1 + number % 2,
+                    "user_id": number,
+                    "text": f"comment {number}",
+                    "created_at": datetime(2024, 1, number),
+                }
+                for number in range(1, 6)
+            ],
+        )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    assert await import_comments(source, factory, batch_size=2) == 5
+    # повторный запуск ничего не дублирует
+    assert await import_comments(source, factory, batch_size=2) == 0
+
+    res = await session.execute(select(Comment).order_by(Comment.id))
+    comments = res.scalars().all()
+    assert [c.text for c in comments] == [f"comment {n}" for n in range(1, 6)]
+    assert all(c.path == path_segment(c.id) and c.depth == 0 for c in comments)
+    assert comments[0].created_at == datetime(2024, 1, 1)
+    assert await CommentDAL(session).get_counts([1, 2]) == {1: 2, 2: 3}
+
+
+async def test_import_without_legacy_table(source, engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    assert await import_comments(source, factory) == 0
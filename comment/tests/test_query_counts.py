@@ -0,0 +1,105 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from comment.crud.comment import CommentDAL
+from comment.database.models.comment import Comment
+from comment.schemas.comment import CreateCommentSchema
+from tests.query_counter import QueryCounter
+
+pytestmark = pytest.mark.anyio
+
+MAX_DEPTH = 16
+
+
+def body(text: str, parent_id: int | None = None) -> CreateCommentSchema:
+    return CreateCommentSchema(user_id=1, text=text, parent_id=parent_id)
+
+
+async def test_create_comment_is_insert_path_and_counter(engine, session):
+    with QueryCounter(engine) as counter:
+        comment = await CommentDAL(session).create(1, body("root"), MAX_DEPTH)
+    counter.assert_count(3)
+    assert (await CommentDAL(session).get_counts([1, 2])) == {1: 1, 2: 0}
+    assert comment.path == f"{comment.id:010}"
+
+
+async def test_create_many_is_constant_number_of_statements(engine, session):
+    dal = CommentDAL(session)
+    root = await dal.create(1, body("root"), MAX_DEPTH)
+    reply = await dal.create(1, body("reply", root.id), MAX_DEPTH)
+    rows = [(1, body(f"root {number}")) for number in range(10)]
+    rows += [(1, body(f"reply {number}", reply.id)) for number in range(10)]
+    rows += [(2, body("other video")), (2, body("wrong video", root.id))]
+    with QueryCounter(engine) as counter:
+        results = await dal.create_many(rows, MAX_DEPTH)
+    # SQLite не гарантирует порядок RETURNING многострочного INSERT, и
+    # SQLAlchemy вставляет там по строке; в Postgres это один запрос
+    inserts = [s for s in counter.statements if s.startswith("INSERT INTO comment ")]
+    assert counter.count - len(inserts) == 4
+
+    *created, wrong_video = results
+    assert isinstance(wrong_video, HTTPException)
+    assert wrong_video.status_code == 404
+    assert [comment.text for comment in created] == [new.text for _, new in rows[:-1]]
+    assert all(c.path == reply.path + f".{c.id:010}" for c in created[10:20])
+    res = await session.execute(select(Comment.id, Comment.replies_count))
+    replies_count = dict(res.all())
+    assert replies_count[root.id] == 11
+    assert replies_count[reply.id] == 10
+    assert (await dal.get_counts([1, 2])) == {1: 22, 2: 1}
+
+
+async def test_create_many_rejects_too_deep_reply(session):
+    dal = CommentDAL(session)
+    parent = await dal.create(1, body("root"), MAX_DEPTH)
+    [result] = await dal.create_many([(1, body("reply", parent.id))], max_depth=0)
+    assert isinstance(result, HTTPException)
+    assert result.status_code == 400
+    assert (await dal.get_counts([1])) == {1: 1}
+
+
+async def test_create_comment_endpoints(engine, client):
+    with QueryCounter(engine) as counter:
+        response = await client.post(
+            "/video/1/comments", json={"user_id": 1, "text": "root"}
+        )
+    # INSERT, path и число комментариев видео
+    counter.assert_count(3)
+    assert response.status_code == 201
+    root = response.json()
+
+    with QueryCounter(engine) as counter:
+        response = await client.post(
+            "/video/1/comments",
+            json={"user_id": 2, "text": "reply", "parent_id": root["id"]},
+        )
+    # ещё SELECT родителя и UPDATE replies_count предков
+    counter.assert_count(5)
+    assert response.json()["depth"] == 1
+
+
+async def test_read_comment_endpoints_are_single_select(engine, client):
+    root = (
+        await client.post("/video/1/comments", json={"user_id": 1, "text": "root"})
+    ).json()
+    await client.post(
+        "/video/1/comments",
+        json={"user_id": 2, "text": "reply", "parent_id": root["id"]},
+    )
+    with QueryCounter(engine) as counter:
+        page = await client.get("/video/1/comments")
+    counter.assert_count(1)
+    assert [item["id"] for item in page.json()["items"]] == [root["id"]]
+
+    with QueryCounter(engine) as counter:
+        thread = await client.get(f"/video/1/comments/{root['id']}/thread")
+    counter.assert_count(1)
+    assert [item["depth"] for item in thread.json()["items"]] == [0, 1]
+
+    # промах кеша лучших веток — один SELECT, дальше ответ из Redis
+    with QueryCounter(engine) as counter:
+        await client.get("/video/1/comments/top")
+        top = await client.get("/video/1/comments/top")
+    counter.assert_count(1)
+    assert top.json()[0]["replies_count"] == 1
@@ -0,0 +1,143 @@
+"""Пропускная способность записи лайков: INSERT ... ON CONFLICT в БД
+на каждый лайк против множеств Redis с фоновым переносом в БД
+(LikeService + LikeFlusher).
+
+По умолчанию БД — SQLite-файл, Redis — fakeredis; для настоящих
+серверов передайте --url (postgresql+asyncpg://..., таблицы из миграций)
+и --redis-url. Запуск из каталога likes:
+    python benchmarks/bench_like_writes.py --likes 20000 --videos 100
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def workload(likes: int, videos: int, users: int) -> list[tuple[str, int, int]]:
+    """Лайки с долей повторов и снятий, видео распределены по Zipf"""
+    rng = random.Random(42)
+    weights = [1 / rank for rank in range(1, videos + 1)]
+    video_ids = rng.choices(range(1, videos + 1), weights, k=likes)
+    return [
+        ("unlike" if rng.random() < 0.1 else "like", video_id, rng.randrange(users))
+        for video_id in video_ids
+    ]
+
+
+async def direct(helper, ops, concurrency: int) -> float:
+    from likes.crud.like import LikeDAL
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(op: str, video_id: int, user_id: int) -> None:
+        async with semaphore, helper.factory_session() as session:
+            pair = [(video_id, user_id)]
+            if op == "like":
+                await LikeDAL(session).apply(pair, [])
+            else:
+                await LikeDAL(session).apply([], pair)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*op) for op in ops))
+    return len(ops) / (time.perf_counter() - started)
+
+
+async def buffered(service, ops, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(op: str, video_id: int, user_id: int) -> None:
+        async with semaphore:
+            await getattr(service, op)(user_id, video_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*op) for op in ops))
+    return len(ops) / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--likes", type=int, default=20000)
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--url")
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    from redis import asyncio as aioredis
+    from sqlalchemy import delete, func, select
+
+    from likes.database.models.base import Base
+    from likes.database.models.like import Like
+    from likes.database.redis_cache import RedisDB
+    from likes.database.session import DDHelper
+    from likes.services.flusher import LikeFlusher
+    from likes.services.likes import LikeService
+
+    if args.redis_url:
+        client = aioredis.Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeAsyncRedis(
+            connection_pool=aioredis.BlockingConnectionPool(
+                connection_class=fakeredis.FakeAsyncConnection,
+                server=fakeredis.FakeServer(),
+                max_connections=100,
+            )
+        )
+    redis = RedisDB(client)
+    await client.flushdb()
+
+    url = args.url or f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    helper = DDHelper(url=url, pool_size=20, max_overflow=0)
+    async with helper.engine.begin() as connection:
+        if args.url is None:
+            # иначе конкурентные писатели упираются в блокировку файла
+            await connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+            await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(delete(Like))
+
+    ops = workload(args.likes, args.videos, args.users)
+    rate = await direct(helper, ops, args.concurrency)
+    print(f"{'direct':>9}: {rate:9.1f} likes/s")
+
+    async with helper.engine.begin() as connection:
+        expected = (await connection.execute(select(func.count(Like.id)))).scalar()
+        await connection.execute(delete(Like))
+
+    service = LikeService(redis, helper.factory_session)
+    rate = await buffered(service, ops, args.concurrency)
+    print(f"{'buffered':>9}: {rate:9.1f} likes/s")
+
+    flusher = LikeFlusher(
+        redis, helper.factory_session, args.batch_size, interval=0, lock_ttl=30
+    )
+    started = time.perf_counter()
+    await flusher.drain()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'flush':>9}: {flusher.stats.events / elapsed:9.1f} events/s, "
+        f"{flusher.stats}"
+    )
+
+    async with helper.engine.connect() as connection:
+        stored = (await connection.execute(select(func.count(Like.id)))).scalar()
+    counts = await service.get_counts(list(range(1, args.videos + 1)))
+    print(
+        f"rows in db: direct {expected}, buffered {stored}, "
+        f"redis total {sum(counts.values())}"
+    )
+    await client.aclose()
+    await helper.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+uvicorn likes.main:app --host 0.0.0.0 --port 8000 --reload
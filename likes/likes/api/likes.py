@@ -0,0 +1,48 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from likes.schemas.like import LikeStateSchema
+from likes.services.likes import LikeService, get_service_like
+
+likes_router = APIRouter(tags=["Likes"])
+MAX_COUNT_VIDEOS = 500
+
+
+@likes_router.put("/video/{video_id}/likes/{user_id}", response_model=LikeStateSchema)
+async def like_video(
+    video_id: int,
+    user_id: int,
+    like_service: LikeService = Depends(get_service_like),
+):
+    """Идемпотентно: повторный лайк не меняет счётчик"""
+    return await like_service.like(user_id, video_id)
+
+
+@likes_router.delete(
+    "/video/{video_id}/likes/{user_id}", response_model=LikeStateSchema
+)
+async def unlike_video(
+    video_id: int,
+    user_id: int,
+    like_service: LikeService = Depends(get_service_like),
+):
+    return await like_service.unlike(user_id, video_id)
+
+
+@likes_router.get("/video/{video_id}/likes/{user_id}", response_model=bool)
+async def is_video_liked(
+    video_id: int,
+    user_id: int,
+    like_service: LikeService = Depends(get_service_like),
+):
+    return await like_service.is_liked(user_id, video_id)
+
+
+@likes_router.get("/likes/counts", response_model=dict[int, int])
+async def likes_counts(
+    video_id: Annotated[list[int], Query(min_length=1, max_length=MAX_COUNT_VIDEOS)],
+    like_service: LikeService = Depends(get_service_like),
+):
+    """Счётчики лайков для видео ленты одним запросом"""
+    return await like_service.get_counts(list(dict.fromkeys(video_id)))
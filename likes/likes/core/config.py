@@ -0,0 +1,78 @@
+from functools import lru_cache
+from pathlib import Path
+
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BASE_DIR = Path(__name__).parent.parent.parent
+
+
+class AppSettings(BaseSettings):
+    app_name: str = "Проект Youtube: лайки"
+    API_V1_STR: str = "/api/v1/"
+
+
+class DBSettings(BaseSettings):
+    host: str
+    name: str
+    port: int
+    user: str
+    password: SecretStr
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+
+    model_config = SettingsConfigDict(
+        env_prefix="likes_db_", env_file=BASE_DIR / ".env"
+    )
+
+    def _url(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.user}:"
+            f"{self.password.get_secret_value()}"
+            f"@{self.host}:{self.port}/{self.name}"
+        )
+
+    @property
+    def async_url(self) -> str:
+        return self._url()
+
+
+class RedisDBSettings(BaseSettings):
+    host: str
+    port: int
+    password: SecretStr
+    retry: int = 3
+    max_connections: int = 100
+    pool_timeout: float = 5.0
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="redis_")
+
+
+class LikesSettings(BaseSettings):
+    flush_interval: float = 1.0
+    flush_batch_size: int = 5000
+    # блокировка единственного флашера; продлевается перед каждой пачкой
+    flush_lock_ttl: float = 30.0
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="likes_")
+
+
+class Settings:
+    app: AppSettings = AppSettings()
+    db: DBSettings = DBSettings()
+    redis: RedisDBSettings = RedisDBSettings()
+    likes: LikesSettings = LikesSettings()
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
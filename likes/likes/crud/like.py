@@ -0,0 +1,71 @@
+from collections import defaultdict
+from collections.abc import Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Result, delete, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from likes.database.models.like import Like
+
+Pair = tuple[int, int]
+
+
+class LikeDAL:
+    def __init__(self, session: AsyncSession) -> None:
+        self.db_session = session
+
+    def _insert(self):
+        # SQLite нужен только бенчмаркам, ON CONFLICT у обоих диалектов общий
+        if self.db_session.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(Like)
+        return postgresql.insert(Like)
+
+    async def get_user_ids(self, video_ids: Sequence[int]) -> dict[int, list[int]]:
+        """Кто лайкнул каждое из видео, одним запросом"""
+        try:
+            query = select(Like.video_id, Like.user_id).where(
+                Like.video_id.in_(video_ids)
+            )
+            res: Result = await self.db_session.execute(query)
+            user_ids: dict[int, list[int]] = defaultdict(list)
+            for video_id, user_id in res:
+                user_ids[video_id].append(user_id)
+            return user_ids
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при получении likes",
+            )
+
+    async def apply(self, likes: Sequence[Pair], unlikes: Sequence[Pair]) -> None:
+        """Записывает пачку лайков и снятий лайков одной транзакцией.
+
+        Пары (video_id, user_id) вставляются многострочным
+        INSERT ... ON CONFLICT DO NOTHING и удаляются одним DELETE,
+        поэтому повторная запись той же пачки ничего не меняет.
+        """
+        try:
+            if likes:
+                stmt = self._insert().on_conflict_do_nothing(
+                    index_elements=["video_id", "user_id"]
+                )
+                await self.db_session.execute(
+                    stmt.values(
+                        [
+                            {"video_id": video_id, "user_id": user_id}
+                            for video_id, user_id in likes
+                        ]
+                    )
+                )
+            if unlikes:
+                await self.db_session.execute(
+                    delete(Like).where(tuple_(Like.video_id, Like.user_id).in_(unlikes))
+                )
+            await self.db_session.commit()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при записи likes",
+            )
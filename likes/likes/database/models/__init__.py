@@ -0,0 +1,4 @@
+__all__ = ["Base", "Like"]
+
+from .base import Base
+from .like import Like
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class Like(Base):
+    __tablename__ = "video_like"
+    __table_args__ = (
+        UniqueConstraint("video_id", "user_id", name="uq_video_like_video_id_user_id"),
+    )
+
+    video_id: Mapped[int]
+    user_id: Mapped[int]
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"Like - ({self.video_id}, {self.user_id})"
@@ -0,0 +1,17 @@
+import uuid
+
+
+def asyncpg_connect_args(statement_cache_size: int, pgbouncer: bool) -> dict:
+    """connect_args для asyncpg.
+
+    PgBouncer в режиме transaction/statement не держит серверные
+    prepared statements между транзакциями, поэтому оба кеша
+    выключаются, а имена стейтментов делаются уникальными.
+    """
+    if not pgbouncer:
+        return {"statement_cache_size": statement_cache_size}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
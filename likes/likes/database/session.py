@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from likes.core.config import settings
+from likes.database.pool import asyncpg_connect_args
+
+
+@dataclass
+class DDHelper:
+    """Engine и фабрика сессий: LikeService и LikeFlusher открывают сессии сами"""
+
+    url: str
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+
+    def __post_init__(self):
+        connect_args = {}
+        if make_url(self.url).get_driver_name() == "asyncpg":
+            connect_args = asyncpg_connect_args(
+                self.statement_cache_size, self.pgbouncer
+            )
+        self.engine = create_async_engine(
+            url=self.url,
+            echo=self.echo,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args=connect_args,
+        )
+        self.factory_session = async_sessionmaker(
+            self.engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            autoflush=False,
+        )
+
+
+dh_helper = DDHelper(
+    url=settings.db.async_url,
+    echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    statement_cache_size=settings.db.statement_cache_size,
+    pgbouncer=settings.db.pgbouncer,
+)
@@ -0,0 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+import uvicorn
+from fastapi import FastAPI
+
+from likes.api.likes import likes_router
+from likes.database.redis_cache import redis_db
+from likes.services.flusher import like_flusher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flusher = asyncio.create_task(like_flusher.run())
+    yield
+    flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await flusher
+    await like_flusher.drain()
+    await redis_db.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(likes_router)
+
+
+if __name__ == "__main__":
+    uvicorn.run("likes.main:app", reload=True)
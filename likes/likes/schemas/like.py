@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class LikeStateSchema(BaseModel):
+    video_id: int
+    user_id: int
+    liked: bool
+    likes_count: int
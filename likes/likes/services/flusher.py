@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from likes.core.config import settings
+from likes.crud.like import LikeDAL
+from likes.database.redis_cache import RedisDB, redis_db
+from likes.database.session import dh_helper
+from likes.services.keys import (
+    FLUSH_LOCK_KEY,
+    LIKE,
+    PENDING_KEY,
+    PROCESSING_KEY,
+    decode_event,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FlushStats:
+    flushes: int = 0
+    events: int = 0
+    likes: int = 0
+    unlikes: int = 0
+    failed_flushes: int = 0
+
+
+class LikeFlusher:
+    """Переносит очередь изменений лайков из Redis в Postgres.
+
+    Пишет один флашер на все воркеры — тот, у кого блокировка
+    FLUSH_LOCK_KEY, поэтому события попадают в БД в порядке очереди.
+    Пачка до batch_size событий атомарно переносится LMOVE из головы
+    PENDING_KEY в PROCESSING_KEY и удаляется оттуда только после
+    коммита. Если запись не удалась или процесс упал, следующая попытка
+    начинается с PROCESSING_KEY; повторная запись той же пачки ничего
+    не меняет. Для каждой пары (video_id, user_id) остаётся только
+    последнее событие, и пачка пишется одним LikeDAL.apply.
+    """
+
+    def __init__(
+        self,
+        redis: RedisDB,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int,
+        interval: float,
+        lock_ttl: float,
+    ) -> None:
+        self.redis = redis
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lock_ttl = lock_ttl
+        self.token = uuid.uuid4().hex
+        self.stats = FlushStats()
+
+    async def acquire(self) -> bool:
+        """Берёт или продлевает блокировку флашера"""
+        return await self.redis.acquire_lock(FLUSH_LOCK_KEY, self.token, self.lock_ttl)
+
+    async def flush_once(self) -> int:
+        """Записывает одну пачку и возвращает число обработанных событий.
+
+        Вызывается только под блокировкой флашера.
+        """
+        events = await self.redis.redis.lrange(PROCESSING_KEY, 0, -1)
+        if not events:
+            events = await self._take()
+        if not events:
+            return 0
+        latest: dict[tuple[int, int], bool] = {}
+        for raw in events:
+            op, video_id, user_id = decode_event(raw)
+            latest[(video_id, user_id)] = op == LIKE
+        likes = [pair for pair, liked in latest.items() if liked]
+        unlikes = [pair for pair, liked in latest.items() if not liked]
+        try:
+            async with self.session_factory() as session:
+                await LikeDAL(session).apply(likes, unlikes)
+        except Exception:
+            # события остаются в PROCESSING_KEY до следующей попытки
+            self.stats.failed_flushes += 1
+            raise
+        await self.redis.redis.delete(PROCESSING_KEY)
+        self.stats.flushes += 1
+        self.stats.events += len(events)
+        self.stats.likes += len(likes)
+        self.stats.unlikes += len(unlikes)
+        return len(events)
+
+    async def _take(self) -> list[bytes]:
+        """Переносит голову очереди в PROCESSING_KEY одной транзакцией"""
+        size = min(await self.redis.redis.llen(PENDING_KEY), self.batch_size)
+        if not size:
+            return []
+        async with self.redis.redis.pipeline(transaction=True) as pipe:
+            for _ in range(size):
+                pipe.lmove(PENDING_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+            moved = await pipe.execute()
+        return [raw for raw in moved if raw is not None]
+
+    async def drain(self) -> None:
+        """Записывает очередь целиком, если блокировка у этого флашера"""
+        try:
+            while await self.acquire() and await self.flush_once():
+                pass
+        finally:
+            await self.redis.release_lock(FLUSH_LOCK_KEY, self.token)
+
+    async def run(self) -> None:
+        """Фоновый цикл: полные пачки подряд, иначе пауза interval"""
+        while True:
+            flushed = 0
+            try:
+                if await self.acquire():
+                    flushed = await self.flush_once()
+            except (HTTPException, RedisError, OSError):
+                logger.exception("Не удалось записать лайки в БД")
+            if flushed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+
+like_flusher = LikeFlusher(
+    redis_db,
+    dh_helper.factory_session,
+    batch_size=settings.likes.flush_batch_size,
+    interval=settings.likes.flush_interval,
+    lock_ttl=settings.likes.flush_lock_ttl,
+)
@@ -0,0 +1,17 @@
+VIDEO_LIKES_KEY = "likes:video:{video_id}"
+PENDING_KEY = "likes:pending"
+# пачка, забранная флашером и ещё не записанная в БД
+PROCESSING_KEY = "likes:processing"
+FLUSH_LOCK_KEY = "likes:flush:lock"
+# Redis не хранит пустые множества: маркер отличает «лайков нет» от «не загружено»
+LOADED_MARKER = "-"
+LIKE, UNLIKE = "+", "-"
+
+
+def encode_event(op: str, video_id: int, user_id: int) -> str:
+    return f"{op}:{video_id}:{user_id}"
+
+
+def decode_event(raw: bytes) -> tuple[str, int, int]:
+    op, video_id, user_id = raw.decode().split(":")
+    return op, int(video_id), int(user_id)
@@ -0,0 +1,175 @@
+from abc import ABCMeta, abstractmethod
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Depends, HTTPException, status
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from likes.crud.like import LikeDAL
+from likes.database.redis_cache import RedisDB, get_redis
+from likes.database.session import dh_helper
+from likes.schemas.like import LikeStateSchema
+from likes.services.keys import (
+    LIKE,
+    LOADED_MARKER,
+    PENDING_KEY,
+    UNLIKE,
+    VIDEO_LIKES_KEY,
+    encode_event,
+)
+
+
+class LikeServiceBase(metaclass=ABCMeta):
+    @abstractmethod
+    async def like(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def unlike(self, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    async def get_counts(self, *args: Any) -> Any:
+        pass
+
+
+class LikeService(LikeServiceBase):
+    """Лайки с хранением состояния в Redis.
+
+    Лайки видео — множество id пользователей в Redis, поэтому повторный
+    лайк или снятие лайка ничего не меняют, а счётчик — это SCARD.
+    Каждое изменение в той же транзакции MULTI попадает в очередь
+    PENDING_KEY, откуда LikeFlusher пачками переносит его в Postgres.
+    Множество видео, которого нет в Redis, один раз загружается из БД
+    в той же транзакции, что и первое изменение (см. _queue_loads).
+    """
+
+    def __init__(
+        self, redis: RedisDB, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        self.redis = redis
+        self.session_factory = session_factory
+
+    async def like(self, user_id: int, video_id: int) -> LikeStateSchema:
+        return await self._change(LIKE, user_id, video_id)
+
+    async def unlike(self, user_id: int, video_id: int) -> LikeStateSchema:
+        return await self._change(UNLIKE, user_id, video_id)
+
+    async def _change(self, op: str, user_id: int, video_id: int) -> LikeStateSchema:
+        key = VIDEO_LIKES_KEY.format(video_id=video_id)
+        try:
+            async with self.redis.redis.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        await self._queue_loads(pipe, [video_id])
+                        if op == LIKE:
+                            pipe.sadd(key, user_id)
+                        else:
+                            pipe.srem(key, user_id)
+                        pipe.rpush(PENDING_KEY, encode_event(op, video_id, user_id))
+                        pipe.scard(key)
+                        size = (await pipe.execute())[-1]
+                        break
+                    except WatchError:
+                        # множество загрузил или изменил другой запрос
+                        continue
+        except RedisError:
+            raise self._unavailable()
+        return LikeStateSchema(
+            video_id=video_id,
+            user_id=user_id,
+            liked=op == LIKE,
+            likes_count=size - 1,
+        )
+
+    async def get_counts(self, video_ids: Sequence[int]) -> dict[int, int]:
+        """Число лайков для списка видео одним пайплайном SCARD"""
+        try:
+            async with self.redis.redis.pipeline(transaction=False) as pipe:
+                for video_id in video_ids:
+                    pipe.scard(VIDEO_LIKES_KEY.format(video_id=video_id))
+                sizes = await pipe.execute()
+            counts = {
+                video_id: size - 1 for video_id, size in zip(video_ids, sizes) if size
+            }
+            cold = [video_id for video_id in video_ids if video_id not in counts]
+            if cold:
+                counts.update(await self._load(cold))
+        except RedisError:
+            raise self._unavailable()
+        return counts
+
+    async def is_liked(self, user_id: int, video_id: int) -> bool:
+        key = VIDEO_LIKES_KEY.format(video_id=video_id)
+        try:
+            async with self.redis.redis.pipeline(transaction=False) as pipe:
+                pipe.exists(key)
+                pipe.sismember(key, user_id)
+                loaded, liked = await pipe.execute()
+            if not loaded:
+                await self._load([video_id])
+                liked = await self.redis.redis.sismember(key, user_id)
+        except RedisError:
+            raise self._unavailable()
+        return bool(liked)
+
+    async def _load(self, video_ids: list[int]) -> dict[int, int]:
+        """Загружает из БД ещё не загруженные множества и возвращает число лайков"""
+        async with self.redis.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    loads = await self._queue_loads(pipe, video_ids)
+                    for video_id in video_ids:
+                        pipe.scard(VIDEO_LIKES_KEY.format(video_id=video_id))
+                    sizes = (await pipe.execute())[loads:]
+                    break
+                except WatchError:
+                    continue
+        return {video_id: size - 1 for video_id, size in zip(video_ids, sizes)}
+
+    async def _queue_loads(self, pipe: Pipeline, video_ids: Sequence[int]) -> int:
+        """Ставит в транзакцию pipe загрузку множеств, которых нет в Redis.
+
+        Сначала читается БД, и только потом в одной MULTI записываются
+        маркер и лайки из БД, а за ними вызывающий ставит свои команды:
+        если чтение БД упало, в Redis ничего не попало. Пока идёт чтение,
+        ключи под WATCH: если множество тем временем загрузил или изменил
+        другой запрос, EXEC бросит WatchError и попытку надо повторить,
+        иначе старые лайки из БД легли бы поверх уже снятых в Redis.
+        Возвращает число поставленных команд.
+        """
+        keys = [VIDEO_LIKES_KEY.format(video_id=video_id) for video_id in video_ids]
+        await pipe.watch(*keys)
+        cold = [
+            video_id
+            for video_id, key in zip(video_ids, keys)
+            if not await pipe.exists(key)
+        ]
+        user_ids: dict[int, list[int]] = {}
+        if cold:
+            async with self.session_factory() as session:
+                user_ids = await LikeDAL(session).get_user_ids(cold)
+        else:
+            await pipe.unwatch()
+        pipe.multi()
+        for video_id in cold:
+            pipe.sadd(
+                VIDEO_LIKES_KEY.format(video_id=video_id),
+                LOADED_MARKER,
+                *user_ids.get(video_id, ()),
+            )
+        return len(cold)
+
+    @staticmethod
+    def _unavailable() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="хранилище лайков недоступно",
+        )
+
+
+async def get_service_like(redis: RedisDB = Depends(get_redis)) -> LikeService:
+    return LikeService(redis, dh_helper.factory_session)
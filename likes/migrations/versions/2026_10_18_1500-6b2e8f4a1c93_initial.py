@@ -0,0 +1,41 @@
+"""initial
+
+Revision ID: 6b2e8f4a1c93
+Revises:
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6b2e8f4a1c93"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_like",
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "video_id", "user_id", name="uq_video_like_video_id_user_id"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("video_like")
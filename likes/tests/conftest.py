@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from fakeredis import aioredis as fakeredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# настройки без значений по умолчанию; сами сервисы в тестах подменяются
+for name, value in {
+    "LIKES_DB_HOST": "localhost",
+    "LIKES_DB_NAME": "likes",
+    "LIKES_DB_PORT": "5432",
+    "LIKES_DB_USER": "likes",
+    "LIKES_DB_PASSWORD": "likes",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "redis",
+}.items():
+    os.environ.setdefault(name, value)
+
+from likes.database.models.base import Base  # noqa: E402
+from likes.database.redis_cache import RedisDB  # noqa: E402
+from likes.services.likes import LikeService  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'likes.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def factory(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeRedis()
+    yield RedisDB(client)
+    await client.aclose()
+
+
+@pytest.fixture
+def service(redis, factory):
+    """Сервис лайков на SQLite и fakeredis"""
+    return LikeService(redis, factory)
@@ -0,0 +1,98 @@
+import pytest
+from fastapi import HTTPException, status
+
+from likes.crud.like import LikeDAL
+from likes.services.keys import (
+    LIKE,
+    LOADED_MARKER,
+    PENDING_KEY,
+    UNLIKE,
+    VIDEO_LIKES_KEY,
+    encode_event,
+)
+
+pytestmark = pytest.mark.anyio
+
+KEY = VIDEO_LIKES_KEY.format(video_id=1)
+
+
+@pytest.fixture
+async def stored(factory):
+    """В БД уже лежат лайки пользователей 1 и 2 к видео 1"""
+    async with factory() as session:
+        await LikeDAL(session).apply([(1, 1), (1, 2)], [])
+
+
+async def members(redis) -> set[bytes]:
+    return await redis.redis.smembers(KEY)
+
+
+async def test_cold_like_loads_set_before_change(service, redis, stored):
+    state = await service.like(3, 1)
+
+    assert state.liked and state.likes_count == 3
+    assert await members(redis) == {LOADED_MARKER.encode(), b"1", b"2", b"3"}
+    assert await redis.redis.lrange(PENDING_KEY, 0, -1) == [
+        encode_event(LIKE, 1, 3).encode()
+    ]
+    # множество загружено: повторный лайк ничего не меняет
+    assert (await service.like(3, 1)).likes_count == 3
+
+
+async def test_cold_unlike_removes_like_loaded_from_db(service, redis, stored):
+    state = await service.unlike(1, 1)
+
+    assert not state.liked and state.likes_count == 1
+    assert await members(redis) == {LOADED_MARKER.encode(), b"2"}
+    assert await redis.redis.lrange(PENDING_KEY, 0, -1) == [
+        encode_event(UNLIKE, 1, 1).encode()
+    ]
+
+
+async def test_failed_load_leaves_redis_untouched(service, redis, stored, monkeypatch):
+    async def broken(self, video_ids):
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(LikeDAL, "get_user_ids", broken)
+        with pytest.raises(HTTPException):
+            await service.like(3, 1)
+
+    # ни маркера с неполным множеством, ни события в очереди
+    assert not await redis.redis.exists(KEY)
+    assert not await redis.redis.exists(PENDING_KEY)
+    assert (await service.like(3, 1)).likes_count == 3
+
+
+async def test_concurrent_load_retries_without_stale_likes(
+    service, redis, stored, monkeypatch
+):
+    get_user_ids = LikeDAL.get_user_ids
+    calls = []
+
+    async def racing(self, video_ids):
+        calls.append(video_ids)
+        user_ids = await get_user_ids(self, video_ids)
+        if len(calls) == 1:
+            # пока читалась БД, другой запрос загрузил множество и снял лайк 1
+            await redis.redis.sadd(KEY, LOADED_MARKER, 2)
+        return user_ids
+
+    monkeypatch.setattr(LikeDAL, "get_user_ids", racing)
+    state = await service.like(3, 1)
+
+    assert calls == [[1]]
+    assert state.likes_count == 2
+    assert await members(redis) == {LOADED_MARKER.encode(), b"2", b"3"}
+
+
+async def test_counts_and_is_liked_load_cold_sets(service, redis, stored):
+    await service.like(5, 2)
+
+    assert await service.get_counts([1, 2, 3]) == {1: 2, 2: 1, 3: 0}
+    assert await redis.redis.smembers(VIDEO_LIKES_KEY.format(video_id=3)) == {
+        LOADED_MARKER.encode()
+    }
+    await redis.redis.delete(KEY)
+    assert await service.is_liked(2, 1)
+    assert not await service.is_liked(3, 1)
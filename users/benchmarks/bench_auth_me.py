@@ -0,0 +1,105 @@
+"""Запросы в секунду для /auth/me: проверка токена с кешами ключей
+и проверенных токенов против режима без кешей.
+
+БД не нужна: AuthService подменяется заглушкой, поэтому замеряется
+только путь аутентификации, Redis подменяется fakeredis.
+Запуск из каталога users:
+    python benchmarks/bench_auth_me.py --requests 5000
+    python benchmarks/bench_auth_me.py --requests 5000 --claims-only
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def write_keys(directory: Path) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (directory / "jwt-private.pem").write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    (directory / "jwt-public.pem").write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+
+class FakeAuthService:
+    async def get_active_user(self, user_id):
+        return SimpleNamespace(
+            id=user_id, email="user@example.com", is_active=True, role="user"
+        )
+
+
+async def run(app, token: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get("/auth/me", headers=headers)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--claims-only", action="store_true")
+    args = parser.parse_args()
+
+    certs = Path(tempfile.mkdtemp())
+    write_keys(certs)
+    os.environ["TOKEN_PRIVATE_KEY_PATH"] = str(certs / "jwt-private.pem")
+    os.environ["TOKEN_PUBLIC_KEY_PATH"] = str(certs / "jwt-public.pem")
+    os.environ.setdefault("TOKEN_ALGORITHM", "RS256")
+    os.environ["TOKEN_CLAIMS_ONLY"] = str(args.claims_only)
+
+    import fakeredis
+
+    from main import app
+    from users.database.redis_cache import redis_db
+    from users.services import auth_token
+    from users.services.user import get_auth_service
+
+    redis_db.redis = fakeredis.FakeAsyncRedis()
+    app.dependency_overrides[get_auth_service] = FakeAuthService
+    token = await auth_token.TokenManager().generate_access_token(
+        {"sub": 1, "email": "user@example.com", "role": "user"}
+    )
+
+    rps = await run(app, token, args.requests, args.concurrency)
+    print(f"{'cached':>10}: {rps:8.1f} req/s")
+
+    auth_token.verified_tokens.maxsize = 0
+    auth_token.verified_tokens._data.clear()
+    auth_token.public_keys.check_interval = 0
+    rps = await run(app, token, args.requests, args.concurrency)
+    print(f"{'uncached':>10}: {rps:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""Задержка /auth/me, пока /auth/login нагружается проверкой bcrypt.
+
+Режим pool — bcrypt в PasswordHasherPool, режим inline — прямо в event loop,
+как было раньше. БД не нужна: поиск пользователя подменяется заглушкой.
+Запуск из каталога users:
+    python benchmarks/load_login_me.py --logins 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import bcrypt
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_auth_me import write_keys  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+async def measure(
+    app, token: str, logins: int, concurrency: int, interval: float
+) -> list[float]:
+    """Время ответа /auth/me, отсчитываемое от запланированного момента запроса.
+
+    Между запросами выдерживается пауза interval; если event loop занят bcrypt,
+    пробуждение опаздывает, и эта задержка попадает в замер целиком.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login() -> None:
+            async with semaphore:
+                await client.post(
+                    "/auth/login",
+                    data={"username": "user@example.com", "password": PASSWORD},
+                )
+
+        async def me_loop(done: asyncio.Event) -> list[float]:
+            timings = []
+            while not done.is_set():
+                scheduled = time.perf_counter() + interval
+                await asyncio.sleep(interval)
+                response = await client.get(
+                    "/auth/me", headers={"Authorization": f"Bearer {token}"}
+                )
+                response.raise_for_status()
+                timings.append(time.perf_counter() - scheduled)
+            return timings
+
+        done = asyncio.Event()
+        me_task = asyncio.create_task(me_loop(done))
+        await asyncio.sleep(interval)
+        await asyncio.gather(*(login() for _ in range(logins)))
+        done.set()
+        return await me_task
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings.sort()
+    print(
+        f"{name:>7}: {len(timings):5d} x /auth/me "
+        f"p50 {statistics.median(timings) * 1000:7.2f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99)] * 1000:7.2f} ms, "
+        f"max {timings[-1] * 1000:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    certs = Path(tempfile.mkdtemp())
+    write_keys(certs)
+    os.environ["TOKEN_PRIVATE_KEY_PATH"] = str(certs / "jwt-private.pem")
+    os.environ["TOKEN_PUBLIC_KEY_PATH"] = str(certs / "jwt-public.pem")
+
+    import fakeredis
+
+    from main import app
+    from users.database.redis_cache import redis_db
+    from users.services.auth_token import TokenManager, get_token_manager
+    from users.services.hashing import password_hasher
+    from users.services.user import AuthService, get_auth_service
+
+    redis_db.redis = fakeredis.FakeAsyncRedis()
+
+    user = SimpleNamespace(
+        id=1,
+        email="user@example.com",
+        role="user",
+        is_active=True,
+        password=bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt()),
+    )
+
+    class StubAuthService(AuthService):
+        async def get_by_email(self, email):
+            return user
+
+        async def get_active_user(self, user_id):
+            return user
+
+    async def stub_auth_service() -> AuthService:
+        return StubAuthService(None, await get_token_manager())
+
+    app.dependency_overrides[get_auth_service] = stub_auth_service
+    token = await TokenManager().generate_access_token(
+        {"sub": user.id, "email": user.email, "role": user.role}
+    )
+
+    report(
+        "pool", await measure(app, token, args.logins, args.concurrency, args.interval)
+    )
+    print(f"{'':>7}  {password_hasher.stats}")
+
+    async def inline(func, *func_args):
+        return func(*func_args)
+
+    password_hasher.run = inline
+    report(
+        "inline",
+        await measure(app, token, args.logins, args.concurrency, args.interval),
+    )
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
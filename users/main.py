@@ -1,9 +1,22 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
-
 from users.api.auth import auth_router
+from users.database.redis_cache import redis_db
+from users.database.session import ReadYourWritesMiddleware, dh_helper
+from users.services.hashing import password_hasher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    password_hasher.shutdown()
+    await redis_db.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware, helper=dh_helper)
 
 app.include_router(auth_router)
 
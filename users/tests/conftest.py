@@ -0,0 +1,118 @@
+import os
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fakeredis import aioredis as fakeredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# настройки без значений по умолчанию; сами сервисы в тестах подменяются
+for name, value in {
+    "USERS_DB_HOST": "localhost",
+    "USERS_DB_NAME": "users",
+    "USERS_DB_PORT": "5432",
+    "USERS_DB_USER": "users",
+    "USERS_DB_PASSWORD": "users",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "redis",
+    "TOKEN_ACCESS_EXPIRE": "15",
+    "TOKEN_REFRESH_EXPIRE": "1440",
+    "TOKEN_REFRESH_COOKIE_NAME": "refresh_token",
+    "TOKEN_ALGORITHM": "RS256",
+}.items():
+    os.environ.setdefault(name, value)
+
+from main import app  # noqa: E402
+from users.database.models.base import Base  # noqa: E402
+from users.database.redis_cache import redis_db  # noqa: E402
+from users.database.session import dh_helper  # noqa: E402
+from users.services import auth_token  # noqa: E402
+from users.services.user_cache import user_cache  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    """fakeredis под общим redis_db: им пользуются отзыв и семьи refresh"""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis_db, "redis", client)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def keys(tmp_path, monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = tmp_path / "jwt-private.pem"
+    public_path = tmp_path / "jwt-public.pem"
+    private_path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    monkeypatch.setattr(
+        auth_token,
+        "private_keys",
+        auth_token.KeyStore(
+            private_path,
+            lambda data: serialization.load_pem_private_key(data, password=None),
+            check_interval=60,
+        ),
+    )
+    monkeypatch.setattr(
+        auth_token,
+        "public_keys",
+        auth_token.KeyStore(
+            public_path, serialization.load_pem_public_key, check_interval=60
+        ),
+    )
+
+
+@pytest.fixture
+async def client(engine, redis, keys):
+    """Приложение на SQLite и fakeredis с ключами JWT во tmp_path"""
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def session_dependency():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides = {
+        dh_helper.scoped_session_dependency: session_dependency,
+        dh_helper.read_session_dependency: session_dependency,
+    }
+    user_cache._data.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides = {}
+    user_cache._data.clear()
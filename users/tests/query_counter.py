@@ -0,0 +1,43 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Считает SQL-запросы, отправленные через engine внутри блока `with`.
+
+    Используется, чтобы зафиксировать число обращений к БД на эндпоинт:
+
+        with QueryCounter(engine) as counter:
+            await client.post("/", ...)
+        counter.assert_count(1)
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine.sync_engine
+        self.statements: list[str] = []
+
+    def _before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements.clear()
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_count(self, expected: int) -> None:
+        if self.count != expected:
+            executed = "\n".join(self.statements)
+            raise AssertionError(
+                f"ожидалось {expected} SQL-запросов, выполнено {self.count}:\n{executed}"
+            )
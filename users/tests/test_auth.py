@@ -0,0 +1,119 @@
+import pytest
+from fastapi import HTTPException, status
+from redis.exceptions import ConnectionError
+from sqlalchemy import select
+
+from main import app
+from tests.query_counter import QueryCounter
+from users.crud.user import UserDAL
+from users.database.models.user import User
+from users.permissins.user import get_current_principal, get_current_user
+from users.services.revocation import REVOKED_USER_KEY
+
+pytestmark = pytest.mark.anyio
+
+EMAIL = "user@example.com"
+PASSWORD = "password"
+
+
+@pytest.fixture
+async def user_id(client) -> int:
+    response = await client.post("/auth/", json={"email": EMAIL, "password": PASSWORD})
+    return response.json()["id"]
+
+
+@pytest.fixture
+def claims_only(client):
+    """Как при TOKEN_CLAIMS_ONLY=true: пользователь берётся из claims"""
+    app.dependency_overrides[get_current_user] = get_current_principal
+
+
+async def login(client) -> dict[str, str]:
+    response = await client.post(
+        "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def is_active(session, user_id: int) -> bool:
+    res = await session.execute(select(User.is_active).where(User.id == user_id))
+    return res.scalar_one()
+
+
+async def test_claims_only_principal_skips_database(
+    engine, client, user_id, claims_only
+):
+    headers = await login(client)
+
+    with QueryCounter(engine) as counter:
+        response = await client.get("/auth/me", headers=headers)
+    counter.assert_count(0)
+    assert response.json()["id"] == user_id
+    assert response.json()["email"] == EMAIL
+
+
+async def test_deactivation_revokes_issued_tokens(
+    client, redis, session, user_id, claims_only
+):
+    headers = await login(client)
+
+    response = await client.delete("/auth/deactivate_user", headers=headers)
+    assert response.status_code == 200
+    assert await redis.exists(REVOKED_USER_KEY.format(user_id=user_id))
+    assert not await is_active(session, user_id)
+
+    # токены выданы до деактивации, но claims больше не пускают
+    me = await client.get("/auth/me", headers=headers)
+    assert (me.status_code, me.json()["detail"]) == (401, "token revoked")
+    refresh = await client.post("/auth/refresh")
+    assert (refresh.status_code, refresh.json()["detail"]) == (401, "token revoked")
+
+
+async def test_deactivation_without_revocation_list_keeps_user_active(
+    client, redis, session, user_id, monkeypatch
+):
+    headers = await login(client)
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis, "set", unavailable)
+    response = await client.delete("/auth/deactivate_user", headers=headers)
+    assert response.status_code == 503
+    assert await is_active(session, user_id)
+
+
+async def test_failed_deactivation_reports_database_error(
+    client, redis, user_id, monkeypatch
+):
+    headers = await login(client)
+
+    async def failing_delete(self, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="db down"
+        )
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(UserDAL, "delete", failing_delete)
+    # снять отзыв тоже не удалось: наружу всё равно исходная ошибка БД
+    monkeypatch.setattr(redis, "delete", unavailable)
+    response = await client.delete("/auth/deactivate_user", headers=headers)
+    assert (response.status_code, response.json()["detail"]) == (500, "db down")
+
+
+async def test_failed_deactivation_restores_user(client, redis, user_id, monkeypatch):
+    headers = await login(client)
+
+    async def failing_delete(self, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="db down"
+        )
+
+    monkeypatch.setattr(UserDAL, "delete", failing_delete)
+    response = await client.delete("/auth/deactivate_user", headers=headers)
+    assert response.status_code == 500
+    assert not await redis.exists(REVOKED_USER_KEY.format(user_id=user_id))
+    assert (await client.get("/auth/me", headers=headers)).status_code == 200
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from users.services.hashing import PasswordHasherPool
+
+pytestmark = pytest.mark.anyio
+
+
+async def hasher_metrics(client) -> dict:
+    response = await client.get("/auth/metrics")
+    assert response.status_code == 200
+    return response.json()["password_hasher"]
+
+
+async def test_metrics_count_hashes(client):
+    before = await hasher_metrics(client)
+    await client.post("/auth/", json={"email": "user@example.com", "password": "pw"})
+    await client.post(
+        "/auth/login", data={"username": "user@example.com", "password": "pw"}
+    )
+
+    after = await hasher_metrics(client)
+    # хеш при регистрации и проверка при входе
+    assert after["completed"] - before["completed"] == 2
+    assert after["in_flight"] == after["waiting"] == 0
+
+
+async def test_metrics_count_rejections():
+    hasher = PasswordHasherPool("thread", max_workers=1, max_concurrency=1, max_queue=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(5)
+
+    running = asyncio.create_task(hasher.run(blocking))
+    queued = asyncio.create_task(hasher.run(blocking))
+    await asyncio.to_thread(started.wait, 5)
+    with pytest.raises(HTTPException):
+        await hasher.run(blocking)
+
+    metrics = hasher.metrics()
+    assert (metrics["in_flight"], metrics["waiting"], metrics["rejected"]) == (1, 1, 1)
+    release.set()
+    await asyncio.gather(running, queued)
+    assert hasher.metrics()["completed"] == 2
+    hasher.shutdown()
@@ -0,0 +1,78 @@
+import pytest
+
+from tests.query_counter import QueryCounter
+from users.crud.user import UserDAL
+from users.schemas.user import UpdateUserSchema
+
+pytestmark = pytest.mark.anyio
+
+EMAIL = "user@example.com"
+PASSWORD = "password"
+
+
+async def test_create_user_is_single_insert(engine, session):
+    with QueryCounter(engine) as counter:
+        user = await UserDAL(session).create(EMAIL, b"hash")
+    counter.assert_count(1)
+    assert user.email == EMAIL
+
+
+async def test_update_user_with_empty_body_returns_current_row(engine, session):
+    user = await UserDAL(session).create(EMAIL, b"hash")
+    with QueryCounter(engine) as counter:
+        updated = await UserDAL(session).update(user.id, UpdateUserSchema(email=None))
+    counter.assert_count(1)
+    assert updated.email == EMAIL
+
+
+async def login(client) -> dict[str, str]:
+    response = await client.post(
+        "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def test_register_endpoint_is_lookup_and_insert(engine, client):
+    with QueryCounter(engine) as counter:
+        response = await client.post(
+            "/auth/", json={"email": EMAIL, "password": PASSWORD}
+        )
+    counter.assert_count(2)
+    assert response.json()["email"] == EMAIL
+
+    with QueryCounter(engine) as counter:
+        again = await client.post("/auth/", json={"email": EMAIL, "password": PASSWORD})
+    counter.assert_count(1)
+    assert again.status_code == 400
+
+
+async def test_login_and_refresh_endpoints(engine, client):
+    await client.post("/auth/", json={"email": EMAIL, "password": PASSWORD})
+    with QueryCounter(engine) as counter:
+        await login(client)
+    counter.assert_count(1)
+
+    # refresh проверяет только claims и семью токена в Redis
+    with QueryCounter(engine) as counter:
+        response = await client.post("/auth/refresh")
+    counter.assert_count(0)
+    assert response.status_code == 200
+
+
+async def test_me_and_update_endpoints(engine, client):
+    await client.post("/auth/", json={"email": EMAIL, "password": PASSWORD})
+    headers = await login(client)
+    with QueryCounter(engine) as counter:
+        first = await client.get("/auth/me", headers=headers)
+        second = await client.get("/auth/me", headers=headers)
+    # второй запрос берёт пользователя из кеша воркера
+    counter.assert_count(1)
+    assert first.json() == second.json()
+
+    with QueryCounter(engine) as counter:
+        response = await client.patch(
+            "/auth/update", headers=headers, json={"email": "new@example.com"}
+        )
+    counter.assert_count(1)
+    assert response.json()["email"] == "new@example.com"
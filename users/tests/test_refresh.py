@@ -0,0 +1,77 @@
+import pytest
+
+from users.database.redis_cache import redis_db
+from users.services.refresh_family import REFRESH_FAMILY_KEY, RefreshTokenFamilies
+
+pytestmark = pytest.mark.anyio
+
+EMAIL = "user@example.com"
+PASSWORD = "password"
+COOKIE = "refresh_token"
+
+
+@pytest.fixture
+async def logged_in(client) -> str:
+    """Регистрация и логин; возвращает выданный refresh токен"""
+    await client.post("/auth/", json={"email": EMAIL, "password": PASSWORD})
+    response = await client.post(
+        "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    return client.cookies[COOKIE]
+
+
+def present(client, refresh_token: str) -> None:
+    client.cookies.clear()
+    client.cookies.set(COOKIE, refresh_token)
+
+
+async def test_rotation_issues_working_token(client, logged_in):
+    response = await client.post("/auth/refresh")
+    assert response.status_code == 200
+    rotated = client.cookies[COOKIE]
+    assert rotated != logged_in
+
+    me = await client.get(
+        "/auth/me",
+        headers={"Authorization": f"Bearer {response.json()['access_token']}"},
+    )
+    assert me.status_code == 200
+    assert me.json()["email"] == EMAIL
+
+    # новым токеном можно ротировать дальше
+    assert (await client.post("/auth/refresh")).status_code == 200
+
+
+async def test_reuse_revokes_whole_family(client, logged_in):
+    assert (await client.post("/auth/refresh")).status_code == 200
+    rotated = client.cookies[COOKIE]
+
+    present(client, logged_in)
+    reused = await client.post("/auth/refresh")
+    assert (reused.status_code, reused.json()["detail"]) == (
+        401,
+        "refresh token reused or expired",
+    )
+
+    # после утечки не действует и последний выданный токен
+    present(client, rotated)
+    latest = await client.post("/auth/refresh")
+    assert (latest.status_code, latest.json()["detail"]) == (
+        401,
+        "refresh token reused or expired",
+    )
+
+
+async def test_rotate_replaces_only_current_jti(redis):
+    families = RefreshTokenFamilies(redis_db, ttl=60)
+    key = REFRESH_FAMILY_KEY.format(family="family")
+    await families.start("family", "first")
+
+    assert await families.rotate("family", "first", "second")
+    assert await redis.get(key) == b"second"
+    assert 0 < await redis.ttl(key) <= 60
+
+    assert not await families.rotate("family", "first", "third")
+    assert not await redis.exists(key)
+    assert not await families.rotate("family", "second", "third")
@@ -4,9 +4,11 @@ from fastapi import APIRouter, Depends, Form, HTTPException, Response, status
 from pydantic import EmailStr, SecretStr
 
 from users.core.config import settings
-from users.permissins.user import CurrentUser
+from users.permissins.user import CurrentPrincipal
 from users.schemas.token import TokenResponse
 from users.schemas.user import CreateUserSchema, ResponseUserSchema, UpdateUserSchema
+from users.services.auth_token import verify_refresh_token
+from users.services.hashing import password_hasher
 from users.services.user import AuthService, get_auth_service
 
 auth_router = APIRouter(tags=["Auth"], prefix="/auth")
@@ -21,7 +23,7 @@ async def register(
 
 @auth_router.patch("/update", response_model=ResponseUserSchema)
 async def update_user(
-    user: CurrentUser,
+    user: CurrentPrincipal,
     user_body: UpdateUserSchema,
     auth_service: AuthService = Depends(get_auth_service),
 ):
@@ -36,13 +38,13 @@ async def update_user(
 
 @auth_router.delete("/deactivate_user", response_model=int)
 async def deactivate_user(
-    user: CurrentUser, auth_service: AuthService = Depends(get_auth_service)
+    user: CurrentPrincipal, auth_service: AuthService = Depends(get_auth_service)
 ):
     return await auth_service.deactivate_user(user.id)
 
 
 @auth_router.get("/me", response_model=ResponseUserSchema)
-async def me(user: CurrentUser):
+async def me(user: CurrentPrincipal):
     return user
 
 
@@ -54,10 +56,31 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service),
 ):
     access_token, refresh_token = await auth_service.login(username, password)
+    set_refresh_cookie(response, refresh_token)
+    return TokenResponse(access_token=access_token, token_type="bearer")
+
+
+@auth_router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    response: Response,
+    refresh_token: Annotated[str, Depends(verify_refresh_token)],
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    access_token, refresh_token = await auth_service.refresh(refresh_token)
+    set_refresh_cookie(response, refresh_token)
+    return TokenResponse(access_token=access_token, token_type="bearer")
+
+
+def set_refresh_cookie(response: Response, refresh_token: str) -> None:
     response.set_cookie(
         key=settings.token.refresh_cookie_name,
         value=refresh_token,
         httponly=True,
-        expires=settings.token.refresh_expire,
+        max_age=settings.token.refresh_expire * 60,
     )
-    return TokenResponse(access_token=access_token, token_type="bearer")
+
+
+@auth_router.get("/metrics")
+async def auth_metrics():
+    """Пул bcrypt: сколько хешей считается, ждёт и отклонено"""
+    return {"password_hasher": password_hasher.metrics()}
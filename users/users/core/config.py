@@ -1,6 +1,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,7 +20,17 @@ class DBSettings(BaseSettings):
     port: int
     user: str
     password: SecretStr
-    echo: bool = True
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+    replica_urls: list[str] = []
+    replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    read_your_writes: float = 5.0
 
     model_config = SettingsConfigDict(
         env_prefix="users_db_", env_file=BASE_DIR / ".env"
@@ -37,6 +48,15 @@ class DBSettings(BaseSettings):
         return self._url()
 
 
+class RedisDBSettings(BaseSettings):
+    host: str
+    port: int
+    password: SecretStr
+    retry: int = 3
+
+    model_config = SettingsConfigDict(env_prefix="redis_", env_file=BASE_DIR / ".env")
+
+
 class TokenAuthSettings(BaseSettings):
     access_expire: int
     refresh_expire: int
@@ -45,14 +65,32 @@ class TokenAuthSettings(BaseSettings):
 
     private_key_path: Path = BASE_DIR / "users" / "certs" / "jwt-private.pem"
     public_key_path: Path = BASE_DIR / "users" / "certs" / "jwt-public.pem"
+    key_check_interval: float = 1.0
+    verified_cache_size: int = 10_000
+    claims_only: bool = False
+    user_cache_size: int = 10_000
+    user_cache_ttl: float = 5.0
 
     model_config = SettingsConfigDict(env_prefix="token_", env_file=BASE_DIR / ".env")
 
 
+class PasswordHashSettings(BaseSettings):
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 4
+    max_concurrency: int = 8
+    max_queue: int = 256
+
+    model_config = SettingsConfigDict(
+        env_prefix="password_hash_", env_file=BASE_DIR / ".env"
+    )
+
+
 class Settings:
     app: AppSettings = AppSettings()
     db: DBSettings = DBSettings()
+    redis: RedisDBSettings = RedisDBSettings()
     token: TokenAuthSettings = TokenAuthSettings()
+    password_hash: PasswordHashSettings = PasswordHashSettings()
 
 
 @lru_cache
@@ -1,7 +1,7 @@
 from typing import Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy import Result, Row, select, update
+from sqlalchemy import Result, Row, insert, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import override
@@ -17,15 +17,15 @@ class UserDAL(CrudBase):
         self.db_session = session
 
     @override
-    async def create(
-        self, email: str, hash_password: bytes
-    ) -> Row[tuple[User]] | Exception:
+    async def create(self, email: str, hash_password: bytes) -> User | Exception:
         try:
-            new_user = User(email=email, password=hash_password)
-            self.db_session.add(new_user)
+            stmt = (
+                insert(User).values(email=email, password=hash_password).returning(User)
+            )
+            res: Result = await self.db_session.execute(stmt)
+            new_user: User = res.scalar_one()
             await self.db_session.commit()
-            await self.db_session.refresh(new_user)
-            return await self.get(new_user.id)
+            return new_user
         except SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,18 +53,28 @@ class UserDAL(CrudBase):
     @override
     async def update(
         self, user_id: int, body_user: UpdateUserSchema
-    ) -> Row[tuple[User]] | None | Exception:
+    ) -> User | None | Exception:
+        values = body_user.model_dump(exclude_none=True)
         try:
-            stmt = (
-                update(User)
-                .where(User.id == user_id)
-                .values(**body_user.model_dump())
-                .returning(User.id)
-            )
-            res: Result = await self.db_session.execute(stmt)
-            await self.db_session.commit()
-            updated_user_id = res.scalar()
-            return await self.get(updated_user_id)
+            if values:
+                stmt = (
+                    update(User)
+                    .where(User.id == user_id, User.is_active == True)
+                    .values(**values)
+                    .returning(User)
+                    .execution_options(populate_existing=True)
+                )
+                res: Result = await self.db_session.execute(stmt)
+                updated_user: User | None = res.scalar_one_or_none()
+                await self.db_session.commit()
+            else:
+                # менять нечего: UPDATE без SET не собрать, отдаём текущую строку
+                updated_user = await self.get_by_id(user_id)
+            if updated_user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="user not found"
+                )
+            return updated_user
         except SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -106,6 +116,17 @@ class UserDAL(CrudBase):
                 detail="Ошибка SQLAlchemyError при получении списка user",
             )
 
+    async def get_by_id(self, user_id: int) -> User | None | Exception:
+        try:
+            query = select(User).where(User.id == user_id, User.is_active == True)
+            res: Result = await self.db_session.execute(query)
+            return res.scalar()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="ошибка SQLAlchemyError при получении user по id",
+            )
+
     async def get_by_email(self, email: str) -> User | None | Exception:
         try:
             query = select(User).where(User.email == email, User.is_active == True)  # type: ignore[E702]
@@ -0,0 +1,67 @@
+from redis import asyncio as aioredis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import (
+    BusyLoadingError,
+    ConnectionError,
+    TimeoutError,
+    WatchError,
+)
+from redis.retry import Retry
+
+from users.core.config import settings
+
+
+class RedisDB:
+    def __init__(self, client: aioredis.Redis) -> None:
+        self.redis = client
+
+    async def set_key(self, key: str, value: str | int, expire_in_sec: int) -> None:
+        await self.redis.set(key, value, ex=expire_in_sec)
+
+    async def get_value(self, key: str) -> bytes | None:
+        return await self.redis.get(key)
+
+    async def is_exists(self, key: str) -> bool:
+        return bool(await self.redis.exists(key))
+
+    async def delete_key(self, key: str) -> None:
+        await self.redis.delete(key)
+
+    async def compare_and_set(
+        self, key: str, expected: str, value: str, expire_in_sec: int
+    ) -> bool:
+        """Атомарно заменяет значение, только если сейчас там expected"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != expected.encode():
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.set(key, value, ex=expire_in_sec)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_redis() -> RedisDB:
+    return RedisDB(
+        aioredis.Redis(
+            host=settings.redis.host,
+            port=settings.redis.port,
+            password=settings.redis.password.get_secret_value(),
+            retry=Retry(ExponentialBackoff(), settings.redis.retry),
+            retry_on_error=[TimeoutError, ConnectionError, BusyLoadingError],
+        )
+    )
+
+
+redis_db = create_redis()
+
+
+async def get_redis() -> RedisDB:
+    return redis_db
@@ -1,43 +1,218 @@
-from asyncio import current_task
-from dataclasses import dataclass
+import functools
+import itertools
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal, TypeVar
 
+from fastapi import Request
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
-    async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from users.core.config import settings
+from users.database.pool import asyncpg_connect_args
+
+# момент (unix time), до которого клиент после записи читает primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_STATE = "read_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """Отдаёт клиенту, писавшему в primary, cookie READ_PRIMARY_COOKIE.
+
+    Метка живёт у самого клиента, поэтому её видят все воркеры и
+    инстансы сервиса, а клиенты за одним адресом не мешают друг другу.
+    Без реплик middleware ничего не делает.
+    """
+
+    def __init__(self, app: ASGIApp, helper: "DDHelper") -> None:
+        self.app = app
+        self.helper = helper
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.helper.replica_factories:
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            deadline = state.get(READ_PRIMARY_STATE)
+            if message["type"] == "http.response.start" and deadline is not None:
+                MutableHeaders(scope=message).append(
+                    "set-cookie", self.helper.read_primary_cookie(deadline)
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
 
 
 @dataclass
 class DDHelper:
+    """Engine primary и, опционально, реплик для чтения.
+
+    Чтение из `read_session_dependency` уходит на реплику (round-robin
+    или наименее занятый пул), кроме окна read_your_writes секунд
+    после записи того же клиента: тогда читается primary, чтобы клиент
+    видел собственные изменения несмотря на лаг репликации. Запись
+    отмечается в cookie ответа (ReadYourWritesMiddleware).
+    """
+
     url: str
-    echo: bool
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+    replica_urls: list[str] = field(default_factory=list)
+    replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    read_your_writes: float = 5.0
 
     def __post_init__(self):
-        self.engine = create_async_engine(url=self.url, echo=self.echo)
-        self.factory_session = async_sessionmaker(
-            self.engine,
+        self.engine = self._create_engine(self.url)
+        self.factory_session = self._create_factory(self.engine)
+        self.replica_engines = [self._create_engine(url) for url in self.replica_urls]
+        self.replica_factories = [
+            self._create_factory(engine) for engine in self.replica_engines
+        ]
+        self._round_robin = itertools.count()
+
+    def _create_engine(self, url: str):
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            connect_args = asyncpg_connect_args(
+                self.statement_cache_size, self.pgbouncer
+            )
+        return create_async_engine(
+            url=url,
+            echo=self.echo,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args=connect_args,
+        )
+
+    @staticmethod
+    def _create_factory(engine) -> async_sessionmaker:
+        return async_sessionmaker(
+            engine,
             expire_on_commit=False,
             class_=AsyncSession,
             autoflush=False,
         )
 
-    async def scoped_session_dependency(self):
-        scoped_factory = async_scoped_session(
-            self.factory_session,
-            scopefunc=current_task,
+    def mark_write(self, request: Request) -> None:
+        """Запись клиента: чтения до конца окна идут в primary"""
+        setattr(request.state, READ_PRIMARY_STATE, time.time() + self.read_your_writes)
+
+    def reads_primary(self, request: Request) -> bool:
+        deadline = getattr(request.state, READ_PRIMARY_STATE, None)
+        if deadline is None:
+            try:
+                deadline = float(request.cookies.get(READ_PRIMARY_COOKIE, ""))
+            except ValueError:
+                return False
+        now = time.time()
+        # срок дальше окна не выдавался: подделанный cookie не учитывается
+        return now < deadline <= now + self.read_your_writes
+
+    def read_primary_cookie(self, deadline: float) -> str:
+        return (
+            f"{READ_PRIMARY_COOKIE}={deadline:.3f}; "
+            f"Max-Age={math.ceil(self.read_your_writes)}; "
+            "Path=/; HttpOnly; SameSite=lax"
         )
+
+    def _track_writes(self, request: Request):
+        def track(orm_execute_state: ORMExecuteState) -> None:
+            if (
+                orm_execute_state.is_insert
+                or orm_execute_state.is_update
+                or orm_execute_state.is_delete
+            ):
+                self.mark_write(request)
+
+        return track
+
+    def _read_factory(self, request: Request) -> async_sessionmaker:
+        if not self.replica_factories or self.reads_primary(request):
+            return self.factory_session
+        if self.replica_strategy == "least_connections":
+            index = min(
+                range(len(self.replica_engines)),
+                key=lambda i: self.replica_engines[i].pool.checkedout(),
+            )
+        else:
+            index = next(self._round_robin) % len(self.replica_factories)
+        return self.replica_factories[index]
+
+    async def scoped_session_dependency(self, request: Request):
+        """Сессия primary.
+
+        Соединение берётся из пула только при первом запросе сессии,
+        а сервисы с `releases_connection` возвращают его сразу после
+        вызова, не дожидаясь завершения ответа.
+        """
+        async with self.factory_session() as session:
+            if self.replica_factories:
+                event.listen(
+                    session.sync_session,
+                    "do_orm_execute",
+                    self._track_writes(request),
+                )
+            yield session
+
+    async def read_session_dependency(self, request: Request):
+        """Сессия для read-only вызовов сервиса"""
+        async with self._read_factory(request)() as session:
+            yield session
+
+
+Method = TypeVar("Method", bound=Callable[..., Awaitable[Any]])
+
+
+def releases_connection(method: Method) -> Method:
+    """Закрывает сессии сервиса (`self.sessions`) после вызова метода.
+
+    Закрытая AsyncSession остаётся пригодной: следующий запрос снова
+    возьмёт соединение из пула, поэтому методы можно вызывать подряд.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
         try:
-            async with scoped_factory() as session:
-                yield session
+            return await method(self, *args, **kwargs)
         finally:
-            await scoped_factory.remove()
+            for session in dict.fromkeys(self.sessions):
+                if session is not None:
+                    await session.close()
+
+    return wrapper
 
 
 dh_helper = DDHelper(
     url=settings.db.async_url,
     echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    statement_cache_size=settings.db.statement_cache_size,
+    pgbouncer=settings.db.pgbouncer,
+    replica_urls=settings.db.replica_urls,
+    replica_strategy=settings.db.replica_strategy,
+    read_your_writes=settings.db.read_your_writes,
 )
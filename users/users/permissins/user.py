@@ -2,26 +2,56 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 
+from users.core.config import settings
 from users.database.models.user import Role, User
+from users.schemas.user import PrincipalSchema
 from users.services.auth_token import (
     TokenManager,
     get_token_manager,
     verify_access_token,
 )
+from users.services.revocation import RevocationList, get_revocation_list
 from users.services.user import AuthService, get_auth_service
 
 
-async def get_current_user(
+async def get_current_principal(
     access_token: Annotated[str, Depends(verify_access_token)],
     token_manager: Annotated[TokenManager, Depends(get_token_manager)],
+    revocation: Annotated[RevocationList, Depends(get_revocation_list)],
+) -> PrincipalSchema:
+    """Пользователь из claims токена: без сессии БД, только проверка отзыва"""
+    token_data = await token_manager.get_data_from_access_token(access_token)
+    if await revocation.is_user_revoked(token_data.sub):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="token revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PrincipalSchema(
+        id=token_data.sub, email=token_data.email, role=token_data.role
+    )
+
+
+async def get_current_user(
+    principal: Annotated[PrincipalSchema, Depends(get_current_principal)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ) -> User:
-    token_data = await token_manager.get_data_from_access_token(access_token)
-    user = await auth_service.get_by_email(token_data.email)
+    user = await auth_service.get_active_user(principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="user not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
+# эндпоинтам, которым хватает id, email и role, полный User не нужен
+CurrentPrincipal = Annotated[
+    PrincipalSchema | User,
+    Depends(get_current_principal if settings.token.claims_only else get_current_user),
+]
 
 
 async def get_current_active_user(current_user: CurrentUser) -> User:
@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
@@ -19,11 +20,14 @@ class TokenPayloadsBase(BaseModel):
 
 
 class AccessTokenPayload(TokenPayloadsBase):
-    pass
+    # тип токена: refresh с тем же ключом не пройдёт как access и наоборот
+    typ: Literal[TokenType.access]
 
 
 class RefreshTokenPayload(TokenPayloadsBase):
-    pass
+    typ: Literal[TokenType.refresh]
+    jti: str
+    family: str
 
 
 class TokenResponse(BaseModel):
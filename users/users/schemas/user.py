@@ -17,6 +17,14 @@ class ResponseUserSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True, revalidate_instances="always")
 
 
+class PrincipalSchema(BaseModel):
+    """Пользователь, восстановленный из claims access токена без запроса в БД"""
+
+    id: int
+    email: EmailStr
+    role: str
+
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: SecretStr
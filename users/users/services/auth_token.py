@@ -1,11 +1,18 @@
+import hashlib
+import time
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Annotated, Any
 
 import jwt
+from cryptography.hazmat.primitives import serialization
 from fastapi import Cookie, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import PyJWTError
+from pydantic import ValidationError
 
 from users.core.config import settings
 from users.schemas.token import (
@@ -18,6 +25,94 @@ from users.schemas.token import (
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+class KeyStore:
+    """Ключ, прочитанный и распарсенный один раз.
+
+    Не чаще раза в check_interval секунд сверяет stat файла
+    и перечитывает ключ после ротации.
+    """
+
+    def __init__(
+        self, path: Path, loader: Callable[[bytes], Any], check_interval: float
+    ) -> None:
+        self.path = path
+        self.loader = loader
+        self.check_interval = check_interval
+        self.version = 0
+        self._key: Any = None
+        self._signature: tuple[int, int, int] | None = None
+        self._checked_at = float("-inf")
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            stat = self.path.stat()
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature != self._signature:
+                self._key = self.loader(self.path.read_bytes())
+                self._signature = signature
+                self.version += 1
+        return self._key
+
+
+# exp, версия ключа подписи и payload проверенного токена
+VerifiedToken = tuple[float, int, dict[str, Any]]
+
+
+class VerifiedTokenCache:
+    """Недавно проверенные токены: sha256 токена -> payload до его exp"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[bytes, VerifiedToken] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str, key_version: int) -> dict[str, Any] | None:
+        key = self._key(token)
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, version, payload = item
+        if version != key_version or expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return payload
+
+    def set(self, token: str, key_version: int, payload: dict[str, Any]) -> None:
+        if self.maxsize <= 0 or "exp" not in payload:
+            return
+        self._data[self._key(token)] = (float(payload["exp"]), key_version, payload)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+private_keys = KeyStore(
+    settings.token.private_key_path,
+    lambda data: serialization.load_pem_private_key(data, password=None),
+    settings.token.key_check_interval,
+)
+public_keys = KeyStore(
+    settings.token.public_key_path,
+    serialization.load_pem_public_key,
+    settings.token.key_check_interval,
+)
+verified_tokens = VerifiedTokenCache(settings.token.verified_cache_size)
+
+
+def decode_token(token: str, algorithm: str) -> dict[str, Any]:
+    public_key = public_keys.get()
+    payload = verified_tokens.get(token, public_keys.version)
+    if payload is None:
+        payload = jwt.decode(jwt=token, key=public_key, algorithms=[algorithm])
+        verified_tokens.set(token, public_keys.version, payload)
+    return payload
+
+
 async def __verify_token(token: str, token_type: TokenType, algorithm: str) -> str:
     if token is None:
         raise HTTPException(
@@ -30,8 +125,7 @@ async def __verify_token(token: str, token_type: TokenType, algorithm: str) -> s
             payload_model = AccessTokenPayload
         else:
             payload_model = RefreshTokenPayload
-        public_key = settings.token.public_key_path.read_text()
-        payload = jwt.decode(jwt=token, key=public_key, algorithms=[algorithm])
+        payload = decode_token(token, algorithm)
         token_data = payload_model(**payload)
         if token_data.exp < datetime.now(timezone.utc):
             raise HTTPException(
@@ -39,7 +133,7 @@ async def __verify_token(token: str, token_type: TokenType, algorithm: str) -> s
                 detail="token expired",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-    except PyJWTError:
+    except (PyJWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
@@ -58,7 +152,10 @@ async def verify_access_token(
 
 
 async def verify_refresh_token(
-    refresh_token: Annotated[str, Cookie(None, include_in_schema=False)],
+    refresh_token: Annotated[
+        str | None,
+        Cookie(alias=settings.token.refresh_cookie_name, include_in_schema=False),
+    ] = None,
     refresh_type=TokenType.refresh.value,
     algorithm=settings.token.algorithm,
 ):
@@ -88,17 +185,21 @@ class TokenManager(TokenManagerBase):
     @staticmethod
     async def __generate_token(
         data: dict[str, Any],
-        private_key: str,
+        private_key: Any,
         algorithm: str,
         expire_delta: int,
         payload_model: TokenPayloadsBase,
+        token_type: TokenType,
     ) -> str:
         expires_delta = datetime.utcnow() + timedelta(minutes=expire_delta)
         token_payload = payload_model(
-            sub=data.get("sub"),
-            email=data.get("email"),
-            role=data.get("role"),
+            **{
+                name: data.get(name)
+                for name in payload_model.model_fields
+                if name not in ("exp", "typ")
+            },
             exp=expires_delta,
+            typ=token_type,
         )
         encode_jwt = jwt.encode(
             payload=token_payload.model_dump(), key=private_key, algorithm=algorithm
@@ -108,29 +209,31 @@ class TokenManager(TokenManagerBase):
     async def generate_access_token(self, data: dict[str, Any]) -> str:
         return await TokenManager.__generate_token(
             data,
-            private_key=settings.token.private_key_path.read_text(),
+            private_key=private_keys.get(),
             algorithm=settings.token.algorithm,
             expire_delta=settings.token.access_expire,
             payload_model=AccessTokenPayload,
+            token_type=TokenType.access,
         )
 
     async def generate_refresh_token(self, data: dict[str, Any]) -> str:
         return await TokenManager.__generate_token(
             data,
-            private_key=settings.token.private_key_path.read_text(),
+            private_key=private_keys.get(),
             algorithm=settings.token.algorithm,
             expire_delta=settings.token.refresh_expire,
             payload_model=RefreshTokenPayload,
+            token_type=TokenType.refresh,
         )
 
     @staticmethod
     async def __get_data_from_token(
-        token: str, public_key: str, algorithm: str, payload_model: TokenPayloadsBase
+        token: str, algorithm: str, payload_model: TokenPayloadsBase
     ) -> TokenPayloadsBase:
         try:
-            payload = jwt.decode(jwt=token, key=public_key, algorithms=[algorithm])
+            payload = decode_token(token, algorithm)
             return payload_model(**payload)
-        except PyJWTError:
+        except (PyJWTError, ValidationError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
             )
@@ -138,7 +241,6 @@ class TokenManager(TokenManagerBase):
     async def get_data_from_access_token(self, access_token: str) -> AccessTokenPayload:
         return await TokenManager.__get_data_from_token(
             access_token,
-            public_key=settings.token.public_key_path.read_text(),
             algorithm=settings.token.algorithm,
             payload_model=AccessTokenPayload,
         )
@@ -148,7 +250,6 @@ class TokenManager(TokenManagerBase):
     ) -> RefreshTokenPayload:
         return await TokenManager.__get_data_from_token(
             refresh_token,
-            public_key=settings.token.public_key_path.read_text(),
             algorithm=settings.token.algorithm,
             payload_model=RefreshTokenPayload,
         )
@@ -0,0 +1,113 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from users.core.config import settings
+
+
+def hash_password(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def check_password(password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed_password)
+
+
+@dataclass
+class HasherStats:
+    in_flight: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    completed: int = 0
+    rejected: int = 0
+
+
+class PasswordHasherPool:
+    """Выполняет bcrypt в пуле потоков или процессов, не блокируя event loop.
+
+    Одновременно в пуле не больше max_concurrency задач, остальные ждут
+    в очереди; при очереди длиннее max_queue запрос отклоняется с 503.
+    """
+
+    def __init__(
+        self,
+        executor: str,
+        max_workers: int,
+        max_concurrency: int,
+        max_queue: int,
+    ) -> None:
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.stats = HasherStats()
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.stats.waiting >= self.max_queue:
+            self.stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис перегружен, повторите попытку позже",
+            )
+        self.stats.waiting += 1
+        self.stats.max_waiting = max(self.stats.max_waiting, self.stats.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.stats.waiting -= 1
+        self.stats.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.completed += 1
+            self._semaphore.release()
+
+    async def hash_password(self, password: str) -> bytes:
+        return await self.run(hash_password, password.encode())
+
+    async def verify_password(self, password: str, hashed_password: bytes) -> bool:
+        return await self.run(check_password, password.encode(), hashed_password)
+
+    def metrics(self) -> dict[str, int | str]:
+        """Загрузка пула: задачи в работе и в очереди, отказы по 503"""
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            **asdict(self.stats),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    executor=settings.password_hash.executor,
+    max_workers=settings.password_hash.max_workers,
+    max_concurrency=settings.password_hash.max_concurrency,
+    max_queue=settings.password_hash.max_queue,
+)
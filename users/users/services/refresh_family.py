@@ -0,0 +1,42 @@
+from users.core.config import settings
+from users.database.redis_cache import RedisDB, redis_db
+
+REFRESH_FAMILY_KEY = "auth:refresh:family:{family}"
+
+
+class RefreshTokenFamilies:
+    """Цепочки ротации refresh токенов в Redis.
+
+    Семья заводится при логине и хранит jti единственного действующего
+    refresh токена. Ротация атомарно меняет его на новый; предъявление
+    уже заменённого токена означает утечку, и вся семья отзывается.
+    """
+
+    def __init__(self, redis: RedisDB, ttl: int) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    async def start(self, family: str, jti: str) -> None:
+        await self.redis.set_key(
+            REFRESH_FAMILY_KEY.format(family=family), jti, self.ttl
+        )
+
+    async def rotate(self, family: str, jti: str, new_jti: str) -> bool:
+        key = REFRESH_FAMILY_KEY.format(family=family)
+        if await self.redis.compare_and_set(key, jti, new_jti, self.ttl):
+            return True
+        # повторное использование или гонка двух refresh: семья больше не действует
+        await self.redis.delete_key(key)
+        return False
+
+    async def revoke(self, family: str) -> None:
+        await self.redis.delete_key(REFRESH_FAMILY_KEY.format(family=family))
+
+
+refresh_families = RefreshTokenFamilies(
+    redis_db, ttl=settings.token.refresh_expire * 60
+)
+
+
+async def get_refresh_families() -> RefreshTokenFamilies:
+    return refresh_families
@@ -0,0 +1,68 @@
+import logging
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from users.core.config import settings
+from users.database.redis_cache import RedisDB, redis_db
+
+REVOKED_USER_KEY = "auth:revoked:user:{user_id}"
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """Отозванные пользователи в Redis.
+
+    Запись живёт, пока может быть действителен любой выданный
+    до отзыва токен, поэтому проверки по claims без похода в БД
+    перестают пускать деактивированного пользователя сразу.
+    """
+
+    def __init__(self, redis: RedisDB, ttl: int) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    async def revoke_user(self, user_id: int) -> None:
+        try:
+            await self.redis.set_key(
+                REVOKED_USER_KEY.format(user_id=user_id), 1, self.ttl
+            )
+        except RedisError:
+            # без записи в списке отзыва выданные токены остались бы действительны
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="список отзыва недоступен, пользователь не деактивирован",
+            )
+
+    async def restore_user(self, user_id: int) -> None:
+        """Снимает отзыв, если деактивация в БД не состоялась.
+
+        Вызывается при обработке ошибки БД, поэтому сбой Redis только
+        пишется в лог: наружу должна уйти исходная ошибка. Запись
+        отзыва тогда истечёт сама через ttl.
+        """
+        try:
+            await self.redis.delete_key(REVOKED_USER_KEY.format(user_id=user_id))
+        except RedisError:
+            logger.exception("Не удалось снять отзыв пользователя %s", user_id)
+
+    async def is_user_revoked(self, user_id: int) -> bool:
+        try:
+            return await self.redis.is_exists(REVOKED_USER_KEY.format(user_id=user_id))
+        except RedisError:
+            # без списка отзыва нельзя доверять claims токена
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="список отзыва недоступен",
+            )
+
+
+revocation_list = RevocationList(
+    redis_db,
+    ttl=max(settings.token.access_expire, settings.token.refresh_expire) * 60,
+)
+
+
+async def get_revocation_list() -> RevocationList:
+    return revocation_list
@@ -1,26 +1,30 @@
+import uuid
 from abc import ABCMeta, abstractmethod
 
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from pydantic import EmailStr, SecretStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from users.crud.user import UserDAL
 from users.database.models.user import User
-from users.database.session import dh_helper
+from users.database.session import dh_helper, releases_connection
 from users.schemas.user import CreateUserSchema, ResponseUserSchema, UpdateUserSchema
 from users.services.auth_token import TokenManager, get_token_manager
+from users.services.hashing import password_hasher
+from users.services.refresh_family import refresh_families
+from users.services.revocation import revocation_list
+from users.services.user_cache import user_cache
 
 
 class HashManagerBase(metaclass=ABCMeta):
     """Хэширование и проверка пороля"""
 
     @abstractmethod
-    def hash_password(self, password: str) -> bytes:
+    async def hash_password(self, password: str) -> bytes:
         """Хеширование пароля"""
 
     @abstractmethod
-    def verify_password(self, new_password: str, hash_password: bytes) -> bool:
+    async def verify_password(self, new_password: str, hash_password: bytes) -> bool:
         """Проверка пароля"""
 
 
@@ -47,18 +51,24 @@ class AuthServiceBase(metaclass=ABCMeta):
 
 
 class AuthService(AuthServiceBase, HashManagerBase):
-    def __init__(self, session: AsyncSession, token_manager: TokenManager) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        token_manager: TokenManager,
+        read_session: AsyncSession | None = None,
+    ) -> None:
         self.session = session
+        self.read_session = read_session or session
+        self.sessions = (self.session, self.read_session)
         self.token_manager = token_manager
 
-    def hash_password(self, password: str) -> bytes:
-        salt: bytes = bcrypt.gensalt()
-        pwd_hash_bytes: bytes = bcrypt.hashpw(password.encode(), salt)
-        return pwd_hash_bytes
+    async def hash_password(self, password: str) -> bytes:
+        return await password_hasher.hash_password(password)
 
-    def verify_password(self, new_password: str, hash_password: bytes) -> bool:
-        return bcrypt.checkpw(new_password.encode(), hash_password)
+    async def verify_password(self, new_password: str, hash_password: bytes) -> bool:
+        return await password_hasher.verify_password(new_password, hash_password)
 
+    @releases_connection
     async def register(self, user_create_body: CreateUserSchema) -> ResponseUserSchema:
         user_crud = UserDAL(self.session)
         email_is_exists = await user_crud.get_by_email(user_create_body.email)
@@ -69,44 +79,60 @@ class AuthService(AuthServiceBase, HashManagerBase):
             )
         new_user = await user_crud.create(
             email=user_create_body.email,
-            hash_password=self.hash_password(
+            hash_password=await self.hash_password(
                 user_create_body.password.get_secret_value()
             ),
         )
         return ResponseUserSchema.model_validate(new_user)
 
+    @releases_connection
     async def update_user(
         self, user_id: int, user_update_body: UpdateUserSchema
     ) -> ResponseUserSchema:
         user_crud = UserDAL(self.session)
         updated_user = await user_crud.update(user_id, user_update_body)
+        user_cache.invalidate(user_id)
         return ResponseUserSchema.model_validate(updated_user)
 
+    @releases_connection
     async def deactivate_user(self, user_id: int) -> int:
+        # сначала отзыв: пока он не записан, пользователь остаётся активным,
+        # а не деактивированным с действующими токенами
+        await revocation_list.revoke_user(user_id)
         user_crud = UserDAL(self.session)
-        deactivated_user = await user_crud.delete(user_id)
+        try:
+            deactivated_user = await user_crud.delete(user_id)
+        except HTTPException:
+            await revocation_list.restore_user(user_id)
+            raise
+        user_cache.invalidate(user_id)
         return deactivated_user
 
+    @releases_connection
     async def get_user(self, user_id: int) -> ResponseUserSchema:
-        user_crud = UserDAL(self.session)
+        user_crud = UserDAL(self.read_session)
         user = await user_crud.get(user_id)
         return ResponseUserSchema.model_validate(user)
 
+    @releases_connection
     async def get_user_list(self, offset: int, limit: int) -> list[ResponseUserSchema]:
-        user_crud = UserDAL(self.session)
+        user_crud = UserDAL(self.read_session)
         user_list = await user_crud.get_list(offset, limit)
         return [ResponseUserSchema.model_validate(user) for user in user_list]
 
-    async def _generate_tokens(self, user: User) -> tuple[str, str]:
-        token_payload = {"sub": user.id, "email": user.email, "role": user.role}
+    async def _generate_tokens(
+        self, token_payload: dict, family: str, jti: str
+    ) -> tuple[str, str]:
         access_token = await self.token_manager.generate_access_token(token_payload)
-        refresh_token = await self.token_manager.generate_refresh_token(token_payload)
+        refresh_token = await self.token_manager.generate_refresh_token(
+            {**token_payload, "family": family, "jti": jti}
+        )
         return access_token, refresh_token
 
+    @releases_connection
     async def login(self, email: EmailStr, password: SecretStr) -> tuple[str, str]:
-        user_crud = UserDAL(self.session)
-        user = await user_crud.get_by_email(email)
-        if not user or not self.verify_password(
+        user = await self.get_by_email(email)
+        if not user or not await self.verify_password(
             new_password=password.get_secret_value(), hash_password=user.password
         ):
             raise HTTPException(
@@ -117,13 +143,51 @@ class AuthService(AuthServiceBase, HashManagerBase):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="user not active"
             )
-        return await self._generate_tokens(user)
+        family, jti = uuid.uuid4().hex, uuid.uuid4().hex
+        await refresh_families.start(family, jti)
+        token_payload = {"sub": user.id, "email": user.email, "role": user.role}
+        return await self._generate_tokens(token_payload, family, jti)
+
+    async def refresh(self, refresh_token: str) -> tuple[str, str]:
+        """Ротация refresh токена по claims: без bcrypt и без запроса в БД"""
+        token_data = await self.token_manager.get_data_from_refresh_token(refresh_token)
+        if await revocation_list.is_user_revoked(token_data.sub):
+            await refresh_families.revoke(token_data.family)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="token revoked"
+            )
+        new_jti = uuid.uuid4().hex
+        if not await refresh_families.rotate(
+            token_data.family, token_data.jti, new_jti
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="refresh token reused or expired",
+            )
+        token_payload = {
+            "sub": token_data.sub,
+            "email": token_data.email,
+            "role": token_data.role,
+        }
+        return await self._generate_tokens(token_payload, token_data.family, new_jti)
+
+    @releases_connection
+    async def get_active_user(self, user_id: int) -> User | None:
+        """Активный пользователь по id, сначала из короткоживущего кеша"""
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await UserDAL(self.session).get_by_id(user_id)
+            if user is not None:
+                user_cache.set(user)
+        return user
 
+    @releases_connection
     async def get_by_email(self, email: EmailStr) -> User:
         user_dal = UserDAL(self.session)
         user = await user_dal.get_by_email(email)
         return user
 
+    @releases_connection
     async def get_by_email_full_info(self, email: EmailStr) -> ResponseUserSchema:
         user_dal = UserDAL(self.session)
         user = await user_dal.get_by_email_full_info(email)
@@ -132,6 +196,7 @@ class AuthService(AuthServiceBase, HashManagerBase):
 
 async def get_auth_service(
     session: AsyncSession = Depends(dh_helper.scoped_session_dependency),
+    read_session: AsyncSession = Depends(dh_helper.read_session_dependency),
     token_manager: TokenManager = Depends(get_token_manager),
 ) -> AuthService:
-    return AuthService(session, token_manager)
+    return AuthService(session, token_manager, read_session)
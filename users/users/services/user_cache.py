@@ -0,0 +1,39 @@
+import time
+from collections import OrderedDict
+
+from users.core.config import settings
+from users.database.models.user import User
+
+
+class UserCache:
+    """Короткоживущий LRU пользователей по id в памяти воркера"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[int, tuple[float, User]] = OrderedDict()
+
+    def get(self, user_id: int) -> User | None:
+        item = self._data.get(user_id)
+        if item is None:
+            return None
+        expires_at, user = item
+        if expires_at < time.monotonic():
+            del self._data[user_id]
+            return None
+        self._data.move_to_end(user_id)
+        return user
+
+    def set(self, user: User) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[user.id] = (time.monotonic() + self.ttl, user)
+        self._data.move_to_end(user.id)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._data.pop(user_id, None)
+
+
+user_cache = UserCache(settings.token.user_cache_size, settings.token.user_cache_ttl)
@@ -0,0 +1,163 @@
+"""Дисковый кеш блоков перед удалённым хранилищем: воспроизведение
+трассы Range-запросов с Zipf-распределением популярности видео.
+
+Каждый просмотр выбирает видео по закону Zipf и случайную позицию,
+с которой плеер читает несколько диапазонов подряд; просмотры идут
+параллельно. Печатаются доля попаданий, сколько байт не пришлось
+забирать из origin и задержки по сравнению с чтением напрямую из origin.
+
+Без --endpoint origin — локальный каталог с искусственной задержкой
+каждого ranged GET (--origin-latency-ms). Для S3 нужен MinIO или другой
+совместимый сервер. Запуск из каталога video:
+    python benchmarks/bench_block_cache.py --videos 40 --size-mb 8 --cache-mb 64
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_trace(args: argparse.Namespace, size: int) -> list[list[tuple[str, int, int]]]:
+    """Просмотры: списки последовательных диапазонов одного видео"""
+    rng = random.Random(42)
+    weights = [1 / rank**args.zipf for rank in range(1, args.videos + 1)]
+    range_size = args.range_kb * 1024
+    watched = range_size * args.session_ranges
+    sessions = []
+    for video in rng.choices(range(args.videos), weights, k=args.sessions):
+        position = rng.randrange(0, size - watched)
+        sessions.append(
+            [
+                (
+                    f"video/{video}.mp4",
+                    position + number * range_size,
+                    position + (number + 1) * range_size - 1,
+                )
+                for number in range(args.session_ranges)
+            ]
+        )
+    return sessions
+
+
+async def replay(storage, trace, concurrency: int) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def session(requests: list[tuple[str, int, int]]) -> None:
+        async with semaphore:
+            for key, start, end in requests:
+                started = time.perf_counter()
+                received = 0
+                async for chunk in storage.open_range(key, start, end):
+                    received += len(chunk)
+                latencies.append(time.perf_counter() - started)
+                assert received == end - start + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(requests) for requests in trace))
+    return time.perf_counter() - started, latencies
+
+
+def report(name: str, elapsed: float, latencies: list[float], requests: int) -> None:
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:>7}: {requests / elapsed:8.1f} req/s, "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms "
+        f"p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", type=int, default=40)
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--session-ranges", type=int, default=4)
+    parser.add_argument("--range-kb", type=int, default=1024)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cache-mb", type=int, default=64)
+    parser.add_argument("--block-kb", type=int, default=1024)
+    parser.add_argument("--origin-latency-ms", type=float, default=20)
+    parser.add_argument("--endpoint")
+    parser.add_argument("--bucket", default="bench-block-cache")
+    parser.add_argument("--access-key", default="")
+    parser.add_argument("--secret-key", default="")
+    args = parser.parse_args()
+
+    from video.services.block_cache import BlockCache, CachedStorage
+    from video.services.storage import LocalStorage, S3Storage
+
+    class SlowOrigin(LocalStorage):
+        async def open_range(self, key, start, end):
+            await asyncio.sleep(args.origin_latency_ms / 1000)
+            async for chunk in super().open_range(key, start, end):
+                yield chunk
+
+    workdir = Path(tempfile.mkdtemp())
+    size = args.size_mb * 1024 * 1024
+    source = workdir / "source.mp4"
+    if args.endpoint is None:
+        origin = SlowOrigin(workdir / "origin")
+    else:
+        origin = S3Storage(
+            bucket=args.bucket,
+            endpoint_url=args.endpoint,
+            region="us-east-1",
+            access_key=args.access_key,
+            secret_key=args.secret_key,
+            part_size=16 * 1024 * 1024,
+            max_connections=args.concurrency,
+        )
+        client = await origin.client()
+        try:
+            await client.create_bucket(Bucket=args.bucket)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+    keys = [f"video/{video}.mp4" for video in range(args.videos)]
+    for key in keys:
+        source.write_bytes(os.urandom(size))
+        await origin.put_file(key, source)
+
+    trace = make_trace(args, size)
+    requests = len(trace) * args.session_ranges
+    served = requests * args.range_kb * 1024
+
+    elapsed, latencies = await replay(origin, trace, args.concurrency)
+    report("origin", elapsed, latencies, requests)
+
+    cache = BlockCache(
+        origin,
+        root=workdir / "cache",
+        block_size=args.block_kb * 1024,
+        max_bytes=args.cache_mb * 1024 * 1024,
+    )
+    elapsed, latencies = await replay(
+        CachedStorage(origin, cache), trace, args.concurrency
+    )
+    report("cached", elapsed, latencies, requests)
+    stats = cache.stats
+    print(
+        f"hit ratio {stats.hit_ratio:.1%} (hits {stats.hits}, misses {stats.misses}, "
+        f"coalesced {stats.coalesced}, evictions {stats.evictions}), "
+        f"origin {stats.origin_bytes / 2**20:.0f} of {served / 2**20:.0f} MiB, "
+        f"saved {stats.origin_saved:.1%}, cache {cache.size / 2**20:.0f} MiB"
+    )
+
+    if args.endpoint is not None:
+        for key in keys:
+            await origin.delete(key)
+        await origin.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
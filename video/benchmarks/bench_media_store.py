@@ -0,0 +1,139 @@
+"""Контентно-адресуемое хранилище загрузок: прежняя запись в файл
+по названию против MediaStore с дедупликацией, на локальном диске или
+в S3-совместимом хранилище. После загрузки все ссылки снимаются,
+и проверяется, что сборщик мусора удалил все объекты.
+
+БД — SQLite-файл. Для S3 нужен MinIO или другой совместимый сервер:
+    python benchmarks/bench_media_store.py --backend s3 \\
+        --endpoint http://localhost:9000 --access-key minio --secret-key minio123
+Запуск из каталога video:
+    python benchmarks/bench_media_store.py --files 200 --size-kb 2048 --duplicates 0.5
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_uploads(files: int, size: int, duplicates: float) -> list[bytes]:
+    rng = random.Random(42)
+    unique: list[bytes] = []
+    uploads = []
+    for _ in range(files):
+        if unique and rng.random() < duplicates:
+            uploads.append(rng.choice(unique))
+        else:
+            unique.append(os.urandom(size))
+            uploads.append(unique[-1])
+    return uploads
+
+
+async def stored_objects(backend) -> tuple[int, int]:
+    from video.services.storage import LocalStorage
+
+    if isinstance(backend, LocalStorage):
+        sizes = [
+            path.stat().st_size for path in backend.root.rglob("*") if path.is_file()
+        ]
+        return len(sizes), sum(sizes)
+    client = await backend.client()
+    paginator = client.get_paginator("list_objects_v2")
+    sizes = []
+    async for page in paginator.paginate(Bucket=backend.bucket):
+        sizes.extend(item["Size"] for item in page.get("Contents", ()))
+    return len(sizes), sum(sizes)
+
+
+async def by_title(workdir: Path, uploads: list[bytes]) -> float:
+    from fastapi import UploadFile
+
+    from video.services.media import save_upload
+
+    started = time.perf_counter()
+    for number, data in enumerate(uploads):
+        upload = UploadFile(io.BytesIO(data), filename="video.mp4")
+        await save_upload(upload, workdir / "by_title" / f"title {number}.mp4")
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--duplicates", type=float, default=0.5)
+    parser.add_argument("--backend", choices=("local", "s3"), default="local")
+    parser.add_argument("--endpoint")
+    parser.add_argument("--bucket", default="media-bench")
+    parser.add_argument("--access-key", default="")
+    parser.add_argument("--secret-key", default="")
+    args = parser.parse_args()
+
+    from fastapi import UploadFile
+
+    from video.database.models.base import Base
+    from video.database.session import DDHelper
+    from video.services.media_store import MediaStore
+    from video.services.storage import LocalStorage, S3Storage
+
+    workdir = Path(tempfile.mkdtemp())
+    if args.backend == "s3":
+        backend = S3Storage(
+            args.bucket,
+            args.endpoint,
+            "us-east-1",
+            args.access_key,
+            args.secret_key,
+            part_size=8 * 1024 * 1024,
+        )
+        client = await backend.client()
+        try:
+            await client.create_bucket(Bucket=args.bucket)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+    else:
+        backend = LocalStorage(workdir / "objects")
+    helper = DDHelper(url=f"sqlite+aiosqlite:///{workdir / 'bench.db'}")
+    async with helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    uploads = make_uploads(args.files, args.size_kb * 1024, args.duplicates)
+    logical = sum(map(len, uploads))
+    elapsed = await by_title(workdir, uploads)
+    print(
+        f"{'by title':>9}: {logical / elapsed / 2**20:7.1f} MiB/s, stored {logical / 2**20:8.1f} MiB"
+    )
+
+    store = MediaStore(backend, workdir / "staging")
+    keys = []
+    started = time.perf_counter()
+    async with helper.factory_session() as session:
+        for data in uploads:
+            upload = UploadFile(io.BytesIO(data), filename="video.mp4")
+            keys.append(await store.save_upload(session, upload, ".mp4"))
+    elapsed = time.perf_counter() - started
+    objects, stored = await stored_objects(backend)
+    print(
+        f"{'content':>9}: {logical / elapsed / 2**20:7.1f} MiB/s, stored {stored / 2**20:8.1f} MiB "
+        f"in {objects} objects ({args.backend}, {len(set(keys))} unique keys)"
+    )
+
+    async with helper.factory_session() as session:
+        await store.release(session, keys)
+        await asyncio.sleep(0.01)
+        collected = await store.collect_garbage(session, grace=0)
+    objects, _ = await stored_objects(backend)
+    print(f"gc: collected {collected}, objects left {objects}")
+    await backend.close()
+    await helper.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
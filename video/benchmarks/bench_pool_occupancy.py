@@ -0,0 +1,138 @@
+"""Занятость пула соединений под потоковой нагрузкой на /video/{id}:
+сессия держится до завершения ответа против возврата соединения
+сразу после вызова сервиса (releases_connection).
+
+БД — SQLite-файл вместо Postgres, кеш отключён, чтобы каждый запрос
+ходил в базу. Клиенты читают ответ медленно. Запуск из каталога video:
+    python benchmarks/bench_pool_occupancy.py --clients 50 --pool-size 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class NoCache:
+    async def get_video(self, video_id, loader):
+        return await loader()
+
+
+async def sample_pool(pool, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(pool.checkedout())
+        await asyncio.sleep(0.001)
+
+
+async def run(app, helper, args, port: int) -> None:
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level="warning", lifespan="off")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    samples: list[int] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_pool(helper.engine.pool, samples, stop))
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+
+        async def slow_client() -> None:
+            for _ in range(args.requests):
+                url = f"http://127.0.0.1:{port}/video/1"
+                async with client.stream("GET", url) as response:
+                    async for _chunk in response.aiter_raw(64 * 1024):
+                        await asyncio.sleep(args.read_delay)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(slow_client() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    server.should_exit = True
+    await serving
+
+    metrics = helper.pool_metrics()
+    print(
+        f"{args.mode:>8}: {elapsed:6.2f} s, in use avg "
+        f"{statistics.fmean(samples):5.2f} max {max(samples):3d}, "
+        f"checkout wait avg {metrics['wait_avg'] * 1000:6.2f} ms "
+        f"max {metrics['wait_max'] * 1000:6.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=("hold", "release"), default="release")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--read-delay", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from video.api.video import video_router
+    from video.database.models.base import Base
+    from video.database.models.video import Video
+    from video.database.session import DDHelper
+    from video.services.storage import LocalStorage, get_storage
+    from video.services.video import VideoService, get_service_video
+
+    workdir = Path(tempfile.mkdtemp())
+    media_storage = LocalStorage(workdir / "objects")
+    media = media_storage.local_path("video.mp4")
+    media.parent.mkdir()
+    media.write_bytes(os.urandom(args.size_kb * 1024))
+    helper = DDHelper(
+        url=f"sqlite+aiosqlite:///{workdir / 'video.db'}",
+        pool_size=args.pool_size,
+        max_overflow=0,
+    )
+    async with helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            insert(Video).values(
+                title="bench", description="", file="video.mp4", image=""
+            )
+        )
+
+    class HoldingVideoService(VideoService):
+        """Прежнее поведение: соединение живёт до закрытия сессии в зависимости"""
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.sessions = ()
+
+    service_class = HoldingVideoService if args.mode == "hold" else VideoService
+
+    async def service(
+        session: AsyncSession = Depends(helper.scoped_session_dependency),
+    ) -> VideoService:
+        return service_class(session, NoCache())
+
+    app = FastAPI()
+    app.include_router(video_router)
+    app.dependency_overrides[get_service_video] = service
+    app.dependency_overrides[get_storage] = lambda: media_storage
+    await run(app, helper, args, args.port)
+    await helper.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
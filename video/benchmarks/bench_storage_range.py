@@ -0,0 +1,139 @@
+"""Range-запросы к /video/{id} из локального хранилища и из
+S3-совместимого (ranged GET через общий пул клиента): пропускная
+способность и время до первого байта.
+
+Для S3 нужен MinIO или другой совместимый сервер. Запуск из каталога video:
+    python benchmarks/bench_storage_range.py --endpoint http://localhost:9000 \\
+        --access-key minio --secret-key minio123
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+KEY = "ab/cd/video.mp4"
+
+
+async def run_load(
+    port: int, data: bytes, args: argparse.Namespace
+) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    range_size = args.range_kb * 1024
+    first_bytes: list[float] = []
+
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+
+        async def one() -> None:
+            start = random.randrange(0, len(data) - range_size)
+            headers = {"Range": f"bytes={start}-{start + range_size - 1}"}
+            async with semaphore:
+                sent = time.perf_counter()
+                url = f"http://127.0.0.1:{port}/video/1"
+                async with client.stream("GET", url, headers=headers) as response:
+                    body = bytearray()
+                    async for chunk in response.aiter_raw():
+                        if not body:
+                            first_bytes.append(time.perf_counter() - sent)
+                        body += chunk
+            assert body == data[start : start + range_size]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        return time.perf_counter() - started, first_bytes
+
+
+async def bench(name: str, storage, data: bytes, args, port: int) -> None:
+    import uvicorn
+    from fastapi import FastAPI
+
+    from video.api.video import video_router
+    from video.services.storage import get_storage
+    from video.services.video import get_service_video
+
+    class Service:
+        async def get_video(self, video_id):
+            return type("Video", (), {"file": KEY})
+
+    app = FastAPI()
+    app.include_router(video_router)
+    app.dependency_overrides[get_service_video] = Service
+    app.dependency_overrides[get_storage] = lambda: storage
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level="warning", lifespan="off")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    elapsed, first_bytes = await run_load(port, data, args)
+    server.should_exit = True
+    await serving
+
+    first_bytes.sort()
+    p99 = first_bytes[int(len(first_bytes) * 0.99) - 1]
+    print(
+        f"{name:>6}: {args.requests / elapsed:8.1f} req/s, "
+        f"{args.requests * args.range_kb / 1024 / elapsed:7.1f} MiB/s, "
+        f"first byte p50 {statistics.median(first_bytes) * 1000:6.1f} ms "
+        f"p99 {p99 * 1000:6.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--range-kb", type=int, default=1024)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--endpoint")
+    parser.add_argument("--bucket", default="bench-range")
+    parser.add_argument("--access-key", default="")
+    parser.add_argument("--secret-key", default="")
+    parser.add_argument("--port", type=int, default=8795)
+    args = parser.parse_args()
+
+    from video.services.storage import LocalStorage, S3Storage
+
+    data = os.urandom(args.size_mb * 1024 * 1024)
+    workdir = Path(tempfile.mkdtemp())
+    source = workdir / "video.mp4"
+    source.write_bytes(data)
+
+    local = LocalStorage(workdir / "objects")
+    await local.put_file(KEY, source)
+    await bench("local", local, data, args, args.port)
+
+    if args.endpoint is None:
+        return
+    s3 = S3Storage(
+        bucket=args.bucket,
+        endpoint_url=args.endpoint,
+        region="us-east-1",
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        part_size=16 * 1024 * 1024,
+        max_connections=args.concurrency,
+    )
+    client = await s3.client()
+    try:
+        await client.create_bucket(Bucket=args.bucket)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    await s3.put_file(KEY, source)
+    await bench("s3", s3, data, args, args.port + 1)
+    await s3.delete(KEY)
+    await s3.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Обложки: размер оригинала против уменьшенных копий и скорость
+render_variants последовательно и в пуле процессов.
+
+Исходные картинки — синтетические JPEG с шумом (плохо сжимаются,
+как фотографии). Запуск из каталога video:
+    python benchmarks/bench_thumbnails.py --images 16 --size 3000x2000
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video.services.thumbnails import render_variants  # noqa: E402
+
+
+def make_image(path: Path, width: int, height: int) -> None:
+    """Плавные цветовые пятна с мелким зерном — ближе к фото, чем шум"""
+    from PIL import Image, ImageChops
+
+    blobs = Image.frombytes("RGB", (16, 12), os.urandom(16 * 12 * 3))
+    image = blobs.resize((width, height), Image.BICUBIC)
+    grain = Image.effect_noise((width, height), 8).convert("RGB")
+    image = ImageChops.add(image, grain, scale=1.0, offset=-128)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=92)
+    path.write_bytes(buffer.getvalue())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--size", default="3000x2000")
+    parser.add_argument("--widths", default="160,320,640,1280")
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    width, height = map(int, args.size.split("x"))
+    widths = [int(width) for width in args.widths.split(",")]
+
+    workdir = Path(tempfile.mkdtemp())
+    sources = [workdir / f"source_{number}.jpg" for number in range(args.images)]
+    for source in sources:
+        make_image(source, width, height)
+    render = partial(render_variants, widths=widths, quality=args.quality)
+
+    started = time.perf_counter()
+    variants = [render(source, workdir / "serial") for source in sources]
+    serial = time.perf_counter() - started
+    with ProcessPoolExecutor(args.workers) as pool:
+        started = time.perf_counter()
+        list(pool.map(render, sources, [workdir / "pool"] * len(sources)))
+        pooled = time.perf_counter() - started
+
+    original = sum(source.stat().st_size for source in sources) / len(sources)
+    print(f"original jpeg {width}x{height}: {original / 1024:8.1f} KiB")
+    for variant in variants[0]:
+        print(
+            f"{variant['format']:>5} {variant['width']:>5}w: "
+            f"{variant['size'] / 1024:8.1f} KiB"
+        )
+    print(
+        f"serial: {args.images / serial:6.2f} images/s, "
+        f"pool of {args.workers}: {args.images / pooled:6.2f} images/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Пиковая память при загрузке видео: старый путь (read + base64 для Celery)
+против потоковой записи save_upload. Каждый замер идёт в отдельном процессе.
+
+Запуск из каталога video:
+    python benchmarks/bench_upload.py --sizes-mb 16 64 256 1024
+"""
+
+import argparse
+import asyncio
+import base64
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def legacy(source: Path, destination: Path) -> None:
+    with open(source, "rb") as upload:
+        video_raw_bytes = upload.read()
+    video_base64: str = base64.b64encode(video_raw_bytes).decode()
+    with open(destination, "wb") as buffer:
+        buffer.write(base64.b64decode(video_base64))
+
+
+def streaming(source: Path, destination: Path) -> None:
+    from fastapi import UploadFile
+
+    from video.services.media import save_upload
+
+    async def run() -> None:
+        with open(source, "rb") as file:
+            await save_upload(UploadFile(file=file), destination)
+
+    asyncio.run(run())
+
+
+def measure(mode: str, source: Path, destination: Path) -> None:
+    import video.services.media  # noqa: F401  импорт не должен попасть в замер
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    {"legacy": legacy, "streaming": streaming}[mode](source, destination)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed:.3f} {(peak - baseline) / 1024:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--measure", nargs=3)
+    args = parser.parse_args()
+
+    if args.measure:
+        mode, source, destination = args.measure
+        measure(mode, Path(source), Path(destination))
+        return
+
+    print(f"{'size MiB':>8} {'mode':>10} {'seconds':>8} {'extra RSS MiB':>14}")
+    with tempfile.TemporaryDirectory() as workdir:
+        source = Path(workdir) / "source.mp4"
+        for size in args.sizes_mb:
+            with open(source, "wb") as file:
+                for _ in range(size):
+                    file.write(b"\0" * 1024 * 1024)
+            for mode in ("legacy", "streaming"):
+                output = subprocess.check_output(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--measure",
+                        mode,
+                        str(source),
+                        str(Path(workdir) / f"{mode}.mp4"),
+                    ],
+                    text=True,
+                )
+                elapsed, rss = output.split()
+                print(f"{size:>8} {mode:>10} {elapsed:>8} {rss:>14}")
+
+
+if __name__ == "__main__":
+    main()
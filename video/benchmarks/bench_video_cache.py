@@ -0,0 +1,78 @@
+"""Задержка VideoCache.get_video для топ-N видео: только Redis против LocalCache + Redis.
+
+Запуск из каталога video (без --redis-url используется fakeredis):
+    python benchmarks/bench_video_cache.py --top 1000 --lookups 200000
+    python benchmarks/bench_video_cache.py --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video.database.redis_cache import RedisDB  # noqa: E402
+from video.services.cache import LocalCache, VideoCache  # noqa: E402
+
+
+def make_client(redis_url: str | None):
+    if redis_url is None:
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis()
+    from redis import asyncio as aioredis
+
+    return aioredis.Redis.from_url(redis_url)
+
+
+async def run(cache: VideoCache, top: int, lookups: int) -> list[float]:
+    async def load(video_id: int) -> dict:
+        return {"id": video_id, "title": f"video {video_id}", "file": f"{video_id}.mp4"}
+
+    for video_id in range(top):
+        await cache.get_video(video_id, lambda: load(video_id))
+    timings = []
+    for _ in range(lookups):
+        video_id = random.randrange(top)
+        started = time.perf_counter()
+        await cache.get_video(video_id, lambda: load(video_id))
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(
+        f"{name:>14}: median {statistics.median(timings) * 1e6:8.1f} µs, "
+        f"p99 {p99 * 1e6:8.1f} µs"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    client = make_client(args.redis_url)
+    await client.flushdb()
+    redis_only = VideoCache(RedisDB.from_client(client, 600))
+    report("redis only", await run(redis_only, args.top, args.lookups))
+
+    await client.flushdb()
+    two_tier = VideoCache(
+        RedisDB.from_client(client, 600),
+        local=LocalCache(maxsize=args.top, ttl=600),
+    )
+    report("local + redis", await run(two_tier, args.top, args.lookups))
+    print(f"{'stats':>14}: {two_tier.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""Сравнение старого обработчика video_endpoint (чтение диапазона в память)
+и потоковой отдачи range_response по пропускной способности и RSS сервера.
+
+Запуск из каталога video:
+    python benchmarks/bench_video_endpoint.py --size-mb 256 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def build_app(path: Path):
+    from fastapi import FastAPI, Header, Request, Response
+
+    from video.services.storage import LocalStorage
+    from video.services.streaming import range_response
+
+    storage = LocalStorage(path.parent)
+    app = FastAPI()
+
+    @app.get("/legacy")
+    async def legacy(range: str = Header(None)):
+        start, end = range.replace("bytes=", "").split("-")
+        start = int(start)
+        end = int(end) if end else start + 1024 * 1024
+        with open(path, "rb") as video:
+            video.seek(start)
+            data = video.read(end - start)
+            filesize = str(path.stat().st_size)
+            headers = {
+                "Content-Range": f"bytes {str(start)}-{str(end)}/{filesize}",
+                "Accept-Ranges": "bytes",
+            }
+            return Response(
+                data, status_code=206, headers=headers, media_type="video/mp4"
+            )
+
+    @app.get("/streaming")
+    async def streaming(request: Request):
+        return await range_response(storage, path.name, request.headers)
+
+    return app
+
+
+def serve(path: Path, port: int) -> None:
+    import uvicorn
+
+    uvicorn.run(build_app(path), port=port, log_level="warning")
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status_file:
+        for line in status_file:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def run_load(
+    url: str, filesize: int, requests: int, concurrency: int, range_size: int
+) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    received = 0
+
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+
+        async def one() -> None:
+            nonlocal received
+            start = random.randrange(0, filesize - range_size)
+            headers = {"Range": f"bytes={start}-{start + range_size - 1}"}
+            async with semaphore:
+                async with client.stream("GET", url, headers=headers) as response:
+                    async for chunk in response.aiter_raw():
+                        received += len(chunk)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return time.perf_counter() - started, received
+
+
+def bench(handler: str, path: Path, args: argparse.Namespace, port: int) -> None:
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", str(path), "--port", str(port)]
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/{handler}"
+        for _ in range(100):
+            try:
+                httpx.get(url, headers={"Range": "bytes=0-1"})
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        elapsed, received = asyncio.run(
+            run_load(
+                url,
+                path.stat().st_size,
+                args.requests,
+                args.concurrency,
+                args.range_mb * 1024 * 1024,
+            )
+        )
+        print(
+            f"{handler:>10}: {args.requests / elapsed:8.1f} req/s, "
+            f"{received / elapsed / 2**20:8.1f} MiB/s, "
+            f"peak RSS {peak_rss_mb(server.pid):7.1f} MiB"
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--range-mb", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--serve")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(Path(args.serve), args.port)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as video:
+        video.write(os.urandom(args.size_mb * 1024 * 1024))
+        video.flush()
+        for port, handler in enumerate(("legacy", "streaming"), start=args.port):
+            bench(handler, Path(video.name), args, port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Задержка страницы списка видео в зависимости от глубины: keyset против OFFSET.
+
+Нужен Postgres со схемой после `alembic upgrade head`. Скрипт наполняет
+таблицу video до --rows строк (если их меньше) и сравнивает запросы.
+
+Запуск из каталога video:
+    python benchmarks/bench_video_list.py --rows 5000000 --depths 0 1000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video.core.config import settings  # noqa: E402
+from video.crud.video import VideoDAL  # noqa: E402
+from video.database.models.video import Video  # noqa: E402
+
+SEED_SQL = text(
+    """
+    INSERT INTO video (title, description, file, image, created_at)
+    SELECT 'video ' || n, repeat('d', 400), 'src/media/' || n || '.mp4',
+           'src/media/' || n || '.jpg',
+           now() - make_interval(secs => n)
+    FROM generate_series(:start, :stop) AS n
+    """
+)
+
+
+async def seed(session, rows: int) -> None:
+    existing = await session.scalar(select(func.count()).select_from(Video))
+    batch = 500_000
+    for start in range(existing + 1, rows + 1, batch):
+        await session.execute(
+            SEED_SQL, {"start": start, "stop": min(start + batch - 1, rows)}
+        )
+        await session.commit()
+    await session.execute(text("ANALYZE video"))
+    await session.commit()
+
+
+async def timed(call, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 10_000, 500_000])
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.db.async_url)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        await seed(session, args.rows)
+        dal = VideoDAL(session)
+        print(f"{'depth':>10} {'keyset ms':>10} {'offset ms':>10}")
+        for depth in args.depths:
+            boundary = (
+                await session.execute(
+                    select(Video.created_at, Video.id)
+                    .order_by(Video.created_at.desc(), Video.id.desc())
+                    .offset(depth)
+                    .limit(1)
+                )
+            ).one()
+
+            async def keyset():
+                await dal.get_list(args.limit, tuple(boundary))
+
+            async def offset():
+                await session.execute(
+                    select(Video.id, Video.title, Video.created_at)
+                    .order_by(Video.created_at.desc(), Video.id.desc())
+                    .offset(depth)
+                    .limit(args.limit)
+                )
+
+            print(
+                f"{depth:>10} {await timed(keyset, args.repeats):>10.2f} "
+                f"{await timed(offset, args.repeats):>10.2f}"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 import uvicorn
 from fastapi import FastAPI
 
+from video.api.hls import HLS_MOUNT_PATH, hls_files, hls_router
+from video.api.thumbnails import thumbnail_files
+from video.api.upload import upload_router
 from video.api.video import video_router
+from video.core.config import settings
+from video.database.session import ReadYourWritesMiddleware, dh_helper
+from video.services.cache import video_cache
+from video.services.storage import storage
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    invalidations = asyncio.create_task(video_cache.listen_invalidations())
+    yield
+    invalidations.cancel()
+    with suppress(asyncio.CancelledError):
+        await invalidations
+    await storage.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware, helper=dh_helper)
 
+app.include_router(upload_router)
+app.include_router(hls_router)
 app.include_router(video_router)
+app.mount(HLS_MOUNT_PATH, hls_files, name="hls")
+app.mount(settings.media.thumbnails_url, thumbnail_files, name="thumbnails")
 
 
 if __name__ == "__main__":
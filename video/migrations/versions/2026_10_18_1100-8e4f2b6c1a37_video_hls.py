@@ -0,0 +1,37 @@
+"""video hls
+
+Revision ID: 8e4f2b6c1a37
+Revises: 5c1d7e3a9b20
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4f2b6c1a37"
+down_revision: str | None = "5c1d7e3a9b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+stream_status = sa.Enum("PENDING", "PROCESSING", "READY", "FAILED", name="streamstatus")
+
+
+def upgrade() -> None:
+    stream_status.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "video",
+        sa.Column(
+            "hls_status", stream_status, server_default="PENDING", nullable=False
+        ),
+    )
+    op.add_column("video", sa.Column("hls_manifest", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("video", "hls_manifest")
+    op.drop_column("video", "hls_status")
+    stream_status.drop(op.get_bind(), checkfirst=True)
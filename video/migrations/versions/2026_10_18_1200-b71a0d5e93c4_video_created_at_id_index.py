@@ -0,0 +1,37 @@
+"""video created_at id index
+
+Revision ID: b71a0d5e93c4
+Revises: 8e4f2b6c1a37
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71a0d5e93c4"
+down_revision: str | None = "8e4f2b6c1a37"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_video_created_at_id",
+            "video",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_video_created_at_id",
+            table_name="video",
+            postgresql_concurrently=True,
+        )
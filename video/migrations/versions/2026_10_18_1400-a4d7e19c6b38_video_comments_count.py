@@ -0,0 +1,29 @@
+"""video comments count
+
+Revision ID: a4d7e19c6b38
+Revises: b71a0d5e93c4
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d7e19c6b38"
+down_revision: str | None = "b71a0d5e93c4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "video",
+        sa.Column("comments_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("video", "comments_count")
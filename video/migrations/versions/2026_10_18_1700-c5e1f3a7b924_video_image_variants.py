@@ -0,0 +1,26 @@
+"""video image variants
+
+Revision ID: c5e1f3a7b924
+Revises: a4d7e19c6b38
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1f3a7b924"
+down_revision: str | None = "a4d7e19c6b38"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("video", sa.Column("image_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("video", "image_variants")
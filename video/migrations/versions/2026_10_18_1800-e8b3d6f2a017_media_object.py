@@ -0,0 +1,49 @@
+"""media object
+
+Revision ID: e8b3d6f2a017
+Revises: c5e1f3a7b924
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b3d6f2a017"
+down_revision: str | None = "c5e1f3a7b924"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_object",
+        sa.Column("key", sa.String(length=200), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("refcount", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("released_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+    op.create_index(
+        "ix_media_object_released_at",
+        "media_object",
+        ["released_at"],
+        unique=False,
+        postgresql_where="refcount = 0",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_object_released_at", table_name="media_object")
+    op.drop_table("media_object")
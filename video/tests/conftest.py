@@ -0,0 +1,132 @@
+import os
+import uuid
+
+import httpx
+import pytest
+from fakeredis import aioredis as fakeredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# настройки без значений по умолчанию; сами сервисы в тестах подменяются
+for name, value in {
+    "VIDEO_DB_HOST": "localhost",
+    "VIDEO_DB_NAME": "video",
+    "VIDEO_DB_PORT": "5432",
+    "VIDEO_DB_USER": "video",
+    "VIDEO_DB_PASSWORD": "video",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "redis",
+    "REDIS_EXPIRE_IN_SEC": "60",
+    "REDIS_RETRY": "1",
+    "RABBITMQ_HOST": "localhost",
+    "RABBITMQ_USER": "guest",
+    "RABBITMQ_PORT1": "5672",
+    "RABBITMQ_PORT2": "15672",
+    "RABBITMQ_PASSWORD": "guest",
+    "RABBITMQ_HOSTNAME": "rabbitmq",
+    "RABBITMQ_VHOST": "/",
+}.items():
+    os.environ.setdefault(name, value)
+
+from mainv import app  # noqa: E402
+from video.database.models.base import Base  # noqa: E402
+from video.database.redis_cache import RedisDB  # noqa: E402
+from video.database.session import dh_helper  # noqa: E402
+from video.services.cache import VideoCache, get_video_cache  # noqa: E402
+from video.services.media_store import MediaStore, get_media_store  # noqa: E402
+from video.services.storage import (  # noqa: E402
+    LocalStorage,
+    S3Storage,
+    get_storage,
+)
+from video.services.upload import UploadStore, get_upload_store  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'video.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeRedis()
+    yield RedisDB.from_client(client, expire_in_sec=60)
+    await client.aclose()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path / "objects")
+
+
+@pytest.fixture(scope="session")
+def s3_endpoint():
+    """S3 на moto в отдельном потоке, один на все тесты"""
+    from moto.server import ThreadedMotoServer
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+async def s3(s3_endpoint):
+    """S3Storage над отдельным бакетом; multipart начинается с 5 МиБ, как в S3"""
+    storage = S3Storage(
+        bucket=f"test-{uuid.uuid4().hex}",
+        endpoint_url=s3_endpoint,
+        region="us-east-1",
+        access_key="testing",
+        secret_key="testing",
+        part_size=5 * 1024**2,
+        max_connections=4,
+    )
+    await (await storage.client()).create_bucket(Bucket=storage.bucket)
+    yield storage
+    await storage.close()
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    return UploadStore(tmp_path / "uploads", max_size=1024**2, expire=3600)
+
+
+@pytest.fixture
+async def client(engine, redis, storage, uploads):
+    """Приложение на SQLite, fakeredis и локальном хранилище во tmp_path"""
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def session_dependency():
+        async with factory() as session:
+            yield session
+
+    cache = VideoCache(redis)
+    app.dependency_overrides = {
+        dh_helper.scoped_session_dependency: session_dependency,
+        dh_helper.read_session_dependency: session_dependency,
+        get_video_cache: lambda: cache,
+        get_storage: lambda: storage,
+        get_media_store: lambda: MediaStore(storage, uploads.directory),
+        get_upload_store: lambda: uploads,
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides = {}
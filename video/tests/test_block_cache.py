@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from video.services.block_cache import BlockCache
+from video.services.storage import LocalStorage
+
+pytestmark = pytest.mark.anyio
+
+BLOCK_SIZE = 1024
+
+
+async def read(cache: BlockCache, origin: LocalStorage, key: str) -> bytes:
+    info = await origin.stat(key)
+    return b"".join([chunk async for chunk in cache.read(key, info, 0, info.size - 1)])
+
+
+async def test_processes_share_cache_root_through_own_slots(tmp_path):
+    origin = LocalStorage(tmp_path / "origin")
+    source = tmp_path / "source"
+    data = os.urandom(3 * BLOCK_SIZE)
+    source.write_bytes(data)
+    await origin.put_file("video/a.mp4", source)
+    caches = [
+        BlockCache(origin, tmp_path / "cache", BLOCK_SIZE, 4 * BLOCK_SIZE, workers=2)
+        for _ in range(3)
+    ]
+    for cache in caches:
+        assert await read(cache, origin, "video/a.mp4") == data
+
+    first, second, extra = caches
+    assert {first.root, second.root} == {tmp_path / "cache/0", tmp_path / "cache/1"}
+    assert first.max_bytes == 2 * BLOCK_SIZE
+    assert first.size == second.size == 2 * BLOCK_SIZE
+    # третьему процессу подкаталога не хватило: он читает origin напрямую
+    assert extra.root is None
+    assert extra.stats.misses == 0
+    assert extra.stats.origin_bytes == len(data)
+
+
+async def test_restarted_process_reuses_its_slot(tmp_path):
+    origin = LocalStorage(tmp_path / "origin")
+    source = tmp_path / "source"
+    data = os.urandom(2 * BLOCK_SIZE)
+    source.write_bytes(data)
+    await origin.put_file("video/a.mp4", source)
+    cache = BlockCache(origin, tmp_path / "cache", BLOCK_SIZE, 4 * BLOCK_SIZE)
+    await read(cache, origin, "video/a.mp4")
+    leftover = cache.root / "ab" / ".ab.1.part"
+    leftover.parent.mkdir(exist_ok=True)
+    leftover.write_bytes(b"partial")
+    cache._slot_lock.close()
+
+    restarted = BlockCache(origin, tmp_path / "cache", BLOCK_SIZE, 4 * BLOCK_SIZE)
+    assert await read(restarted, origin, "video/a.mp4") == data
+    assert restarted.root == cache.root
+    assert restarted.stats.hits == 2
+    assert restarted.stats.misses == 0
+    assert not leftover.exists()
@@ -0,0 +1,198 @@
+import asyncio
+
+import pytest
+
+from video.services import cache as cache_module
+from video.services.cache import (
+    MISSING,
+    VIDEO_KEY,
+    VIDEO_LIST_GENERATION_KEY,
+    VIDEO_LIST_PREFIX,
+    LocalCache,
+    VideoCache,
+)
+
+pytestmark = pytest.mark.anyio
+
+KEY = VIDEO_KEY.format(video_id=1)
+
+
+class Loader:
+    """loader для кеша: считает вызовы и может ждать release"""
+
+    def __init__(self, value, blocked: bool = False) -> None:
+        self.value = value
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        return self.value
+
+
+@pytest.fixture
+def cache(redis):
+    return VideoCache(redis, local=LocalCache(maxsize=10, ttl=60))
+
+
+async def test_read_through_fills_both_tiers(cache, redis):
+    loader = Loader({"id": 1})
+
+    assert await cache.get_or_load(KEY, loader) == {"id": 1}
+    assert await cache.get_or_load(KEY, loader) == {"id": 1}
+    assert await redis.get_value(KEY) == {"id": 1}
+    assert loader.calls == 1
+    assert (cache.stats.misses, cache.stats.local_hits) == (1, 1)
+
+    # другой воркер берёт значение из Redis, не вызывая loader
+    other = VideoCache(redis, local=LocalCache(maxsize=10, ttl=60))
+    assert await other.get_or_load(KEY, loader) == {"id": 1}
+    assert loader.calls == 1
+    assert other.stats.hits == 1
+
+
+async def test_missing_value_is_not_cached(cache, redis):
+    loader = Loader(None)
+
+    assert await cache.get_or_load(KEY, loader) is None
+    assert await cache.get_or_load(KEY, loader) is None
+    assert loader.calls == 2
+    assert not await redis.is_exists(KEY)
+
+
+async def test_concurrent_misses_load_once(cache):
+    loader = Loader({"id": 1}, blocked=True)
+    tasks = [asyncio.create_task(cache.get_or_load(KEY, loader)) for _ in range(5)]
+    await loader.started.wait()
+    loader.release.set()
+
+    assert await asyncio.gather(*tasks) == [{"id": 1}] * 5
+    assert loader.calls == 1
+    assert cache.stats.loads == 1
+
+
+async def test_cancelled_leader_hands_load_to_waiter(cache):
+    leader_loader = Loader({"id": 1}, blocked=True)
+    leader = asyncio.create_task(cache.get_or_load(KEY, leader_loader))
+    await leader_loader.started.wait()
+    waiter_loader = Loader({"id": 1})
+    waiter = asyncio.create_task(cache.get_or_load(KEY, waiter_loader))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await waiter == {"id": 1}
+    assert waiter_loader.calls == 1
+
+
+async def test_cancelled_waiter_does_not_cancel_load(cache):
+    loader = Loader({"id": 1}, blocked=True)
+    leader = asyncio.create_task(cache.get_or_load(KEY, loader))
+    await loader.started.wait()
+    waiter = asyncio.create_task(cache.get_or_load(KEY, loader))
+    await asyncio.sleep(0.01)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    loader.release.set()
+    assert await leader == {"id": 1}
+    assert loader.calls == 1
+
+
+async def test_failed_load_reaches_every_caller(cache):
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ValueError("db down")
+
+    tasks = [asyncio.create_task(cache.get_or_load(KEY, failing)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    # ошибка не кешируется
+    assert await cache.get_or_load(KEY, Loader({"id": 1})) == {"id": 1}
+
+
+async def test_invalidate_video_drops_both_tiers(cache, redis):
+    await cache.get_video(1, Loader({"title": "old"}))
+
+    await cache.invalidate_video(1)
+    assert not await redis.is_exists(KEY)
+    assert len(cache.local) == 0
+    assert await cache.get_video(1, Loader({"title": "new"})) == {"title": "new"}
+
+
+async def test_invalidate_lists_switches_generation(cache, redis):
+    assert await cache.get_video_list("first", Loader(["a"])) == ["a"]
+    assert await cache.get_video_list("first", Loader(["b"])) == ["a"]
+
+    await cache.invalidate_lists()
+    assert await redis.get_value(VIDEO_LIST_GENERATION_KEY) == 1
+    assert await cache.get_video_list("first", Loader(["b"])) == ["b"]
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(maxsize=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)
+
+    assert local.get("b") is MISSING
+    assert (local.get("a"), local.get("c")) == (1, 3)
+    assert len(local) == 2
+
+
+def test_local_cache_expires_by_ttl(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+    local = LocalCache(maxsize=10, ttl=5)
+    local.set("a", 1)
+
+    now = 104.0
+    assert local.get("a") == 1
+    now = 106.0
+    assert local.get("a") is MISSING
+    assert len(local) == 0
+
+
+def test_local_cache_deletes_by_prefix():
+    local = LocalCache(maxsize=10, ttl=60)
+    local.set(VIDEO_LIST_PREFIX + "0:first", ["a"])
+    local.set(VIDEO_LIST_PREFIX + "0:second", ["b"])
+    local.set(KEY, {"id": 1})
+
+    local.delete_prefix(VIDEO_LIST_PREFIX)
+    assert len(local) == 1
+    assert local.get(KEY) == {"id": 1}
+
+
+async def test_invalidation_reaches_other_workers(cache, redis):
+    other = VideoCache(redis, local=LocalCache(maxsize=10, ttl=60))
+    listener = asyncio.create_task(other.listen_invalidations())
+    while (await redis.redis.pubsub_numsub(other.channel))[0][1] == 0:
+        await asyncio.sleep(0.01)
+    await other.get_video(1, Loader({"title": "old"}))
+    await other.get_video_list("first", Loader(["a"]))
+    assert len(other.local) == 2
+
+    await cache.invalidate_video(1)
+    for _ in range(100):
+        if len(other.local) == 0:
+            break
+        await asyncio.sleep(0.01)
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+
+    # видео и страницы списков вычищены по сообщениям из Redis pub/sub
+    assert len(other.local) == 0
+    assert await other.get_video(1, Loader({"title": "new"})) == {"title": "new"}
@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+import pytest
+
+from video.crud.video import VideoDAL
+from video.schemas.video import CreateVideoSchema
+from video.services.block_cache import BlockCache, CachedStorage
+
+pytestmark = pytest.mark.anyio
+
+BLOCK_SIZE = 1024
+DATA = os.urandom(4 * BLOCK_SIZE + 100)
+
+
+@pytest.fixture
+def storage(s3, tmp_path):
+    """S3 за кешем блоков: им же пользуется приложение в фикстуре client"""
+    return CachedStorage(
+        s3, BlockCache(s3, tmp_path / "blocks", BLOCK_SIZE, 3 * BLOCK_SIZE)
+    )
+
+
+@pytest.fixture
+async def stored(storage, tmp_path):
+    source = tmp_path / "source.mp4"
+    source.write_bytes(DATA)
+    await storage.put_file("a.mp4", source)
+    return "a.mp4"
+
+
+async def read_range(storage: CachedStorage, key: str, start: int, end: int) -> bytes:
+    return b"".join([chunk async for chunk in storage.open_range(key, start, end)])
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        (0, 0),
+        (0, BLOCK_SIZE - 1),
+        (BLOCK_SIZE - 10, BLOCK_SIZE + 10),
+        (3 * BLOCK_SIZE, len(DATA) - 1),
+        (100, len(DATA) + 500),
+    ],
+)
+async def test_ranges_match_origin(storage, stored, start, end):
+    assert await read_range(storage, stored, start, end) == DATA[start : end + 1]
+
+
+async def test_second_read_is_served_from_blocks(storage, stored):
+    stats = storage.cache.stats
+    await read_range(storage, stored, 0, 2 * BLOCK_SIZE - 1)
+    assert (stats.misses, stats.origin_bytes) == (2, 2 * BLOCK_SIZE)
+
+    assert await read_range(storage, stored, 10, BLOCK_SIZE + 10) == DATA[10:1035]
+    assert stats.hits == 2
+    assert stats.origin_bytes == 2 * BLOCK_SIZE
+
+
+async def test_concurrent_reads_share_one_fetch(storage, stored):
+    reads = [read_range(storage, stored, 0, BLOCK_SIZE - 1) for _ in range(3)]
+
+    assert await asyncio.gather(*reads) == [DATA[:BLOCK_SIZE]] * 3
+    stats = storage.cache.stats
+    assert (stats.misses, stats.coalesced) == (1, 2)
+    assert stats.origin_bytes == BLOCK_SIZE
+
+
+async def test_cache_evicts_least_recently_read_blocks(storage, stored):
+    assert await read_range(storage, stored, 0, len(DATA) - 1) == DATA
+
+    cache = storage.cache
+    assert cache.size <= cache.max_bytes
+    assert cache.stats.evictions == 2
+    # первые блоки вытеснены и читаются из origin заново
+    await read_range(storage, stored, 0, 0)
+    assert cache.stats.misses == 6
+
+
+async def test_delete_drops_blocks_and_stat(storage, stored, s3):
+    await read_range(storage, stored, 0, len(DATA) - 1)
+
+    await storage.delete(stored)
+    assert not await s3.exists(stored)
+    assert storage.cache.size == 0
+    with pytest.raises(FileNotFoundError):
+        await storage.stat(stored)
+
+
+@pytest.fixture
+async def video(session, stored):
+    return await VideoDAL(session).create(
+        CreateVideoSchema(
+            title="video", description="description", file=stored, image="a.jpg"
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("range_header", "start", "end"),
+    [
+        ("bytes=0-99", 0, 99),
+        ("bytes=1000-1100", 1000, 1100),
+        (f"bytes=-{BLOCK_SIZE}", len(DATA) - BLOCK_SIZE, len(DATA) - 1),
+    ],
+)
+async def test_video_endpoint_streams_ranges_from_s3(
+    client, video, range_header, start, end
+):
+    response = await client.get(f"/video/{video.id}", headers={"Range": range_header})
+
+    assert response.status_code == 206
+    assert response.content == DATA[start : end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(DATA)}"
+
+
+async def test_video_endpoint_multiple_ranges_from_s3(client, video):
+    response = await client.get(
+        f"/video/{video.id}", headers={"Range": "bytes=0-9,2000-2009"}
+    )
+
+    assert response.status_code == 206
+    assert response.headers["content-length"] == str(len(response.content))
+    assert DATA[:10] in response.content
+    assert DATA[2000:2010] in response.content
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import select
+
+from video.database.models.media import MediaObject
+from video.services.media_store import MediaStore
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def store(s3, tmp_path):
+    return MediaStore(s3, tmp_path / "staging")
+
+
+@pytest.fixture
+def source(tmp_path):
+    def write(name: str, data: bytes):
+        path = tmp_path / name
+        path.write_bytes(data)
+        return path
+
+    return write
+
+
+async def refcounts(session) -> dict[str, int]:
+    res = await session.execute(select(MediaObject.key, MediaObject.refcount))
+    return dict(res.all())
+
+
+async def test_same_content_is_stored_once(store, s3, session, source):
+    first = await store.add_file(session, source("a", b"video"), ".mp4")
+    second = await store.add_file(session, source("b", b"video"), ".mp4")
+    other = await store.add_file(session, source("c", b"other"), ".mp4")
+
+    assert first == second != other
+    assert await refcounts(session) == {first: 2, other: 1}
+    client = await s3.client()
+    listing = await client.list_objects_v2(Bucket=s3.bucket)
+    assert sorted(item["Key"] for item in listing["Contents"]) == sorted([first, other])
+
+
+async def test_garbage_collected_after_last_release(store, s3, session, source):
+    key = await store.add_file(session, source("a", b"video"), ".mp4")
+    await store.add_file(session, source("b", b"video"), ".mp4")
+
+    await store.release(session, [key])
+    assert await store.collect_garbage(session, grace=0) == 0
+    assert await s3.exists(key)
+
+    await store.release(session, [key])
+    assert await store.collect_garbage(session, grace=3600) == 0
+    assert await store.collect_garbage(session, grace=0) == 1
+    assert not await s3.exists(key)
+    assert await refcounts(session) == {}
+
+
+async def test_reacquired_object_survives_gc(store, s3, session, source):
+    key = await store.add_file(session, source("a", b"video"), ".mp4")
+    await store.release(session, [key])
+    assert await store.add_file(session, source("b", b"video"), ".mp4") == key
+
+    assert await store.collect_garbage(session, grace=0) == 0
+    assert await s3.exists(key)
+    assert await refcounts(session) == {key: 1}
+
+
+async def test_failed_put_releases_reference(store, s3, session, source, monkeypatch):
+    async def failing_put(key, path):
+        raise ConnectionError("reset")
+
+    monkeypatch.setattr(s3, "put_file", failing_put)
+    with pytest.raises(ConnectionError):
+        await store.add_file(session, source("a", b"video"), ".mp4")
+
+    (key,) = await refcounts(session)
+    assert await refcounts(session) == {key: 0}
+    assert await store.collect_garbage(session, grace=0) == 1
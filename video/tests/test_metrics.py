@@ -0,0 +1,30 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_expose_pool_stats(client):
+    response = await client.get("/video/metrics")
+
+    assert response.status_code == 200
+    metrics = response.json()
+    assert set(metrics["db"]) == {
+        "size",
+        "in_use",
+        "idle",
+        "overflow",
+        "checkouts",
+        "timeouts",
+        "wait_avg",
+        "wait_max",
+    }
+    assert metrics["replicas"] == []
+
+
+async def test_metrics_expose_cache_stats(client):
+    await client.get("/videos")
+    await client.get("/videos")
+
+    cache = (await client.get("/video/metrics")).json()["cache"]
+    assert (cache["misses"], cache["hits"], cache["loads"]) == (1, 1, 1)
+    assert cache["hit_ratio"] == 0.5
@@ -0,0 +1,74 @@
+import pytest
+
+from tests.query_counter import QueryCounter
+from video.crud.video import VideoDAL
+from video.schemas.video import CreateVideoSchema, UpdateVideoSchema
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_video(session, title: str = "video"):
+    return await VideoDAL(session).create(
+        CreateVideoSchema(
+            title=title, description="description", file="a.mp4", image="a.jpg"
+        )
+    )
+
+
+async def test_update_video_is_single_statement(engine, session):
+    video = await create_video(session)
+    body = UpdateVideoSchema(title="new", description=None, file=None, image=None)
+    with QueryCounter(engine) as counter:
+        updated = await VideoDAL(session).update(video.id, body)
+    counter.assert_count(1)
+    assert updated.title == "new"
+
+
+async def test_update_video_with_empty_body_returns_current_row(engine, session):
+    video = await create_video(session)
+    body = UpdateVideoSchema(title=None, description=None, file=None, image=None)
+    with QueryCounter(engine) as counter:
+        updated = await VideoDAL(session).update(video.id, body)
+    counter.assert_count(1)
+    assert updated.id == video.id
+    assert updated.title == "video"
+    assert await VideoDAL(session).update(video.id + 1, body) is None
+
+
+async def test_list_videos_endpoint_is_single_select(engine, session, client):
+    for number in range(3):
+        await create_video(session, f"video {number}")
+    with QueryCounter(engine) as counter:
+        response = await client.get("/videos", params={"limit": 2})
+    counter.assert_count(1)
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["title"] for item in page["items"]] == ["video 2", "video 1"]
+    assert page["items"][0]["description"] is None
+
+    # следующий запрос той же страницы обслуживает кеш
+    with QueryCounter(engine) as counter:
+        cached = await client.get("/videos", params={"limit": 2})
+    counter.assert_count(0)
+    assert cached.json() == page
+
+
+async def test_video_endpoint_is_single_select(
+    engine, session, client, storage, tmp_path
+):
+    video = await create_video(session)
+    source = tmp_path / "a.mp4"
+    source.write_bytes(b"0123456789")
+    await storage.put_file(video.file, source)
+    with QueryCounter(engine) as counter:
+        response = await client.get(
+            f"/video/{video.id}", headers={"Range": "bytes=2-5"}
+        )
+    counter.assert_count(1)
+    assert response.status_code == 206
+    assert response.content == b"2345"
+
+    with QueryCounter(engine) as counter:
+        missing = await client.get(f"/video/{video.id + 1}")
+    counter.assert_count(1)
+    assert missing.status_code == 404
@@ -0,0 +1,98 @@
+import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from video.database.session import (
+    READ_PRIMARY_COOKIE,
+    DDHelper,
+    ReadYourWritesMiddleware,
+)
+
+pytestmark = pytest.mark.anyio
+
+metadata = MetaData()
+item = Table(
+    "item",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+)
+
+
+def create_app(helper: DDHelper) -> FastAPI:
+    """Один воркер сервиса: запись в primary, чтение через реплику"""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, helper=helper)
+
+    @app.post("/items/{name}")
+    async def create(
+        name: str, session: AsyncSession = Depends(helper.scoped_session_dependency)
+    ):
+        await session.execute(insert(item).values(name=name))
+        await session.commit()
+
+    @app.get("/items")
+    async def names(
+        session: AsyncSession = Depends(helper.read_session_dependency),
+    ) -> list[str]:
+        return list((await session.execute(select(item.c.name))).scalars())
+
+    return app
+
+
+@pytest.fixture
+async def helpers(tmp_path):
+    """Два воркера над общими primary и «репликой» — двумя файлами SQLite.
+
+    Реплика не догоняет primary, то есть лаг репликации бесконечный.
+    """
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}" for name in ("p.db", "r.db")]
+    helpers = [
+        DDHelper(url=urls[0], replica_urls=urls[1:], read_your_writes=5.0)
+        for _ in range(2)
+    ]
+    for engine in (helpers[0].engine, *helpers[0].replica_engines):
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+    yield helpers
+    for helper in helpers:
+        for engine in (helper.engine, *helper.replica_engines):
+            await engine.dispose()
+
+
+def client(helper: DDHelper, **kwargs) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=create_app(helper))
+    return httpx.AsyncClient(transport=transport, base_url="http://test", **kwargs)
+
+
+async def test_writer_reads_primary_on_any_worker(helpers):
+    first, second = helpers
+    async with client(first) as writer:
+        response = await writer.post("/items/a")
+        assert READ_PRIMARY_COOKIE in response.cookies
+        assert (await writer.get("/items")).json() == ["a"]
+        cookies = writer.cookies
+
+    # тот же клиент на другом воркере видит свою запись
+    async with client(second, cookies=cookies) as same_client:
+        assert (await same_client.get("/items")).json() == ["a"]
+    # другой клиент с того же адреса читает реплику
+    async with client(second) as other_client:
+        assert (await other_client.get("/items")).json() == []
+
+
+async def test_expired_or_forged_cookie_reads_replica(helpers):
+    first, _ = helpers
+    async with client(first) as writer:
+        await writer.post("/items/a")
+
+    for deadline in (time.time() - 1, time.time() + 3600, "garbage"):
+        cookies = {READ_PRIMARY_COOKIE: str(deadline)}
+        async with client(first, cookies=cookies) as reader:
+            response = await reader.get("/items")
+            assert response.json() == []
+            assert READ_PRIMARY_COOKIE not in response.cookies
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from video.services.storage import S3Storage
+
+pytestmark = pytest.mark.anyio
+
+MIB = 1024**2
+
+
+async def read_range(storage: S3Storage, key: str, start: int, end: int) -> bytes:
+    return b"".join([chunk async for chunk in storage.open_range(key, start, end)])
+
+
+async def test_small_file_is_single_put(s3, tmp_path):
+    source = tmp_path / "small"
+    data = os.urandom(1000)
+    source.write_bytes(data)
+
+    await s3.put_file("ab/cd/small.mp4", source)
+    info = await s3.stat("ab/cd/small.mp4")
+    assert info.size == len(data)
+    # ETag multipart-объекта оканчивается на -<число частей>
+    assert "-" not in info.etag
+    assert await s3.exists("ab/cd/small.mp4")
+
+
+async def test_large_file_is_multipart(s3, tmp_path):
+    source = tmp_path / "large"
+    data = os.urandom(11 * MIB)
+    source.write_bytes(data)
+
+    await s3.put_file("large.mp4", source)
+    info = await s3.stat("large.mp4")
+    assert info.size == len(data)
+    assert info.etag.strip('"').endswith("-3")
+    destination = tmp_path / "copy" / "large.mp4"
+    await s3.get_file("large.mp4", destination)
+    assert destination.read_bytes() == data
+    client = await s3.client()
+    uploads = await client.list_multipart_uploads(Bucket=s3.bucket)
+    assert not uploads.get("Uploads")
+
+
+async def test_failed_multipart_upload_is_aborted(s3, tmp_path, monkeypatch):
+    source = tmp_path / "large"
+    source.write_bytes(os.urandom(6 * MIB))
+    client = await s3.client()
+    upload_part = client.upload_part
+    parts = 0
+
+    async def failing_part(**kwargs):
+        nonlocal parts
+        parts += 1
+        if parts == 2:
+            raise ConnectionError("reset")
+        return await upload_part(**kwargs)
+
+    monkeypatch.setattr(client, "upload_part", failing_part)
+    with pytest.raises(ConnectionError):
+        await s3.put_file("large.mp4", source)
+
+    assert not await s3.exists("large.mp4")
+    uploads = await client.list_multipart_uploads(Bucket=s3.bucket)
+    assert not uploads.get("Uploads")
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [(0, 0), (0, 99), (10, 19), (990, 999), (500, 2000)],
+)
+async def test_ranged_get(s3, tmp_path, start, end):
+    source = tmp_path / "data"
+    data = os.urandom(1000)
+    source.write_bytes(data)
+    await s3.put_file("data.mp4", source)
+
+    assert await read_range(s3, "data.mp4", start, end) == data[start : end + 1]
+
+
+async def test_stat_and_delete(s3, tmp_path):
+    source = tmp_path / "data"
+    source.write_bytes(b"content")
+    await s3.put_file("data.mp4", source)
+    info = await s3.stat("data.mp4")
+    assert info.size == 7
+    assert info.modified > 0
+
+    await s3.delete("data.mp4")
+    assert not await s3.exists("data.mp4")
+    with pytest.raises(FileNotFoundError):
+        await s3.stat("data.mp4")
+    # удаление отсутствующего объекта в S3 не ошибка
+    await s3.delete("data.mp4")
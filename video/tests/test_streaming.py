@@ -0,0 +1,245 @@
+from email.utils import formatdate
+
+import pytest
+from fastapi import HTTPException
+
+from video.crud.video import VideoDAL
+from video.schemas.video import CreateVideoSchema
+from video.services.streaming import (
+    MAX_RANGES,
+    ByteRange,
+    evaluate_preconditions,
+    if_range_allows,
+    parse_ranges,
+)
+
+pytestmark = pytest.mark.anyio
+
+SIZE = 10
+DATA = b"0123456789"
+ETAG = '"abc"'
+MTIME = 1_000_000
+LAST_MODIFIED = formatdate(MTIME, usegmt=True)
+EARLIER = formatdate(MTIME - 60, usegmt=True)
+LATER = formatdate(MTIME + 60, usegmt=True)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=2-5", [ByteRange(2, 5)]),
+        ("bytes=0-0", [ByteRange(0, 0)]),
+        # конец за пределами файла обрезается
+        ("bytes=5-100", [ByteRange(5, 9)]),
+        # открытый диапазон
+        ("bytes=5-", [ByteRange(5, 9)]),
+        ("bytes=0-", [ByteRange(0, 9)]),
+        # суффикс: последние n байт, но не больше файла
+        ("bytes=-3", [ByteRange(7, 9)]),
+        ("bytes=-20", [ByteRange(0, 9)]),
+        ("BYTES = 2 - 5", [ByteRange(2, 5)]),
+    ],
+)
+def test_parse_single_range(header, expected):
+    assert parse_ranges(header, SIZE) == expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-1,4-5", [ByteRange(0, 1), ByteRange(4, 5)]),
+        # пересекающиеся и смежные склеиваются, порядок — по началу
+        ("bytes=0-4,3-8", [ByteRange(0, 8)]),
+        ("bytes=0-1,2-3", [ByteRange(0, 3)]),
+        ("bytes=6-7,0-1", [ByteRange(0, 1), ByteRange(6, 7)]),
+        ("bytes=-2,0-1", [ByteRange(0, 1), ByteRange(8, 9)]),
+        ("bytes=0-1,-20", [ByteRange(0, 9)]),
+        # неудовлетворимые части отбрасываются, пока есть хоть одна годная
+        ("bytes=20-30,0-1", [ByteRange(0, 1)]),
+        ("bytes=0-1,,4-5", [ByteRange(0, 1), ByteRange(4, 5)]),
+    ],
+)
+def test_parse_multiple_ranges(header, expected):
+    assert parse_ranges(header, SIZE) == expected
+
+
+def test_parse_ranges_caps_number_of_ranges():
+    ranges = ",".join(f"{n}-{n}" for n in range(MAX_RANGES))
+    assert len(parse_ranges(f"bytes={ranges},", 100)) == 1
+    # сверх MAX_RANGES заголовок игнорируется целиком
+    assert parse_ranges(f"bytes={ranges},50-60", 100) is None
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, None),
+        ({"if-match": ETAG}, None),
+        ({"if-match": '"x", "abc"'}, None),
+        ({"if-match": "*"}, None),
+        ({"if-match": '"x"'}, 412),
+        # If-Match сравнивает строго
+        ({"if-match": 'W/"abc"'}, 412),
+        ({"if-unmodified-since": LAST_MODIFIED}, None),
+        ({"if-unmodified-since": EARLIER}, 412),
+        ({"if-unmodified-since": "не дата"}, None),
+        # при If-Match дата не проверяется
+        ({"if-match": ETAG, "if-unmodified-since": EARLIER}, None),
+        ({"if-none-match": ETAG}, 304),
+        ({"if-none-match": 'W/"abc"'}, 304),
+        ({"if-none-match": '"x", "abc"'}, 304),
+        ({"if-none-match": "*"}, 304),
+        ({"if-none-match": '"x"'}, None),
+        ({"if-modified-since": LAST_MODIFIED}, 304),
+        ({"if-modified-since": LATER}, 304),
+        ({"if-modified-since": EARLIER}, None),
+        ({"if-modified-since": "не дата"}, None),
+        # при If-None-Match дата не проверяется
+        ({"if-none-match": '"x"', "if-modified-since": LATER}, None),
+        # 412 важнее 304
+        ({"if-match": '"x"', "if-none-match": ETAG}, 412),
+    ],
+)
+def test_evaluate_preconditions(headers, expected):
+    assert evaluate_preconditions(headers, ETAG, MTIME) == expected
+
+
+@pytest.mark.parametrize(
+    ("if_range", "expected"),
+    [
+        (None, True),
+        (ETAG, True),
+        (f" {ETAG} ", True),
+        ('"x"', False),
+        # слабый ETag для If-Range не годится
+        ('W/"abc"', False),
+        (LAST_MODIFIED, True),
+        (EARLIER, False),
+    ],
+)
+def test_if_range_allows(if_range, expected):
+    headers = {} if if_range is None else {"if-range": if_range}
+    assert if_range_allows(headers, ETAG, LAST_MODIFIED) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        None,
+        "",
+        "items=0-1",
+        "bytes=",
+        "bytes=-",
+        "bytes=a-b",
+        "bytes=5-2",
+        "bytes=1-2-3",
+    ],
+)
+def test_invalid_range_is_ignored(header):
+    # синтаксически неверный Range игнорируется: отдаётся весь файл
+    assert parse_ranges(header, SIZE) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=10-20", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(HTTPException) as error:
+        parse_ranges(header, SIZE)
+    assert error.value.status_code == 416
+    assert error.value.headers == {"Content-Range": f"bytes */{SIZE}"}
+
+
+def test_empty_file_has_no_satisfiable_range():
+    with pytest.raises(HTTPException) as error:
+        parse_ranges("bytes=-5", 0)
+    assert error.value.status_code == 416
+
+
+@pytest.fixture
+async def video(session, storage, tmp_path):
+    source = tmp_path / "source.mp4"
+    source.write_bytes(DATA)
+    await storage.put_file("a.mp4", source)
+    return await VideoDAL(session).create(
+        CreateVideoSchema(
+            title="video", description="description", file="a.mp4", image="a.jpg"
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("headers", "status_code", "body", "content_range"),
+    [
+        ({}, 200, DATA, None),
+        ({"Range": "bytes=2-5"}, 206, b"2345", "bytes 2-5/10"),
+        ({"Range": "bytes=7-"}, 206, b"789", "bytes 7-9/10"),
+        ({"Range": "bytes=-2"}, 206, b"89", "bytes 8-9/10"),
+        ({"Range": "bytes=5-2"}, 200, DATA, None),
+        ({"Range": "bytes=10-"}, 416, None, "bytes */10"),
+    ],
+)
+async def test_video_endpoint_ranges(
+    client, video, headers, status_code, body, content_range
+):
+    response = await client.get(f"/video/{video.id}", headers=headers)
+    assert response.status_code == status_code
+    assert response.headers.get("content-range") == content_range
+    if body is not None:
+        assert response.content == body
+        assert response.headers["content-length"] == str(len(body))
+        assert response.headers["accept-ranges"] == "bytes"
+
+
+async def test_video_endpoint_multiple_ranges(client, video):
+    response = await client.get(
+        f"/video/{video.id}", headers={"Range": "bytes=0-1,4-5,5-6"}
+    )
+    assert response.status_code == 206
+    media_type, _, boundary = response.headers["content-type"].partition("; boundary=")
+    assert media_type == "multipart/byteranges"
+    assert response.headers["content-length"] == str(len(response.content))
+    assert (
+        response.content
+        == (
+            f"--{boundary}\r\nContent-Type: video/mp4\r\n"
+            "Content-Range: bytes 0-1/10\r\n\r\n01\r\n"
+            f"--{boundary}\r\nContent-Type: video/mp4\r\n"
+            "Content-Range: bytes 4-6/10\r\n\r\n456\r\n"
+            f"--{boundary}--\r\n"
+        ).encode()
+    )
+
+
+async def test_video_endpoint_conditional_requests(client, video):
+    response = await client.get(f"/video/{video.id}")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    not_modified = await client.get(
+        f"/video/{video.id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    not_modified = await client.get(
+        f"/video/{video.id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert not_modified.status_code == 304
+
+    failed = await client.get(f"/video/{video.id}", headers={"If-Match": '"x"'})
+    assert failed.status_code == 412
+
+    # If-Range совпал — диапазон, устарел — весь файл
+    fresh = await client.get(
+        f"/video/{video.id}", headers={"Range": "bytes=0-1", "If-Range": etag}
+    )
+    assert (fresh.status_code, fresh.content) == (206, b"01")
+    fresh = await client.get(
+        f"/video/{video.id}",
+        headers={"Range": "bytes=0-1", "If-Range": last_modified},
+    )
+    assert (fresh.status_code, fresh.content) == (206, b"01")
+    stale = await client.get(
+        f"/video/{video.id}", headers={"Range": "bytes=0-1", "If-Range": '"x"'}
+    )
+    assert (stale.status_code, stale.content) == (200, DATA)
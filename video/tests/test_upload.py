@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from video.crud.video import VideoDAL
+from video.database.models.media import MediaObject
+from video.database.models.video import Video
+from video.services import video as video_service
+
+pytestmark = pytest.mark.anyio
+
+DATA = b"0123456789" * 100
+
+
+@pytest.fixture(autouse=True)
+def tasks(monkeypatch):
+    """Задачи Celery не отправляются: брокера в тестах нет"""
+    for name in ("process_video", "segment_video", "process_image"):
+        monkeypatch.setattr(video_service, name, MagicMock())
+
+
+async def upload_video(client) -> str:
+    response = await client.post(
+        "/uploads/",
+        data={"title": "video", "description": "description"},
+        headers={"Upload-Length": str(len(DATA))},
+    )
+    upload_id = response.json()["id"]
+    response = await client.patch(
+        f"/uploads/{upload_id}",
+        content=DATA,
+        headers={
+            "Upload-Offset": "0",
+            "Content-Type": "application/offset+octet-stream",
+        },
+    )
+    assert response.headers["upload-offset"] == str(len(DATA))
+    return upload_id
+
+
+async def complete(client, upload_id: str):
+    return await client.post(
+        f"/uploads/{upload_id}/complete",
+        files={"image": ("a.jpg", b"jpeg", "image/jpeg")},
+    )
+
+
+async def test_failed_complete_keeps_upload_for_retry(
+    client, session, uploads, monkeypatch
+):
+    upload_id = await upload_video(client)
+
+    async def fail(self, video_body):
+        raise HTTPException(status_code=500, detail="Ошибка SQLAlchemyError")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(VideoDAL, "create", fail)
+        response = await complete(client, upload_id)
+    assert response.status_code == 500
+    # принятые байты на месте, ссылки на медиа сняты
+    head = await client.head(f"/uploads/{upload_id}")
+    assert head.headers["upload-offset"] == str(len(DATA))
+    assert uploads.data_path(upload_id).read_bytes() == DATA
+    res = await session.execute(select(MediaObject.refcount))
+    assert set(res.scalars()) == {0}
+
+    response = await complete(client, upload_id)
+    assert response.status_code == 200
+    assert (await client.head(f"/uploads/{upload_id}")).status_code == 404
+    video = (await session.execute(select(Video))).scalar_one()
+    assert (await client.get(f"/video/{video.id}")).content == DATA
+
+
+async def test_incomplete_upload_is_not_finalized(client, uploads):
+    response = await client.post(
+        "/uploads/",
+        data={"title": "video", "description": "description"},
+        headers={"Upload-Length": "100"},
+    )
+    upload_id = response.json()["id"]
+    response = await complete(client, upload_id)
+    assert response.status_code == 409
+    assert response.headers["upload-offset"] == "0"
+    assert uploads.data_path(upload_id).exists()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+from video.core.config import settings
+from video.database.models.video import StreamStatus
+from video.services.video import VideoService, get_service_video
+
+hls_router = APIRouter(tags=["HLS"])
+HLS_MOUNT_PATH = "/hls"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Раздача файлов, которые никогда не перезаписываются: HLS и обложки"""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if path.endswith(".m3u8"):
+            response.headers["Content-Type"] = "application/vnd.apple.mpegurl"
+        elif path.endswith(".ts"):
+            response.headers["Content-Type"] = "video/mp2t"
+        return response
+
+
+hls_files = ImmutableStaticFiles(directory=settings.media.hls_dir, check_dir=False)
+
+
+@hls_router.get("/video/{video_id}/hls")
+async def video_hls(
+    video_id: int, video_service: VideoService = Depends(get_service_video)
+):
+    video = await video_service.get_video(video_id)
+    manifest = None
+    if video.hls_status == StreamStatus.READY:
+        manifest = f"{HLS_MOUNT_PATH}/{video.hls_manifest}"
+    return {"status": video.hls_status, "manifest": manifest}
@@ -0,0 +1,7 @@
+from video.api.hls import ImmutableStaticFiles
+from video.core.config import settings
+
+# имена файлов — хеш содержимого, поэтому кешировать их можно навсегда
+thumbnail_files = ImmutableStaticFiles(
+    directory=settings.media.thumbnails_dir, check_dir=False
+)
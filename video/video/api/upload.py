@@ -0,0 +1,88 @@
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Form,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+
+from video.schemas.upload import ResponseUploadSchema
+from video.services.upload import UploadStore, get_upload_store
+from video.services.video import VideoService, get_service_video
+
+upload_router = APIRouter(tags=["Upload"], prefix="/uploads")
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+@upload_router.post(
+    "/", status_code=status.HTTP_201_CREATED, response_model=ResponseUploadSchema
+)
+async def create_upload(
+    response: Response,
+    title: Annotated[str, Form()],
+    description: Annotated[str, Form()],
+    upload_length: Annotated[int, Header()],
+    upload_store: UploadStore = Depends(get_upload_store),
+):
+    upload = await upload_store.create(title, description, upload_length)
+    response.headers["Location"] = f"{upload_router.prefix}/{upload.id}"
+    response.headers["Upload-Offset"] = "0"
+    return upload
+
+
+@upload_router.head("/{upload_id}")
+async def get_upload_offset(
+    upload_id: str, upload_store: UploadStore = Depends(get_upload_store)
+):
+    upload = await upload_store.get(upload_id)
+    return Response(
+        headers={
+            "Upload-Offset": str(upload.offset),
+            "Upload-Length": str(upload.length),
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+@upload_router.patch("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: Annotated[int, Header()],
+    content_type: Annotated[str, Header()],
+    upload_store: UploadStore = Depends(get_upload_store),
+):
+    if content_type != OFFSET_CONTENT_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type должен быть {OFFSET_CONTENT_TYPE}",
+        )
+    offset = await upload_store.append(upload_id, upload_offset, request.stream())
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(offset)},
+    )
+
+
+@upload_router.post("/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    image: UploadFile,
+    upload_store: UploadStore = Depends(get_upload_store),
+    video_service: VideoService = Depends(get_service_video),
+):
+    await video_service.create_from_upload(upload_id, image, upload_store)
+    return {"status": "Видео загружено"}
+
+
+@upload_router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_upload(
+    upload_id: str, upload_store: UploadStore = Depends(get_upload_store)
+):
+    await upload_store.delete(upload_id)
@@ -1,14 +1,38 @@
-from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, Header, Request, Response, UploadFile
+from fastapi import APIRouter, Depends, Form, Query, Request, UploadFile
 from fastapi.templating import Jinja2Templates
 
+from video.database.session import dh_helper
+from video.schemas.video import VideoPageSchema
+from video.services.cache import VideoCache, get_video_cache
+from video.services.storage import StorageBackend, get_storage
+from video.services.streaming import range_response
 from video.services.video import VideoService, get_service_video
 
 video_router = APIRouter(tags=["Video"])
 templates = Jinja2Templates(directory="src/templates")
-CHUNK_SIZE = 1024 * 1024
+MAX_PAGE_SIZE = 100
+
+
+@video_router.get("/videos", response_model=VideoPageSchema)
+async def list_videos(
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+    with_description: bool = False,
+    video_service: VideoService = Depends(get_service_video),
+):
+    return await video_service.get_list(cursor, limit, with_description)
+
+
+@video_router.get("/video/metrics")
+async def video_metrics(cache: VideoCache = Depends(get_video_cache)):
+    """Пулы соединений primary и реплик и кеш метаданных видео"""
+    return {
+        "db": dh_helper.pool_metrics(),
+        "replicas": dh_helper.replica_pool_metrics(),
+        "cache": cache.metrics(),
+    }
 
 
 @video_router.get("/{video_id}")
@@ -33,20 +57,9 @@ async def create_video(
 @video_router.get("/video/{video_id}")
 async def video_endpoint(
     video_id: int,
-    range: str = Header(None),
+    request: Request,
     video_service: VideoService = Depends(get_service_video),
+    storage: StorageBackend = Depends(get_storage),
 ):
-    video_path = await video_service.get_video(video_id)
-    path = Path(video_path.file)
-    start, end = range.replace("bytes=", "").split("-")
-    start = int(start)
-    end = int(end) if end else start + CHUNK_SIZE
-    with open(path, "rb") as video:
-        video.seek(start)
-        data = video.read(end - start)
-        filesize = str(path.stat().st_size)
-        headers = {
-            "Content-Range": f"bytes {str(start)}-{str(end)}/{filesize}",
-            "Accept-Ranges": "bytes",
-        }
-        return Response(data, status_code=206, headers=headers, media_type="video/mp4")
+    video = await video_service.get_video(video_id)
+    return await range_response(storage, video.file, request.headers)
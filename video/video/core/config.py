@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,7 +19,17 @@ class DBSettings(BaseSettings):
     port: int
     user: str
     password: SecretStr
-    echo: bool = True
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+    replica_urls: list[str] = []
+    replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"
+    read_your_writes: float = 5.0
 
     model_config = SettingsConfigDict(
         env_prefix="video_db_", env_file=BASE_DIR / ".env"
@@ -53,6 +64,20 @@ class RedisDBSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="redis_")
 
 
+class CacheSettings(BaseSettings):
+    local_maxsize: int = 10_000
+    local_ttl: float = 5.0
+    invalidation_channel: str = "video:cache:invalidate"
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="cache_")
+
+
+class CommentSettings(BaseSettings):
+    counts_sync_interval: float = 10.0
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="comment_")
+
+
 class RabbitmqSettings(BaseSettings):
     host: str
     user: str
@@ -77,11 +102,56 @@ class RabbitmqSettings(BaseSettings):
     )
 
 
+class MediaSettings(BaseSettings):
+    root: Path = Path("src/media")
+    chunk_size: int = 1024 * 1024
+    uploads_dir: Path = Path("src/media/.uploads")
+    max_upload_size: int = 10 * 1024 * 1024 * 1024
+    upload_expire: int = 24 * 3600
+    upload_cleanup_interval: float = 3600.0
+    hls_dir: Path = Path("src/media/hls")
+    hls_segment_seconds: int = 6
+    ffmpeg_binary: str = "ffmpeg"
+    thumbnails_dir: Path = Path("src/media/thumbnails")
+    thumbnails_url: str = "/thumbnails"
+    thumbnail_widths: list[int] = [160, 320, 640, 1280]
+    thumbnail_quality: int = 80
+    # очередь Celery для process_image, "celery" — очередь по умолчанию
+    image_queue: str = "celery"
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="media_")
+
+
+class StorageSettings(BaseSettings):
+    backend: Literal["local", "s3"] = "local"
+    root: Path = Path("src/media/objects")
+    s3_bucket: str = "media"
+    s3_endpoint_url: str | None = None
+    s3_region: str = "us-east-1"
+    s3_access_key: SecretStr = SecretStr("")
+    s3_secret_key: SecretStr = SecretStr("")
+    s3_part_size: int = 64 * 1024 * 1024
+    s3_max_connections: int = 100
+    cache_root: Path = Path("src/media/cache")
+    cache_max_bytes: int = 10 * 1024**3
+    cache_block_size: int = 1024 * 1024
+    # процессы приложения с общим cache_root, каждому max_bytes / cache_workers
+    cache_workers: int = 1
+    gc_interval: float = 3600.0
+    gc_grace: int = 3600
+
+    model_config = SettingsConfigDict(env_file=BASE_DIR / ".env", env_prefix="storage_")
+
+
 class Settings:
     app: AppSettings = AppSettings()
     db: DBSettings = DBSettings()
     redis: RedisDBSettings = RedisDBSettings()
+    cache: CacheSettings = CacheSettings()
+    comment: CommentSettings = CommentSettings()
     rabbitmq: RabbitmqSettings = RabbitmqSettings()
+    media: MediaSettings = MediaSettings()
+    storage: StorageSettings = StorageSettings()
 
 
 @lru_cache
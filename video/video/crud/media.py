@@ -0,0 +1,84 @@
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from video.database.models.media import MediaObject
+
+
+class MediaObjectDAL:
+    def __init__(self, session: AsyncSession) -> None:
+        self.db_session = session
+
+    def _insert(self):
+        # SQLite нужен только бенчмаркам, ON CONFLICT у обоих диалектов общий
+        if self.db_session.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(MediaObject)
+        return postgresql.insert(MediaObject)
+
+    async def acquire(self, key: str, size: int) -> None:
+        """Добавляет ссылку на объект, заводя строку при первой ссылке"""
+        try:
+            stmt = self._insert().values(key=key, size=size, refcount=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["key"],
+                set_={"refcount": MediaObject.refcount + 1, "released_at": None},
+            )
+            await self.db_session.execute(stmt)
+            await self.db_session.commit()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при сохранении media",
+            )
+
+    async def release(self, keys: Sequence[str]) -> None:
+        """Снимает по ссылке за каждое вхождение ключа одним UPDATE"""
+        counts = Counter(keys)
+        if not counts:
+            return
+        try:
+            stmt = (
+                update(MediaObject)
+                .where(MediaObject.key.in_(counts))
+                .values(
+                    refcount=MediaObject.refcount
+                    - case(dict(counts), value=MediaObject.key, else_=0),
+                    released_at=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db_session.execute(stmt)
+            await self.db_session.commit()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка SQLAlchemyError при освобождении media",
+            )
+
+    async def lock_garbage(self, released_before: datetime, limit: int) -> list[str]:
+        """Блокирует до limit объектов без ссылок, освобождённых до released_before.
+
+        Строки остаются заблокированными до commit, поэтому новая ссылка
+        на тот же ключ (acquire) дождётся удаления объекта и заведёт его заново.
+        """
+        query = (
+            select(MediaObject.key)
+            .where(
+                MediaObject.refcount == 0,
+                MediaObject.released_at < released_before,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list((await self.db_session.execute(query)).scalars())
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        await self.db_session.execute(
+            delete(MediaObject).where(MediaObject.key.in_(keys))
+        )
@@ -1,7 +1,17 @@
-from typing import Any
+from collections.abc import Sequence
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import Result, delete, select, update
+from sqlalchemy import (
+    Result,
+    Row,
+    RowMapping,
+    delete,
+    insert,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import override
@@ -19,15 +29,10 @@ class VideoDAL(CrudBase):
     @override
     async def create(self, video_body: CreateVideoSchema):
         try:
-            video = Video(
-                title=video_body.title,
-                description=video_body.description,
-                file=video_body.file,
-                image=video_body.image,
-            )
-            self.db_session.add(video)
+            stmt = insert(Video).values(**video_body.model_dump()).returning(Video)
+            res: Result = await self.db_session.execute(stmt)
+            video = res.scalar_one()
             await self.db_session.commit()
-            await self.db_session.refresh(video)
             return video
         except SQLAlchemyError:
             raise HTTPException(
@@ -60,16 +65,21 @@ class VideoDAL(CrudBase):
 
     @override
     async def update(self, video_id: int, update_body_video: UpdateVideoSchema):
+        values = update_body_video.model_dump(exclude_none=True)
+        if not values:
+            # менять нечего: UPDATE без SET не собрать, отдаём текущую строку
+            return await self.get(video_id)
         try:
             stmt = (
                 update(Video)
                 .where(Video.id == video_id)
-                .values(**update_body_video.model_dump())
-                .returning(Video.id)
+                .values(**values)
+                .returning(Video)
+                .execution_options(populate_existing=True)
             )
             res: Result = await self.db_session.execute(stmt)
+            video = res.scalar_one_or_none()
             await self.db_session.commit()
-            video = await self.db_session.get(Video, res.scalar())
             return video
         except SQLAlchemyError:
             raise HTTPException(
@@ -83,12 +93,18 @@ class VideoDAL(CrudBase):
             )
 
     @override
-    async def delete(self, video_id: int) -> Any:
+    async def delete(self, video_id: int) -> Row | None:
+        """Удаляет видео и возвращает (id, file, image) для освобождения media"""
         try:
-            stmt = delete(Video).where(Video.id == video_id).returning(Video.id)
+            stmt = (
+                delete(Video)
+                .where(Video.id == video_id)
+                .returning(Video.id, Video.file, Video.image)
+            )
             res: Result = await self.db_session.execute(stmt)
+            deleted = res.one_or_none()
             await self.db_session.commit()
-            return res.scalar()
+            return deleted
         except SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -100,12 +116,36 @@ class VideoDAL(CrudBase):
                 detail="Неизвестная ошибка при удалении video",
             )
 
-    async def get_list(self):
+    async def get_list(
+        self,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        with_description: bool = False,
+    ) -> Sequence[RowMapping]:
+        """Страница видео от новых к старым с keyset-пагинацией по (created_at, id)"""
         try:
-            query = select(Video)
+            columns = [
+                Video.id,
+                Video.title,
+                Video.file,
+                Video.image,
+                Video.image_variants,
+                Video.created_at,
+                Video.hls_status,
+                Video.hls_manifest,
+                Video.comments_count,
+            ]
+            if with_description:
+                columns.append(Video.description)
+            query = (
+                select(*columns)
+                .order_by(Video.created_at.desc(), Video.id.desc())
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(tuple_(Video.created_at, Video.id) < after)
             res: Result = await self.db_session.execute(query)
-            videos = res.scalars().all()
-            return videos
+            return res.mappings().all()
 
         except SQLAlchemyError:
             raise HTTPException(
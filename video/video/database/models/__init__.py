@@ -1,5 +1,5 @@
-__all__ = ["Base", "Video", "Comment"]
+__all__ = ["Base", "Video", "MediaObject"]
 
 from .base import Base
 from .video import Video
-from .comment import Comment
+from .media import MediaObject
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MediaObject(Base):
+    """Объект контентно-адресуемого хранилища и число ссылок на него.
+
+    Объект с refcount == 0 не удаляется сразу: его подбирает задача
+    collect_media_garbage спустя gc_grace секунд после released_at.
+    """
+
+    __tablename__ = "media_object"
+    __table_args__ = (
+        Index(
+            "ix_media_object_released_at",
+            "released_at",
+            postgresql_where="refcount = 0",
+        ),
+    )
+
+    key: Mapped[str] = mapped_column(String(length=200), unique=True)
+    size: Mapped[int] = mapped_column(BigInteger)
+    refcount: Mapped[int] = mapped_column(default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=func.now()
+    )
+    released_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:
+        return f"MediaObject - ({self.key}, {self.refcount})"
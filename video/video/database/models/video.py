@@ -1,17 +1,23 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from enum import Enum
+from typing import Any
 
-from sqlalchemy import DateTime, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import JSON, DateTime, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
-if TYPE_CHECKING:
-    from .comment import Comment
+
+class StreamStatus(str, Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
 
 
 class Video(Base):
     __tablename__ = "video"
+    __table_args__ = (Index("ix_video_created_at_id", "created_at", "id"),)
 
     title: Mapped[str] = mapped_column(String(length=50))
     description: Mapped[str] = mapped_column(String(length=500))
@@ -20,9 +26,14 @@ class Video(Base):
         DateTime, default=datetime.utcnow, server_default=func.now()
     )
     image: Mapped[str]
-    comments: Mapped[list["Comment"]] = relationship(
-        back_populates="video", cascade="all, delete"
+    # уменьшенные копии обложки, пишет задача process_image
+    image_variants: Mapped[list[dict[str, Any]] | None] = mapped_column(JSON)
+    hls_status: Mapped[StreamStatus] = mapped_column(
+        default=StreamStatus.PENDING, server_default=StreamStatus.PENDING.name
     )
+    hls_manifest: Mapped[str | None]
+    # комментарии хранит сервис comment, число переносит задача sync_comment_counts
+    comments_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     def __repr__(self) -> str:
         return f"Video - ({self.id}, {self.title})"
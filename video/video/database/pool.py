@@ -0,0 +1,72 @@
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.checkouts if self.checkouts else 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, считающий время ожидания свободного соединения.
+
+    В ожидание входит и pre-ping, то есть всё, что запрос проводит
+    до получения соединения.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.checkouts += 1
+            self.stats.wait_total += waited
+            self.stats.wait_max = max(self.stats.wait_max, waited)
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": self.overflow(),
+            "checkouts": self.stats.checkouts,
+            "timeouts": self.stats.timeouts,
+            "wait_avg": self.stats.wait_avg,
+            "wait_max": self.stats.wait_max,
+        }
+
+
+def asyncpg_connect_args(statement_cache_size: int, pgbouncer: bool) -> dict:
+    """connect_args для asyncpg.
+
+    PgBouncer в режиме transaction/statement не держит серверные
+    prepared statements между транзакциями, поэтому оба кеша
+    выключаются, а имена стейтментов делаются уникальными.
+    """
+    if not pgbouncer:
+        return {"statement_cache_size": statement_cache_size}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
@@ -6,7 +6,12 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import SecretStr
 from redis import asyncio as aioredis
 from redis.backoff import ExponentialBackoff
-from redis.exceptions import BusyLoadingError, ConnectionError, TimeoutError
+from redis.exceptions import (
+    BusyLoadingError,
+    ConnectionError,
+    TimeoutError,
+    WatchError,
+)
 from redis.retry import Retry
 
 from video.core.config import settings
@@ -56,6 +61,14 @@ class RedisDB(RedisDBBase):
         )
         self.expire_in_sec: int = expire_in_sec
 
+    @classmethod
+    def from_client(cls, client: aioredis.Redis, expire_in_sec: int) -> "RedisDB":
+        """Обёртка над готовым клиентом, например fakeredis в тестах"""
+        redis_db = cls.__new__(cls)
+        redis_db.redis = client
+        redis_db.expire_in_sec = expire_in_sec
+        return redis_db
+
     async def set_key(self, key: KEY_STR, value: JSON_TYPE) -> None:
         data: str = json.dumps(jsonable_encoder(value))
         return await self.redis.set(key, data, ex=self.expire_in_sec)
@@ -66,6 +79,8 @@ class RedisDB(RedisDBBase):
 
     async def get_value(self, key: KEY_STR) -> Any:
         data = await self.redis.get(key)
+        if data is None:
+            return None
         return json.loads(data)
 
     async def is_exists(self, key: KEY_STR) -> bool:
@@ -77,8 +92,33 @@ class RedisDB(RedisDBBase):
     async def delete_all(self) -> None:
         return await self.redis.flushall(asynchronous=True)
 
+    async def publish(self, channel: str, message: str) -> int:
+        return await self.redis.publish(channel, message)
 
-async def get_redis() -> RedisDB:
+    async def incr(self, key: KEY_STR) -> int:
+        return await self.redis.incr(key)
+
+    async def acquire_lock(self, key: KEY_STR, token: str, ttl_ms: int) -> bool:
+        return bool(await self.redis.set(key, token, nx=True, px=ttl_ms))
+
+    async def release_lock(self, key: KEY_STR, token: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != token.encode():
+                    await pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+            except WatchError:
+                pass
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_redis() -> RedisDB:
     return RedisDB(
         host=settings.redis.host,
         port=settings.redis.port,
@@ -87,3 +127,10 @@ async def get_redis() -> RedisDB:
         retry=Retry(ExponentialBackoff(), settings.redis.retry),
         errors=[TimeoutError, ConnectionError, BusyLoadingError],
     )
+
+
+redis_db = create_redis()
+
+
+async def get_redis() -> RedisDB:
+    return redis_db
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class UploadSessionSchema(BaseModel):
+    id: str
+    title: str
+    description: str
+    length: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResponseUploadSchema(UploadSessionSchema):
+    offset: int
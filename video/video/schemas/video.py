@@ -1,5 +1,17 @@
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict
 
+from video.database.models.video import StreamStatus
+
+
+class ImageVariantSchema(BaseModel):
+    format: str
+    width: int
+    height: int
+    size: int
+    url: str
+
 
 class CreateVideoSchema(BaseModel):
     title: str
@@ -17,9 +29,33 @@ class UpdateVideoSchema(BaseModel):
 
 class ResponseVideoSchema(BaseModel):
     id: int
-    title: int
+    title: str
     description: str
     file: str
     image: str
+    image_variants: list[ImageVariantSchema] | None = None
+    hls_status: StreamStatus
+    hls_manifest: str | None
+    comments_count: int = 0
 
     model_config = ConfigDict(from_attributes=True, revalidate_instances="always")
+
+
+class VideoListItemSchema(BaseModel):
+    id: int
+    title: str
+    description: str | None = None
+    file: str
+    image: str
+    image_variants: list[ImageVariantSchema] | None = None
+    created_at: datetime
+    hls_status: StreamStatus
+    hls_manifest: str | None
+    comments_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VideoPageSchema(BaseModel):
+    items: list[VideoListItemSchema]
+    next_cursor: str | None
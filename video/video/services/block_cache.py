@@ -0,0 +1,300 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import anyio
+
+from video.services.storage import ObjectInfo, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    served_bytes: int = 0
+    origin_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    @property
+    def origin_saved(self) -> float:
+        """Доля отданных байт, не запрошенных у исходного хранилища"""
+        if not self.served_bytes:
+            return 0.0
+        return 1 - self.origin_bytes / self.served_bytes
+
+
+class BlockCache:
+    """Дисковый LRU-кеш выровненных блоков объектов.
+
+    Объект режется на блоки по block_size байт; блок хранится файлом
+    `<root>/<ab>/<sha1(key)>.<номер>`. Объём ограничен max_bytes, при
+    переполнении удаляются давно не читавшиеся блоки. Промах по блоку
+    загружается из origin ровно одним ranged GET: остальные запросы
+    того же блока ждут общую задачу, которая доводится до конца, даже
+    если первый клиент отключился. Попадания читаются через mmap.
+
+    Индекс блоков живёт в памяти процесса, поэтому каталог cache_root
+    делится между workers процессами приложения: при первом чтении
+    процесс занимает под flock свободный подкаталог `<cache_root>/<номер>`
+    и держит в нём max_bytes / workers байт. Если все подкаталоги заняты,
+    процесс читает origin напрямую.
+    """
+
+    def __init__(
+        self,
+        origin: StorageBackend,
+        root: Path,
+        block_size: int,
+        max_bytes: int,
+        workers: int = 1,
+    ) -> None:
+        self.origin = origin
+        self.cache_root = root
+        self.root: Path | None = None
+        self.workers = workers
+        self.block_size = block_size
+        self.max_bytes = max_bytes // workers
+        self.stats = BlockCacheStats()
+        self.size = 0
+        self._blocks: OrderedDict[str, int] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._slot_lock: BinaryIO | None = None
+
+    @staticmethod
+    def key_digest(key: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def block_path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+    async def read(
+        self, key: str, info: ObjectInfo, start: int, end: int
+    ) -> AsyncIterator[bytes]:
+        """Байты объекта с start по end включительно, поблочно"""
+        await self._ensure_loaded()
+        if self.root is None:
+            async for chunk in self.origin.open_range(key, start, end):
+                self.stats.served_bytes += len(chunk)
+                self.stats.origin_bytes += len(chunk)
+                yield chunk
+            return
+        digest = self.key_digest(key)
+        for index in range(start // self.block_size, end // self.block_size + 1):
+            block_start = index * self.block_size
+            offset = max(start - block_start, 0)
+            stop = min(end, block_start + self.block_size - 1) - block_start + 1
+            chunk = await self._get_block(
+                key, info, f"{digest}.{index}", index, offset, stop
+            )
+            self.stats.served_bytes += len(chunk)
+            yield chunk
+
+    async def _get_block(
+        self, key: str, info: ObjectInfo, name: str, index: int, offset: int, stop: int
+    ) -> bytes:
+        """Срез [offset:stop] блока index"""
+        if name in self._blocks:
+            self._blocks.move_to_end(name)
+            try:
+                data = await anyio.to_thread.run_sync(
+                    self._read_mapped, self.block_path(name), offset, stop
+                )
+            except FileNotFoundError:
+                # файл удалён вне кеша: считаем промахом
+                self._forget(name)
+            else:
+                self.stats.hits += 1
+                return data
+        task = self._inflight.get(name)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._fetch(key, info, name, index), name=name)
+            self._inflight[name] = task
+            task.add_done_callback(self._fetched)
+        data = await asyncio.shield(task)
+        return data[offset:stop]
+
+    def _fetched(self, task: asyncio.Task) -> None:
+        self._inflight.pop(task.get_name(), None)
+        if not task.cancelled():
+            # все ожидающие могли уйти, ошибку забираем здесь
+            task.exception()
+
+    async def _fetch(self, key: str, info: ObjectInfo, name: str, index: int) -> bytes:
+        start = index * self.block_size
+        end = min(start + self.block_size, info.size) - 1
+        data = bytearray()
+        async for chunk in self.origin.open_range(key, start, end):
+            data += chunk
+        self.stats.origin_bytes += len(data)
+        data = bytes(data)
+        await anyio.to_thread.run_sync(self._write_block, self.block_path(name), data)
+        self._blocks[name] = len(data)
+        self.size += len(data)
+        await self._evict()
+        return data
+
+    async def _evict(self) -> None:
+        victims = []
+        while self.size > self.max_bytes and len(self._blocks) > 1:
+            name, size = self._blocks.popitem(last=False)
+            self.size -= size
+            victims.append(self.block_path(name))
+        if victims:
+            self.stats.evictions += len(victims)
+            await anyio.to_thread.run_sync(self._unlink, victims)
+
+    def _forget(self, name: str) -> None:
+        self.size -= self._blocks.pop(name, 0)
+
+    async def invalidate(self, key: str) -> None:
+        """Удаляет все блоки объекта"""
+        prefix = f"{self.key_digest(key)}."
+        names = [name for name in self._blocks if name.startswith(prefix)]
+        for name in names:
+            self._forget(name)
+        await anyio.to_thread.run_sync(
+            self._unlink, [self.block_path(name) for name in names]
+        )
+
+    async def _ensure_loaded(self) -> None:
+        """Восстанавливает индекс по файлам, оставшимся от прошлого запуска"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self.root = await anyio.to_thread.run_sync(self._claim_slot)
+            if self.root is not None:
+                for name, size in await anyio.to_thread.run_sync(self._scan):
+                    if name not in self._blocks:
+                        self._blocks[name] = size
+                        self._blocks.move_to_end(name, last=False)
+                        self.size += size
+            self._loaded = True
+        await self._evict()
+
+    def _claim_slot(self) -> Path | None:
+        """Занимает свободный подкаталог кеша до конца жизни процесса"""
+        self.cache_root.mkdir(parents=True, exist_ok=True)
+        for slot in range(self.workers):
+            lock = open(self.cache_root / f"{slot}.lock", "wb")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                continue
+            # flock снимается, когда файл закрывается или процесс завершается
+            self._slot_lock = lock
+            return self.cache_root / str(slot)
+        logger.warning(
+            "Все %s каталогов кеша %s заняты, блоки читаются из origin; "
+            "увеличьте storage_cache_workers",
+            self.workers,
+            self.cache_root,
+        )
+        return None
+
+    def _scan(self) -> list[tuple[str, int]]:
+        if not self.root.exists():
+            return []
+        found = []
+        for path in self.root.glob("*/*"):
+            if path.name.startswith("."):
+                # недописанный блок прошлого владельца: пока подкаталог
+                # занят, в него пишет только этот процесс
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            found.append((stat.st_atime, path.name, stat.st_size))
+        # самые свежие — первыми, move_to_end(last=False) развернёт порядок
+        found.sort(reverse=True)
+        return [(name, size) for _, name, size in found]
+
+    @staticmethod
+    def _read_mapped(path: Path, offset: int, stop: int) -> bytes:
+        # копируется только нужный срез, остальное не покидает page cache
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[offset:stop]
+
+    @staticmethod
+    def _write_block(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.part")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+class CachedStorage(StorageBackend):
+    """Удалённое хранилище с локальным кешем блоков для чтения диапазонов.
+
+    Объекты неизменяемы (ключ — хеш содержимого), поэтому метаданные
+    из stat тоже держатся в памяти; delete сбрасывает и их, и блоки.
+    """
+
+    def __init__(
+        self, origin: StorageBackend, cache: BlockCache, max_stat_entries: int = 10000
+    ) -> None:
+        self.origin = origin
+        self.cache = cache
+        self.max_stat_entries = max_stat_entries
+        self._stats: OrderedDict[str, ObjectInfo] = OrderedDict()
+
+    async def exists(self, key: str) -> bool:
+        return await self.origin.exists(key)
+
+    async def put_file(self, key: str, source: Path) -> None:
+        await self.origin.put_file(key, source)
+
+    async def get_file(self, key: str, destination: Path) -> None:
+        await self.origin.get_file(key, destination)
+
+    async def delete(self, key: str) -> None:
+        self._stats.pop(key, None)
+        await self.cache.invalidate(key)
+        await self.origin.delete(key)
+
+    async def stat(self, key: str) -> ObjectInfo:
+        info = self._stats.get(key)
+        if info is not None:
+            self._stats.move_to_end(key)
+            return info
+        info = await self.origin.stat(key)
+        self._stats[key] = info
+        while len(self._stats) > self.max_stat_entries:
+            self._stats.popitem(last=False)
+        return info
+
+    async def open_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        info = await self.stat(key)
+        async for chunk in self.cache.read(key, info, start, min(end, info.size - 1)):
+            yield chunk
+
+    async def close(self) -> None:
+        await self.origin.close()
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from redis.exceptions import RedisError
+from video.core.config import settings
+from video.database.redis_cache import RedisDB, redis_db
+
+logger = logging.getLogger(__name__)
+
+VIDEO_KEY = "video:{video_id}"
+VIDEO_LIST_KEY = "video:list:{generation}:{page}"
+VIDEO_LIST_GENERATION_KEY = "video:list:generation"
+VIDEO_LIST_PREFIX = "video:list:"
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    lock_waits: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.local_hits + self.hits + self.misses
+        return (self.local_hits + self.hits) / total if total else 0.0
+
+
+class LocalCache:
+    """LRU в памяти процесса с TTL и ограничением числа записей"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VideoCache:
+    """Двухуровневый read-through кеш метаданных видео.
+
+    Первый уровень — LocalCache в памяти воркера, второй — RedisDB.
+    Промах загружается ровно одним вызовом loader: внутри процесса
+    конкурентные запросы ждут общий Future (если загружавший запрос
+    отменён, загрузку повторяет один из ждущих), между процессами —
+    короткую блокировку `<key>:lock` в Redis. Инвалидация рассылается
+    остальным воркерам через Redis pub/sub.
+
+    Недоступность Redis не ломает чтение и запись: значение берётся
+    из loader без общего кеша, а инвалидация только пишется в лог.
+    """
+
+    def __init__(
+        self,
+        redis: RedisDB,
+        local: LocalCache | None = None,
+        channel: str = settings.cache.invalidation_channel,
+        lock_ttl_ms: int = 5000,
+        lock_poll_interval: float = 0.05,
+    ) -> None:
+        self.redis = redis
+        self.local = local
+        self.channel = channel
+        self.lock_ttl_ms = lock_ttl_ms
+        self.lock_poll_interval = lock_poll_interval
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not MISSING:
+                self.stats.local_hits += 1
+                return value
+        try:
+            value = await self.redis.get_value(key)
+        except RedisError:
+            self._redis_failed("чтение", key)
+            value = None
+        if value is not None:
+            self.stats.hits += 1
+            self._set_local(key, value)
+            return value
+        self.stats.misses += 1
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # отменили запрос, который загружал значение, а не этот:
+                # загружаем сами (или ждём того, кто успел раньше)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load_locked(key, loader)
+            self._set_local(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            # исключение уже отдано вызывающему, ожидающих может не быть
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_locked(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.acquire_lock(lock_key, token, self.lock_ttl_ms)
+        except RedisError:
+            self._redis_failed("блокировка", lock_key)
+            return await self._load(key, loader)
+        if not acquired:
+            self.stats.lock_waits += 1
+            deadline = asyncio.get_running_loop().time() + self.lock_ttl_ms / 1000
+            try:
+                while asyncio.get_running_loop().time() < deadline:
+                    await asyncio.sleep(self.lock_poll_interval)
+                    value = await self.redis.get_value(key)
+                    if value is not None:
+                        return value
+                    if await self.redis.acquire_lock(lock_key, token, self.lock_ttl_ms):
+                        break
+                else:
+                    return await self._load(key, loader)
+            except RedisError:
+                self._redis_failed("ожидание блокировки", lock_key)
+                return await self._load(key, loader)
+        try:
+            return await self._load(key, loader)
+        finally:
+            try:
+                await self.redis.release_lock(lock_key, token)
+            except RedisError:
+                # блокировка истечёт сама через lock_ttl_ms
+                self._redis_failed("снятие блокировки", lock_key)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats.loads += 1
+        value = await loader()
+        if value is not None:
+            try:
+                await self.redis.set_key(key, value)
+            except RedisError:
+                self._redis_failed("запись", key)
+        return value
+
+    def metrics(self) -> dict[str, float]:
+        """Попадания по уровням, загрузки, ожидания блокировки и ошибки Redis"""
+        return {
+            **asdict(self.stats),
+            "hit_ratio": self.stats.hit_ratio,
+            "local_size": len(self.local) if self.local is not None else 0,
+        }
+
+    def _redis_failed(self, operation: str, key: str) -> None:
+        self.stats.redis_errors += 1
+        logger.warning("Redis недоступен (%s %s), работаем без кеша", operation, key)
+
+    def _set_local(self, key: str, value: Any) -> None:
+        if self.local is not None and value is not None:
+            self.local.set(key, value)
+
+    async def get_video(
+        self, video_id: int, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        return await self.get_or_load(VIDEO_KEY.format(video_id=video_id), loader)
+
+    async def get_video_list(
+        self, page: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            generation = await self.redis.get_value(VIDEO_LIST_GENERATION_KEY) or 0
+        except RedisError:
+            # без поколения нельзя понять, свежа ли страница в LocalCache
+            self._redis_failed("чтение", VIDEO_LIST_GENERATION_KEY)
+            return await loader()
+        key = VIDEO_LIST_KEY.format(generation=generation, page=page)
+        return await self.get_or_load(key, loader)
+
+    async def invalidate_video(self, video_id: int) -> None:
+        key = VIDEO_KEY.format(video_id=video_id)
+        self._evict(key)
+        try:
+            await self.redis.delete_key(key)
+            await self.redis.publish(self.channel, key)
+        except RedisError:
+            self._redis_failed("инвалидация", key)
+        await self.invalidate_lists()
+
+    async def invalidate_lists(self) -> None:
+        """Старые страницы списков становятся недостижимы и истекают по TTL"""
+        self._evict(VIDEO_LIST_PREFIX)
+        try:
+            await self.redis.incr(VIDEO_LIST_GENERATION_KEY)
+            await self.redis.publish(self.channel, VIDEO_LIST_PREFIX)
+        except RedisError:
+            self._redis_failed("инвалидация", VIDEO_LIST_PREFIX)
+
+    def _evict(self, key: str) -> None:
+        if self.local is None:
+            return
+        if key.endswith(":"):
+            self.local.delete_prefix(key)
+        else:
+            self.local.delete(key)
+
+    async def listen_invalidations(self, reconnect_delay: float = 1.0) -> None:
+        """Фоновая задача воркера: вычищает LocalCache по сообщениям других процессов"""
+        while True:
+            pubsub = self.redis.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # пока подписки не было, сообщения могли потеряться
+                if self.local is not None:
+                    self.local.clear()
+                async for message in pubsub.listen():
+                    self._evict(message["data"].decode())
+            except RedisError:
+                logger.warning("Подписка на инвалидацию кеша потеряна, переподключение")
+                await asyncio.sleep(reconnect_delay)
+            finally:
+                await pubsub.aclose()
+
+
+video_cache = VideoCache(
+    redis_db,
+    local=LocalCache(
+        maxsize=settings.cache.local_maxsize, ttl=settings.cache.local_ttl
+    ),
+)
+
+
+async def get_video_cache() -> VideoCache:
+    return video_cache
@@ -0,0 +1,44 @@
+import os
+import secrets
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import anyio
+from fastapi import UploadFile
+
+from video.core.config import settings
+
+
+def temp_path_for(destination: Path) -> Path:
+    return destination.with_name(f".{destination.name}.{secrets.token_hex(8)}.part")
+
+
+async def save_upload(
+    upload: UploadFile,
+    destination: Path,
+    chunk_size: int = settings.media.chunk_size,
+    on_chunk: Callable[[bytes], Any] | None = None,
+) -> int:
+    """Потоково пишет UploadFile во временный файл рядом с destination
+    и атомарно переименовывает его. Возвращает число записанных байт.
+
+    on_chunk получает каждый записанный кусок, например для хеширования.
+    """
+    await anyio.Path(destination.parent).mkdir(parents=True, exist_ok=True)
+    temp_path = temp_path_for(destination)
+    written = 0
+    try:
+        async with await anyio.open_file(temp_path, "wb") as buffer:
+            while chunk := await upload.read(chunk_size):
+                await buffer.write(chunk)
+                written += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+            await buffer.flush()
+            await anyio.to_thread.run_sync(os.fsync, buffer.wrapped.fileno())
+        await anyio.Path(temp_path).replace(destination)
+    except BaseException:
+        await anyio.Path(temp_path).unlink(missing_ok=True)
+        raise
+    return written
@@ -0,0 +1,108 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import anyio
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from video.core.config import settings
+from video.crud.media import MediaObjectDAL
+from video.services.media import save_upload
+from video.services.storage import StorageBackend, storage
+
+
+def content_key(digest: str, extension: str) -> str:
+    """`ab/cd/<sha256><extension>`: два уровня каталогов по префиксу хеша"""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def hash_file(path: Path, chunk_size: int = settings.media.chunk_size) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """Контентно-адресуемое хранилище медиафайлов.
+
+    Ключ объекта — sha256 содержимого, поэтому одинаковые загрузки
+    превращаются в один объект с несколькими ссылками в media_object,
+    а разные загрузки с одним названием не перетирают друг друга.
+    Файл сначала принимается в staging-каталог, затем передаётся
+    StorageBackend, если такого объекта ещё нет.
+    """
+
+    def __init__(self, backend: StorageBackend, staging_dir: Path) -> None:
+        self.backend = backend
+        self.staging_dir = staging_dir
+
+    def staging_path(self) -> Path:
+        return self.staging_dir / f".{secrets.token_hex(8)}.staged"
+
+    async def save_upload(
+        self, session: AsyncSession, upload: UploadFile, extension: str
+    ) -> str:
+        """Принимает UploadFile, считая хеш по ходу записи, и возвращает ключ"""
+        staged = self.staging_path()
+        digest = hashlib.sha256()
+        try:
+            size = await save_upload(upload, staged, on_chunk=digest.update)
+            return await self._store(
+                session, staged, digest.hexdigest(), size, extension
+            )
+        finally:
+            await anyio.Path(staged).unlink(missing_ok=True)
+
+    async def add_file(self, session: AsyncSession, path: Path, extension: str) -> str:
+        """Сохраняет уже лежащий на диске файл (докачанную загрузку).
+
+        Файл остаётся у вызывающего: без него загрузку нельзя было бы
+        повторить, если запись в БД дальше не удастся.
+        """
+        digest = await anyio.to_thread.run_sync(hash_file, path)
+        size = (await anyio.Path(path).stat()).st_size
+        return await self._store(session, path, digest, size, extension)
+
+    async def _store(
+        self, session: AsyncSession, path: Path, digest: str, size: int, extension: str
+    ) -> str:
+        key = content_key(digest, extension)
+        dal = MediaObjectDAL(session)
+        # ссылка раньше объекта: сборщик мусора не удалит его у нас из-под ног
+        await dal.acquire(key, size)
+        try:
+            if not await self.backend.exists(key):
+                await self.backend.put_file(key, path)
+        except BaseException:
+            await dal.release([key])
+            raise
+        return key
+
+    async def release(self, session: AsyncSession, keys: list[str]) -> None:
+        await MediaObjectDAL(session).release(keys)
+
+    async def collect_garbage(
+        self, session: AsyncSession, grace: int, batch_size: int = 100
+    ) -> int:
+        """Удаляет объекты, оставшиеся без ссылок дольше grace секунд"""
+        dal = MediaObjectDAL(session)
+        released_before = datetime.utcnow() - timedelta(seconds=grace)
+        collected = 0
+        while keys := await dal.lock_garbage(released_before, batch_size):
+            for key in keys:
+                await self.backend.delete(key)
+            await dal.delete(keys)
+            await session.commit()
+            collected += len(keys)
+        return collected
+
+
+media_store = MediaStore(storage, settings.media.uploads_dir)
+
+
+async def get_media_store() -> MediaStore:
+    return media_store
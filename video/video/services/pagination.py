@@ -0,0 +1,21 @@
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, video_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{video_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, video_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(video_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor"
+        )
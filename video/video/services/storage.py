@@ -0,0 +1,297 @@
+import asyncio
+import errno
+import os
+import shutil
+from abc import ABCMeta, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+
+from video.core.config import settings
+
+NOT_FOUND_CODES = ("404", "NoSuchKey")
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """Метаданные объекта для условных и Range-запросов"""
+
+    size: int
+    etag: str
+    modified: float
+
+
+class StorageBackend(metaclass=ABCMeta):
+    """Хранилище неизменяемых объектов по ключу.
+
+    MediaStore работает только через этот интерфейс, поэтому локальный
+    диск и S3-совместимое хранилище проходят один и тот же путь.
+    """
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def put_file(self, key: str, source: Path) -> None:
+        """Кладёт готовый локальный файл под key; source остаётся у вызывающего"""
+
+    @abstractmethod
+    async def get_file(self, key: str, destination: Path) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def stat(self, key: str) -> ObjectInfo:
+        """FileNotFoundError, если объекта нет"""
+
+    @abstractmethod
+    def open_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Поток байт объекта с start по end включительно"""
+
+    def local_path(self, key: str) -> Path | None:
+        """Путь к объекту на локальном диске, если хранилище локальное"""
+        return None
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalStorage(StorageBackend):
+    """Объекты — файлы `<root>/<key>`.
+
+    Файл из staging-каталога на той же файловой системе добавляется
+    жёсткой ссылкой, без копирования данных.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def local_path(self, key: str) -> Path:
+        return self.root / key
+
+    async def exists(self, key: str) -> bool:
+        return await anyio.Path(self.local_path(key)).exists()
+
+    async def put_file(self, key: str, source: Path) -> None:
+        await anyio.to_thread.run_sync(self._link, source, self.local_path(key))
+
+    async def get_file(self, key: str, destination: Path) -> None:
+        await anyio.to_thread.run_sync(self._link, self.local_path(key), destination)
+
+    async def delete(self, key: str) -> None:
+        await anyio.Path(self.local_path(key)).unlink(missing_ok=True)
+
+    async def stat(self, key: str) -> ObjectInfo:
+        stat = await anyio.Path(self.local_path(key)).stat()
+        return ObjectInfo(
+            size=stat.st_size,
+            etag=f'"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            modified=stat.st_mtime,
+        )
+
+    async def open_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        # pread по смещению: один системный вызов на кусок, без seek
+        fd = await anyio.to_thread.run_sync(os.open, self.local_path(key), os.O_RDONLY)
+        try:
+            position = start
+            while position <= end:
+                size = min(settings.media.chunk_size, end - position + 1)
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, size, position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                yield chunk
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _link(source: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            # тот же ключ — то же содержимое
+            pass
+        except OSError as error:
+            if error.errno != errno.EXDEV:
+                raise
+            temporary = target.with_name(f".{target.name}.{os.getpid()}.part")
+            shutil.copyfile(source, temporary)
+            os.replace(temporary, target)
+
+
+class S3Storage(StorageBackend):
+    """Объекты в бакете S3-совместимого хранилища (S3, MinIO).
+
+    Клиент создаётся при первом обращении и живёт до close(), держа
+    пул из max_connections HTTP-соединений; файлы больше part_size
+    загружаются multipart-загрузкой частями, чтение диапазонов идёт
+    ranged GET.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None,
+        region: str,
+        access_key: str,
+        secret_key: str,
+        part_size: int,
+        max_connections: int,
+    ) -> None:
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.part_size = part_size
+        self.max_connections = max_connections
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+
+    async def client(self):
+        if self._client is not None:
+            return self._client
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await self._exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        region_name=self.region,
+                        aws_access_key_id=self.access_key or None,
+                        aws_secret_access_key=self.secret_key or None,
+                        config=AioConfig(max_pool_connections=self.max_connections),
+                    )
+                )
+        return self._client
+
+    async def exists(self, key: str) -> bool:
+        client = await self.client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as error:
+            if error.response["Error"]["Code"] in NOT_FOUND_CODES:
+                return False
+            raise
+        return True
+
+    async def put_file(self, key: str, source: Path) -> None:
+        client = await self.client()
+        size = (await anyio.Path(source).stat()).st_size
+        async with await anyio.open_file(source, "rb") as file:
+            if size <= self.part_size:
+                await client.put_object(
+                    Bucket=self.bucket, Key=key, Body=await file.read()
+                )
+                return
+            upload = await client.create_multipart_upload(Bucket=self.bucket, Key=key)
+            parts = []
+            try:
+                while chunk := await file.read(self.part_size):
+                    part = await client.upload_part(
+                        Bucket=self.bucket,
+                        Key=key,
+                        UploadId=upload["UploadId"],
+                        PartNumber=len(parts) + 1,
+                        Body=chunk,
+                    )
+                    parts.append({"ETag": part["ETag"], "PartNumber": len(parts) + 1})
+                await client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload["UploadId"],
+                    MultipartUpload={"Parts": parts},
+                )
+            except BaseException:
+                await client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=upload["UploadId"]
+                )
+                raise
+
+    async def get_file(self, key: str, destination: Path) -> None:
+        client = await self.client()
+        response = await client.get_object(Bucket=self.bucket, Key=key)
+        await anyio.Path(destination.parent).mkdir(parents=True, exist_ok=True)
+        async with response["Body"] as body:
+            async with await anyio.open_file(destination, "wb") as file:
+                while chunk := await body.read(settings.media.chunk_size):
+                    await file.write(chunk)
+
+    async def delete(self, key: str) -> None:
+        client = await self.client()
+        await client.delete_object(Bucket=self.bucket, Key=key)
+
+    async def stat(self, key: str) -> ObjectInfo:
+        client = await self.client()
+        try:
+            head = await client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as error:
+            if error.response["Error"]["Code"] in NOT_FOUND_CODES:
+                raise FileNotFoundError(key) from error
+            raise
+        return ObjectInfo(
+            size=head["ContentLength"],
+            etag=head["ETag"],
+            modified=head["LastModified"].timestamp(),
+        )
+
+    async def open_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        client = await self.client()
+        response = await client.get_object(
+            Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        async with response["Body"] as body:
+            while chunk := await body.read(settings.media.chunk_size):
+                yield chunk
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
+
+
+def create_storage() -> StorageBackend:
+    if settings.storage.backend == "s3":
+        origin = S3Storage(
+            bucket=settings.storage.s3_bucket,
+            endpoint_url=settings.storage.s3_endpoint_url,
+            region=settings.storage.s3_region,
+            access_key=settings.storage.s3_access_key.get_secret_value(),
+            secret_key=settings.storage.s3_secret_key.get_secret_value(),
+            part_size=settings.storage.s3_part_size,
+            max_connections=settings.storage.s3_max_connections,
+        )
+        if not settings.storage.cache_max_bytes:
+            return origin
+        # block_cache сам импортирует этот модуль
+        from video.services.block_cache import BlockCache, CachedStorage
+
+        return CachedStorage(
+            origin,
+            BlockCache(
+                origin,
+                root=settings.storage.cache_root,
+                block_size=settings.storage.cache_block_size,
+                max_bytes=settings.storage.cache_max_bytes,
+                workers=settings.storage.cache_workers,
+            ),
+        )
+    return LocalStorage(settings.storage.root)
+
+
+storage = create_storage()
+
+
+async def get_storage() -> StorageBackend:
+    return storage
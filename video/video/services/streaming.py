@@ -0,0 +1,326 @@
+import re
+import secrets
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+import anyio
+from fastapi import HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from video.services.storage import StorageBackend
+
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+MAX_RANGES = 16
+RANGE_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Диапазон байт, end включительно (как в Content-Range)"""
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, filesize: int) -> str:
+        return f"bytes {self.start}-{self.end}/{filesize}"
+
+
+def parse_ranges(range_header: str | None, filesize: int) -> list[ByteRange] | None:
+    """Разбор заголовка Range: `bytes=a-b`, `bytes=a-`, `bytes=-n` и их списков.
+
+    None означает, что отдавать нужно весь файл (заголовка нет
+    или он синтаксически некорректен и по RFC 9110 игнорируется).
+    Пересекающиеся и смежные диапазоны склеиваются.
+    """
+    if not range_header:
+        return None
+    unit, _, specs = range_header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+    specs = [spec for spec in specs.split(",") if spec.strip()]
+    if not specs or len(specs) > MAX_RANGES:
+        return None
+    ranges: list[ByteRange] = []
+    for spec in specs:
+        match = RANGE_RE.match(spec)
+        if match is None:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            suffix = int(last)
+            if suffix > 0 and filesize > 0:
+                ranges.append(ByteRange(max(filesize - suffix, 0), filesize - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else None
+        if end is not None and end < start:
+            return None
+        if start < filesize:
+            last_byte = filesize - 1 if end is None else min(end, filesize - 1)
+            ranges.append(ByteRange(start, last_byte))
+    if not ranges:
+        raise_not_satisfiable(filesize)
+    return coalesce(ranges)
+
+
+def coalesce(ranges: list[ByteRange]) -> list[ByteRange]:
+    if len(ranges) == 1:
+        return ranges
+    merged: list[ByteRange] = []
+    for byte_range in sorted(ranges, key=lambda item: item.start):
+        if merged and byte_range.start <= merged[-1].end + 1:
+            last = merged.pop()
+            byte_range = ByteRange(last.start, max(last.end, byte_range.end))
+        merged.append(byte_range)
+    return merged
+
+
+def raise_not_satisfiable(filesize: int) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Запрошенный диапазон за пределами файла",
+        headers={"Content-Range": f"bytes */{filesize}"},
+    )
+
+
+def parse_etags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def strong_match(header: str, etag: str) -> bool:
+    return any(
+        tag == "*" or (not tag.startswith("W/") and tag == etag)
+        for tag in parse_etags(header)
+    )
+
+
+def weak_match(header: str, etag: str) -> bool:
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag for tag in parse_etags(header)
+    )
+
+
+def parse_http_date(value: str) -> int | None:
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def evaluate_preconditions(
+    headers: Mapping[str, str], etag: str, mtime: int
+) -> int | None:
+    """Проверка условных заголовков по RFC 9110 §13.2.2.
+
+    Возвращает 304/412, если ответ должен быть без тела, иначе None.
+    """
+    if_match = headers.get("if-match")
+    if if_match is not None:
+        if not strong_match(if_match, etag):
+            return status.HTTP_412_PRECONDITION_FAILED
+    elif (since := headers.get("if-unmodified-since")) is not None:
+        date = parse_http_date(since)
+        if date is not None and mtime > date:
+            return status.HTTP_412_PRECONDITION_FAILED
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if weak_match(if_none_match, etag):
+            return status.HTTP_304_NOT_MODIFIED
+    elif (since := headers.get("if-modified-since")) is not None:
+        date = parse_http_date(since)
+        if date is not None and mtime <= date:
+            return status.HTTP_304_NOT_MODIFIED
+    return None
+
+
+def if_range_allows(headers: Mapping[str, str], etag: str, last_modified: str) -> bool:
+    if_range = headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return if_range == last_modified
+
+
+class SendfileResponse(StreamingResponse):
+    """Один диапазон локального файла.
+
+    Если ASGI-сервер объявляет расширение http.response.zerocopy, тело
+    уходит через sendfile прямо из дескриптора файла; иначе читается
+    итератором content, как в обычном StreamingResponse.
+    """
+
+    def __init__(
+        self,
+        content: AsyncIterator[bytes],
+        path: Path,
+        start: int,
+        length: int,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(content, **kwargs)
+        self.path = path
+        self.start = start
+        self.length = length
+        self.zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def stream_response(self, send: Send) -> None:
+        if not self.zerocopy:
+            await super().stream_response(send)
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        async with await anyio.open_file(self.path, "rb") as file:
+            await send(
+                {
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file.wrapped,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                }
+            )
+
+
+def multipart_headers(
+    ranges: list[ByteRange], filesize: int, boundary: str, media_type: str
+) -> list[bytes]:
+    return [
+        (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: {byte_range.content_range(filesize)}\r\n\r\n"
+        ).encode()
+        for byte_range in ranges
+    ]
+
+
+async def iter_multipart(
+    storage: StorageBackend,
+    key: str,
+    ranges: list[ByteRange],
+    part_headers: list[bytes],
+    closing: bytes,
+) -> AsyncIterator[bytes]:
+    for byte_range, part_header in zip(ranges, part_headers):
+        yield part_header
+        async for chunk in storage.open_range(key, byte_range.start, byte_range.end):
+            yield chunk
+        yield b"\r\n"
+    yield closing
+
+
+def single_range_response(
+    storage: StorageBackend,
+    key: str,
+    byte_range: ByteRange,
+    status_code: int,
+    headers: dict[str, str],
+    media_type: str,
+) -> Response:
+    content = storage.open_range(key, byte_range.start, byte_range.end)
+    path = storage.local_path(key)
+    if path is None:
+        return StreamingResponse(
+            content, status_code=status_code, headers=headers, media_type=media_type
+        )
+    return SendfileResponse(
+        content,
+        path,
+        byte_range.start,
+        byte_range.length,
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+async def range_response(
+    storage: StorageBackend,
+    key: str,
+    request_headers: Mapping[str, str],
+    media_type: str = "video/mp4",
+) -> Response:
+    try:
+        info = await storage.stat(key)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="video file not found"
+        )
+    filesize = info.size
+    etag = info.etag
+    last_modified = formatdate(info.modified, usegmt=True)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": last_modified,
+    }
+
+    precondition = evaluate_preconditions(request_headers, etag, int(info.modified))
+    if precondition is not None:
+        return Response(status_code=precondition, headers=headers)
+
+    ranges = None
+    if if_range_allows(request_headers, etag, last_modified):
+        ranges = parse_ranges(request_headers.get("range"), filesize)
+
+    if ranges is None:
+        headers["Content-Length"] = str(filesize)
+        if filesize == 0:
+            return Response(headers=headers, media_type=media_type)
+        return single_range_response(
+            storage,
+            key,
+            ByteRange(0, filesize - 1),
+            status.HTTP_200_OK,
+            headers,
+            media_type,
+        )
+
+    if len(ranges) == 1:
+        byte_range = ranges[0]
+        headers["Content-Length"] = str(byte_range.length)
+        headers["Content-Range"] = byte_range.content_range(filesize)
+        return single_range_response(
+            storage,
+            key,
+            byte_range,
+            status.HTTP_206_PARTIAL_CONTENT,
+            headers,
+            media_type,
+        )
+
+    boundary = secrets.token_hex(16)
+    part_headers = multipart_headers(ranges, filesize, boundary, media_type)
+    closing = f"--{boundary}--\r\n".encode()
+    body_length = sum(
+        len(part) + byte_range.length + 2
+        for part, byte_range in zip(part_headers, ranges)
+    )
+    headers["Content-Length"] = str(body_length + len(closing))
+    return StreamingResponse(
+        iter_multipart(storage, key, ranges, part_headers, closing),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+    )
@@ -0,0 +1,65 @@
+import hashlib
+import io
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+# формат Pillow, расширение файла и параметры кодирования
+IMAGE_FORMATS = {
+    "jpeg": ("JPEG", "jpg", {"optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", {"method": 4}),
+}
+
+
+def store_content(data: bytes, output_dir: Path, extension: str) -> str:
+    """Пишет файл под именем из хеша содержимого и возвращает путь от output_dir.
+
+    Одинаковые картинки дают один файл, а имя меняется вместе
+    с содержимым, поэтому файлы можно отдавать как immutable.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    name = f"{digest[:2]}/{digest}.{extension}"
+    target = output_dir / name
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, target)
+    return name
+
+
+def render_variants(
+    source: str | Path, output_dir: str | Path, widths: Sequence[int], quality: int
+) -> list[dict[str, Any]]:
+    """Уменьшенные копии обложки во всех ширинах и форматах IMAGE_FORMATS.
+
+    Картинка не увеличивается: ширины больше исходной сводятся к ней.
+    JPEG декодируется сразу в уменьшенном масштабе (draft), так что
+    многомегапиксельный оригинал не распаковывается целиком.
+    """
+    output_dir = Path(output_dir)
+    largest = max(widths)
+    with Image.open(source) as original:
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    variants = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for image_format, (pillow_format, extension, options) in IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, pillow_format, quality=quality, **options)
+            data = buffer.getvalue()
+            variants.append(
+                {
+                    "format": image_format,
+                    "width": width,
+                    "height": height,
+                    "size": len(data),
+                    "name": store_content(data, output_dir, extension),
+                }
+            )
+    return variants
@@ -0,0 +1,214 @@
+import fcntl
+import os
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import anyio
+from fastapi import HTTPException, status
+
+from video.core.config import settings
+from video.schemas.upload import ResponseUploadSchema, UploadSessionSchema
+
+SESSION_FILE_RE = re.compile(r"^([0-9a-f]{32})\.(json|part|lock)$")
+# временные файлы MediaStore и local_media в том же каталоге
+TEMPORARY_FILE_RE = re.compile(r"^\.[0-9a-f]+\.(staged|fetched)$")
+
+
+class UploadStore:
+    """Состояние докачиваемых загрузок на локальном диске.
+
+    Для каждой сессии хранится `<id>.json` с метаданными и `<id>.part`
+    с уже принятыми байтами; текущий offset равен размеру `.part`,
+    поэтому он переживает рестарт воркера и не требует отдельной записи.
+    Изменения сессии идут под flock на `<id>.lock`, общий для всех
+    процессов с этим каталогом. Сессия, в которую не писали дольше
+    expire секунд, удаляется в remove_expired.
+    """
+
+    def __init__(self, directory: Path, max_size: int, expire: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.expire = expire
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.json"
+
+    def data_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.part"
+
+    def _lock_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.lock"
+
+    @asynccontextmanager
+    async def _lock(self, upload_id: str) -> AsyncIterator[None]:
+        """Эксклюзивный доступ к сессии без ожидания.
+
+        Второй запрос к той же загрузке, в этом или другом процессе,
+        сразу получает 423, а не держит поток в ожидании блокировки.
+        """
+        try:
+            fd = await anyio.to_thread.run_sync(
+                os.open, self._lock_path(upload_id), os.O_RDWR
+            )
+        except (FileNotFoundError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="upload not found"
+            )
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(
+                    status_code=status.HTTP_423_LOCKED,
+                    detail="Загрузка занята другим запросом",
+                )
+            yield
+        finally:
+            # закрытие дескриптора снимает flock
+            os.close(fd)
+
+    async def create(
+        self, title: str, description: str, length: int
+    ) -> ResponseUploadSchema:
+        if length <= 0 or length > self.max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Недопустимый размер загрузки",
+            )
+        await anyio.Path(self.directory).mkdir(parents=True, exist_ok=True)
+        upload = UploadSessionSchema(
+            id=uuid.uuid4().hex,
+            title=title,
+            description=description,
+            length=length,
+            created_at=datetime.utcnow(),
+        )
+        await anyio.Path(self._lock_path(upload.id)).touch()
+        await anyio.Path(self.data_path(upload.id)).touch()
+        await anyio.Path(self._meta_path(upload.id)).write_text(
+            upload.model_dump_json()
+        )
+        return ResponseUploadSchema(**upload.model_dump(), offset=0)
+
+    async def get(self, upload_id: str) -> ResponseUploadSchema:
+        try:
+            raw = await anyio.Path(self._meta_path(upload_id)).read_text()
+            stat = await anyio.Path(self.data_path(upload_id)).stat()
+        except (FileNotFoundError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="upload not found"
+            )
+        upload = UploadSessionSchema.model_validate_json(raw)
+        return ResponseUploadSchema(**upload.model_dump(), offset=stat.st_size)
+
+    async def append(
+        self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        """Дописывает тело PATCH-запроса начиная с offset, возвращает новый offset"""
+        async with self._lock(upload_id):
+            upload = await self.get(upload_id)
+            if offset != upload.offset:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload-Offset не совпадает с текущим смещением",
+                    headers={"Upload-Offset": str(upload.offset)},
+                )
+            written = upload.offset
+            async with await anyio.open_file(self.data_path(upload_id), "ab") as part:
+                try:
+                    async for chunk in chunks:
+                        if written + len(chunk) > upload.length:
+                            raise HTTPException(
+                                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail="Данных больше, чем заявлено в Upload-Length",
+                            )
+                        await part.write(chunk)
+                        written += len(chunk)
+                finally:
+                    # принятое до обрыва соединения остаётся на диске
+                    await part.flush()
+                    await anyio.to_thread.run_sync(os.fsync, part.wrapped.fileno())
+            return written
+
+    @asynccontextmanager
+    async def completing(self, upload_id: str) -> AsyncIterator[ResponseUploadSchema]:
+        """Полностью принятая загрузка под блокировкой на время её сохранения.
+
+        Байты читаются из `data_path` на месте. Сессия удаляется, только
+        если блок завершился без ошибки; иначе загрузка остаётся как была,
+        и клиент может повторить завершение.
+        """
+        async with self._lock(upload_id):
+            upload = await self.get(upload_id)
+            if upload.offset != upload.length:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Загрузка ещё не завершена",
+                    headers={"Upload-Offset": str(upload.offset)},
+                )
+            yield upload
+            await anyio.to_thread.run_sync(self._remove_files, upload_id)
+
+    async def delete(self, upload_id: str) -> None:
+        async with self._lock(upload_id):
+            await self.get(upload_id)
+            await anyio.to_thread.run_sync(self._remove_files, upload_id)
+
+    def _remove_files(self, upload_id: str) -> None:
+        # .lock последним: пока он есть, сессию не заберёт другой процесс
+        for path in (
+            self.data_path(upload_id),
+            self._meta_path(upload_id),
+            self._lock_path(upload_id),
+        ):
+            path.unlink(missing_ok=True)
+
+    def remove_expired(self) -> int:
+        """Удаляет брошенные сессии и забытые временные файлы.
+
+        Время последней активности сессии — самый поздний mtime её
+        файлов; занятые сессии пропускаются. Синхронный метод для
+        Celery-задачи, возвращает число удалённых сессий.
+        """
+        if not self.directory.exists():
+            return 0
+        deadline = time.time() - self.expire
+        sessions: dict[str, float] = {}
+        for path in self.directory.iterdir():
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if match := SESSION_FILE_RE.match(path.name):
+                upload_id = match.group(1)
+                sessions[upload_id] = max(sessions.get(upload_id, 0.0), mtime)
+            elif TEMPORARY_FILE_RE.match(path.name) and mtime < deadline:
+                path.unlink(missing_ok=True)
+        removed = 0
+        for upload_id, mtime in sessions.items():
+            if mtime >= deadline:
+                continue
+            with open(self._lock_path(upload_id), "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                self._remove_files(upload_id)
+            removed += 1
+        return removed
+
+
+upload_store = UploadStore(
+    directory=settings.media.uploads_dir,
+    max_size=settings.media.max_upload_size,
+    expire=settings.media.upload_expire,
+)
+
+
+async def get_upload_store() -> UploadStore:
+    return upload_store
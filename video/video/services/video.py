@@ -1,15 +1,24 @@
-import base64
-import os
 from abc import ABCMeta, abstractmethod
 from typing import Any
 
 from fastapi import Depends, HTTPException, UploadFile, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from video.crud.video import VideoDAL
-from video.database.session import dh_helper
-from video.schemas.video import CreateVideoSchema, UpdateVideoSchema
-from video.tasks.tasks import write_image, write_video
+from video.database.session import dh_helper, releases_connection
+from video.schemas.video import (
+    CreateVideoSchema,
+    ResponseVideoSchema,
+    UpdateVideoSchema,
+    VideoListItemSchema,
+    VideoPageSchema,
+)
+from video.services.cache import VideoCache, get_video_cache
+from video.services.media_store import MediaStore, get_media_store, media_store
+from video.services.pagination import decode_cursor, encode_cursor
+from video.services.upload import UploadStore
+from video.tasks.tasks import process_image, process_video, segment_video
 
 
 class VideoServiceBase(metaclass=ABCMeta):
@@ -31,69 +40,153 @@ class VideoServiceBase(metaclass=ABCMeta):
 
 
 class VideoService(VideoServiceBase):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: VideoCache,
+        read_session: AsyncSession | None = None,
+        media: MediaStore = media_store,
+    ) -> None:
         self.db_session = session
+        self.read_session = read_session or session
+        self.sessions = (self.db_session, self.read_session)
+        self.cache = cache
+        self.media = media
 
+    @releases_connection
     async def create_video(
         self, title: str, description: str, file: UploadFile, image: UploadFile
     ) -> Any:
-        video_crud = VideoDAL(self.db_session)
-        username = "Idel"
-        path_video = f"src/media/{username}/video"
-        path_image = f"src/media/{username}/image"
-        if not os.path.exists(path_video):
-            os.makedirs(path_video)
-        if not os.path.exists(path_image):
-            os.makedirs(path_image)
-        if file.content_type == "video/mp4" and image.content_type == "image/jpeg":
-            video_raw_bytes = file.file.read()
-            image_raw_bytes: bytes = image.file.read()
-            video_base64: str = base64.b64encode(video_raw_bytes).decode()
-            image_base64: str = base64.b64encode(image_raw_bytes).decode()
-            write_video.delay(f"{path_video}/{title}.mp4", video_base64)
-            write_image.delay(f"{path_image}/{title}.jpg", image_base64)
-        else:
+        if file.content_type != "video/mp4" or image.content_type != "image/jpeg":
             raise HTTPException(
                 status_code=status.HTTP_418_IM_A_TEAPOT,
                 detail="Файл должен быть формата mp4, изображение формата jpg",
             )
+        file_key = await self.media.save_upload(self.db_session, file, ".mp4")
+        try:
+            image_key = await self.media.save_upload(self.db_session, image, ".jpg")
+        except BaseException:
+            await self.media.release(self.db_session, [file_key])
+            raise
+        return await self._create(title, description, file_key, image_key)
+
+    @releases_connection
+    async def create_from_upload(
+        self, upload_id: str, image: UploadFile, upload_store: UploadStore
+    ) -> Any:
+        if image.content_type != "image/jpeg":
+            raise HTTPException(
+                status_code=status.HTTP_418_IM_A_TEAPOT,
+                detail="Изображение должно быть формата jpg",
+            )
+        # сессия загрузки удаляется только после коммита строки видео,
+        # при ошибке клиент повторяет завершение с теми же байтами
+        async with upload_store.completing(upload_id) as upload:
+            image_key = await self.media.save_upload(self.db_session, image, ".jpg")
+            try:
+                file_key = await self.media.add_file(
+                    self.db_session, upload_store.data_path(upload_id), ".mp4"
+                )
+            except BaseException:
+                await self.media.release(self.db_session, [image_key])
+                raise
+            return await self._create(
+                upload.title, upload.description, file_key, image_key
+            )
+
+    async def _create(
+        self, title: str, description: str, file_key: str, image_key: str
+    ) -> Any:
+        video_crud = VideoDAL(self.db_session)
         video_body = CreateVideoSchema(
             title=title,
             description=description,
-            file=f"{path_video}/{title}.mp4",
-            image=f"{path_image}/{title}.jpg",
+            file=file_key,
+            image=image_key,
         )
-        return await video_crud.create(video_body)
+        try:
+            video = await video_crud.create(video_body)
+        except HTTPException:
+            await self.db_session.rollback()
+            await self.media.release(self.db_session, [file_key, image_key])
+            raise
+        # задачи раньше кеша: строка уже закоммичена и должна быть обработана
+        (
+            process_video.si(video.id, video.file)
+            | segment_video.s(video.id, video.file)
+        ).delay()
+        process_image.delay(video.id, video.image)
+        await self.cache.invalidate_lists()
+        return video
 
-    async def get_video(self, video_id: int) -> Any:
-        video_crud = VideoDAL(self.db_session)
-        video = await video_crud.get(video_id)
+    @releases_connection
+    async def get_video(self, video_id: int) -> ResponseVideoSchema:
+        async def load_video() -> dict | None:
+            video = await VideoDAL(self.read_session).get(video_id)
+            if video is None:
+                return None
+            return jsonable_encoder(ResponseVideoSchema.model_validate(video))
+
+        video = await self.cache.get_video(video_id, load_video)
         if video is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="video not found"
             )
-        return video
+        return ResponseVideoSchema.model_validate(video)
 
+    @releases_connection
+    async def get_list(
+        self, cursor: str | None, limit: int, with_description: bool
+    ) -> VideoPageSchema:
+        after = decode_cursor(cursor) if cursor else None
+
+        async def load_page() -> dict:
+            rows = await VideoDAL(self.read_session).get_list(
+                limit, after, with_description
+            )
+            next_cursor = None
+            if len(rows) == limit:
+                next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+            page = VideoPageSchema(
+                items=[VideoListItemSchema.model_validate(row) for row in rows],
+                next_cursor=next_cursor,
+            )
+            return jsonable_encoder(page)
+
+        page_key = f"{cursor or 'first'}:{limit}:{int(with_description)}"
+        page = await self.cache.get_video_list(page_key, load_page)
+        return VideoPageSchema.model_validate(page)
+
+    @releases_connection
     async def update(self, video_id: int, video_body: UpdateVideoSchema) -> Any:
         video_crud = VideoDAL(self.db_session)
-        video = await video_crud.get(video_id)
-        if video is None:
+        updated_video = await video_crud.update(video_id, video_body)
+        if updated_video is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="video not found"
             )
-        return await video_crud.update(video_id, video_body)
+        await self.cache.invalidate_video(video_id)
+        return updated_video
 
+    @releases_connection
     async def delete(self, video_id: int) -> Any:
         video_crud = VideoDAL(self.db_session)
-        video = await video_crud.get(video_id)
-        if video is None:
+        deleted_video = await video_crud.delete(video_id)
+        if deleted_video is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="video not found"
             )
-        return await video_crud.delete(video_id)
+        await self.media.release(
+            self.db_session, [deleted_video.file, deleted_video.image]
+        )
+        await self.cache.invalidate_video(video_id)
+        return deleted_video.id
 
 
 async def get_service_video(
     session: AsyncSession = Depends(dh_helper.scoped_session_dependency),
+    read_session: AsyncSession = Depends(dh_helper.read_session_dependency),
+    cache: VideoCache = Depends(get_video_cache),
+    media: MediaStore = Depends(get_media_store),
 ) -> VideoService:
-    return VideoService(session)
+    return VideoService(session, cache, read_session, media)
@@ -1,8 +1,32 @@
-import base64
+import asyncio
+import shutil
+import subprocess
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
 
+from botocore.exceptions import ClientError
 from celery import Celery
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from video.core.config import settings
+from video.database.models.video import StreamStatus, Video
+from video.database.pool import asyncpg_connect_args
+from video.database.redis_cache import create_redis
+from video.services.cache import VideoCache
+from video.services.media_store import MediaStore
+from video.services.storage import create_storage
+from video.services.thumbnails import render_variants
+from video.services.upload import upload_store
+
+# хеш video_id -> число комментариев, его пишет CommentCounts сервиса comment
+COMMENT_COUNTS_KEY = "video:comments_count"
+COMMENT_COUNTS_PROCESSING_KEY = "video:comments_count:processing"
+COMMENT_COUNTS_CHUNK = 1000
 
 celery = Celery(
     "tasks",
@@ -10,22 +34,255 @@ celery = Celery(
     broker=settings.rabbitmq.broker_url,
 )
 celery.conf.broker_connection_retry_on_startup = True
+# обработка картинок занимает CPU; по умолчанию она в общей очереди, а для
+# отдельного пула задайте MEDIA_IMAGE_QUEUE=images и запустите на него воркер:
+# `celery -A video.tasks.tasks:celery worker -Q images -c <ядра>`
+celery.conf.task_routes = {
+    "video.tasks.tasks.process_image": {"queue": settings.media.image_queue},
+}
+celery.conf.beat_schedule = {
+    "sync-comment-counts": {
+        "task": "video.tasks.tasks.sync_comment_counts",
+        "schedule": settings.comment.counts_sync_interval,
+    },
+    "collect-media-garbage": {
+        "task": "video.tasks.tasks.collect_media_garbage",
+        "schedule": settings.storage.gc_interval,
+    },
+    "remove-expired-uploads": {
+        "task": "video.tasks.tasks.remove_expired_uploads",
+        "schedule": settings.media.upload_cleanup_interval,
+    },
+}
+
+
+def create_task_engine():
+    """Короткоживущий engine для asyncio.run внутри синхронного воркера"""
+    return create_async_engine(
+        settings.db.async_url,
+        poolclass=NullPool,
+        connect_args=asyncpg_connect_args(
+            settings.db.statement_cache_size, settings.db.pgbouncer
+        ),
+    )
+
+
+def update_video(video_id: int, **values: Any) -> None:
+    """Обновление Video из синхронного воркера через короткоживущий engine"""
+
+    async def _update() -> None:
+        engine = create_task_engine()
+        cache = VideoCache(create_redis())
+        try:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    update(Video).where(Video.id == video_id).values(**values)
+                )
+            await cache.invalidate_video(video_id)
+        finally:
+            await cache.redis.close()
+            await engine.dispose()
+
+    asyncio.run(_update())
+
+
+def object_exists(key: str) -> bool:
+    async def _exists() -> bool:
+        backend = create_storage()
+        try:
+            return await backend.exists(key)
+        finally:
+            await backend.close()
+
+    return asyncio.run(_exists())
+
+
+@contextmanager
+def local_media(key: str) -> Iterator[Path]:
+    """Файл объекта хранилища на локальном диске: сам объект или временная копия"""
+    backend = create_storage()
+    path = backend.local_path(key)
+    if path is not None:
+        yield path
+        return
+    path = settings.media.uploads_dir / f".{uuid.uuid4().hex}.fetched"
+
+    async def _fetch() -> None:
+        try:
+            await backend.get_file(key, path)
+        finally:
+            await backend.close()
+
+    try:
+        asyncio.run(_fetch())
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
+
+
+@celery.task
+def collect_media_garbage():
+    """Удаляет объекты хранилища, на которые дольше gc_grace нет ссылок"""
+
+    async def _collect() -> int:
+        engine = create_task_engine()
+        backend = create_storage()
+        try:
+            async with async_sessionmaker(engine)() as session:
+                store = MediaStore(backend, settings.media.uploads_dir)
+                return await store.collect_garbage(session, settings.storage.gc_grace)
+        finally:
+            await backend.close()
+            await engine.dispose()
+
+    return {"status": True, "collected": asyncio.run(_collect())}
+
+
+@celery.task
+def remove_expired_uploads():
+    """Удаляет докачиваемые загрузки, брошенные дольше media.upload_expire"""
+    return {"status": True, "removed": upload_store.remove_expired()}
+
+
+@celery.task
+def sync_comment_counts():
+    """Переносит в Video.comments_count числа, опубликованные сервисом comment.
+
+    Комментарии хранит сервис comment: он кладёт в хеш
+    COMMENT_COUNTS_KEY текущее число комментариев изменившихся видео.
+    Хеш атомарно переименовывается в COMMENT_COUNTS_PROCESSING_KEY и
+    удаляется только после коммита, а если запуск упал, следующий
+    начинает с него. Числа абсолютные, поэтому повторная запись той же
+    пачки ничего не меняет; обновлённые видео сбрасываются из кеша.
+    После полного пересчёта в хеше все видео, поэтому UPDATE идёт
+    кусками по COMMENT_COUNTS_CHUNK.
+    """
+
+    async def _sync() -> list[int]:
+        engine = create_task_engine()
+        cache = VideoCache(create_redis())
+        redis = cache.redis.redis
+        try:
+            counts = await redis.hgetall(COMMENT_COUNTS_PROCESSING_KEY)
+            if not counts and await redis.exists(COMMENT_COUNTS_KEY):
+                await redis.rename(COMMENT_COUNTS_KEY, COMMENT_COUNTS_PROCESSING_KEY)
+                counts = await redis.hgetall(COMMENT_COUNTS_PROCESSING_KEY)
+            if not counts:
+                return []
+            items = [(int(video_id), int(n)) for video_id, n in counts.items()]
+            updated: list[int] = []
+            async with engine.begin() as connection:
+                for start in range(0, len(items), COMMENT_COUNTS_CHUNK):
+                    chunk = dict(items[start : start + COMMENT_COUNTS_CHUNK])
+                    count = case(chunk, value=Video.id)
+                    stmt = (
+                        update(Video)
+                        .where(Video.id.in_(chunk), Video.comments_count != count)
+                        .values(comments_count=count)
+                        .returning(Video.id)
+                    )
+                    updated.extend((await connection.execute(stmt)).scalars())
+            await redis.delete(COMMENT_COUNTS_PROCESSING_KEY)
+            for video_id in updated:
+                await cache.invalidate_video(video_id)
+            return list(updated)
+        finally:
+            await cache.redis.close()
+            await engine.dispose()
+
+    updated = asyncio.run(_sync())
+    return {"status": True, "updated": len(updated)}
 
 
-# loop = asyncio.get_event_loop()
+@celery.task
+def process_video(video_id: int, file_name: str):
+    if not object_exists(file_name):
+        return {"status": False, "video_id": video_id}
+    return {"status": True, "video_id": video_id}
 
 
 @celery.task
-def write_video(file_name: str, video_base64: str):
-    file = base64.b64decode(video_base64)
-    with open(file_name, "wb") as buffer:
-        buffer.write(file)
-    return {"status": True}
+def process_image(video_id: int, file_name: str):
+    """Уменьшенные копии обложки в JPEG и WebP для Video.image_variants"""
+    try:
+        with local_media(file_name) as source:
+            variants = render_variants(
+                source,
+                settings.media.thumbnails_dir,
+                settings.media.thumbnail_widths,
+                settings.media.thumbnail_quality,
+            )
+    except (OSError, ClientError):
+        return {"status": False, "video_id": video_id}
+    for variant in variants:
+        variant["url"] = f"{settings.media.thumbnails_url}/{variant.pop('name')}"
+    update_video(video_id, image_variants=variants)
+    return {"status": True, "video_id": video_id, "variants": len(variants)}
+
+
+def ffmpeg_hls_command(
+    source: str, output_dir: Path, segment_seconds: int
+) -> list[str]:
+    return [
+        settings.media.ffmpeg_binary,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        source,
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-force_key_frames",
+        f"expr:gte(t,n_forced*{segment_seconds})",
+        "-sc_threshold",
+        "0",
+        "-c:a",
+        "aac",
+        "-f",
+        "hls",
+        "-hls_time",
+        str(segment_seconds),
+        "-hls_playlist_type",
+        "vod",
+        "-hls_segment_filename",
+        str(output_dir / "segment_%05d.ts"),
+        str(output_dir / "index.m3u8"),
+    ]
 
 
 @celery.task
-def write_image(file_name: str, image_base64: str):
-    image = base64.b64decode(image_base64)
-    with open(file_name, "wb") as file:
-        file.write(image)
-    return {"status": True}
+def segment_video(previous: dict, video_id: int, file_name: str):
+    """Нарезка видео на HLS-сегменты фиксированной длины.
+
+    Каждая нарезка пишется в новый каталог `<hls_dir>/<video_id>/<version>`,
+    поэтому опубликованные манифест и сегменты никогда не меняются
+    и могут кешироваться как immutable.
+    """
+    if not previous.get("status"):
+        update_video(video_id, hls_status=StreamStatus.FAILED)
+        return {"status": False, "video_id": video_id}
+    update_video(video_id, hls_status=StreamStatus.PROCESSING)
+    version = uuid.uuid4().hex[:12]
+    output_dir = settings.media.hls_dir / str(video_id) / version
+    work_dir = output_dir.with_name(f".{version}.tmp")
+    work_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with local_media(file_name) as source:
+            subprocess.run(
+                ffmpeg_hls_command(
+                    str(source), work_dir, settings.media.hls_segment_seconds
+                ),
+                check=True,
+            )
+        work_dir.rename(output_dir)
+    except (OSError, ClientError, subprocess.CalledProcessError):
+        shutil.rmtree(work_dir, ignore_errors=True)
+        update_video(video_id, hls_status=StreamStatus.FAILED)
+        return {"status": False, "video_id": video_id}
+    manifest = (output_dir / "index.m3u8").relative_to(settings.media.hls_dir)
+    update_video(
+        video_id, hls_status=StreamStatus.READY, hls_manifest=manifest.as_posix()
+    )
+    return {"status": True, "video_id": video_id, "manifest": manifest.as_posix()}